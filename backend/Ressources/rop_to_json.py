@@ -14,6 +14,19 @@ New in **v2**
 * Refactored the parser to return a single dict rather than just an array.  Existing code
   that expected `data["content"]` continues to work; the new keys are optional extras.
 
+New in **v3**
+-------------
+* Optional **binary bundle** output (`--bundle rop.bin`): an offset index followed by
+  length‑prefixed compact JSON records, one per rule, optionally zstd‑compressed
+  (`--zstd`).  `backend/rop_bundle.py` memory‑maps it and decodes single rules on
+  demand, so consumers no longer parse the whole JSON export to read one rule.
+
+New in **v4**
+-------------
+* Rules of a chapter that has no sections (and of a part that has no chapters) were
+  dropped.  They are now kept in the chapter's (part's) own `rules` list, written after
+  its `sections` (`chapters`).
+
 JSON layout emitted
 -------------------
 ```
@@ -26,11 +39,13 @@ JSON layout emitted
 }
 ```
 
-Usage (unchanged):
+Usage:
     python rop_to_json.py --input RoP.pdf --output rop.json
+    python rop_to_json.py --input RoP.pdf --output rop.json --bundle rop.bin [--zstd]
 
 Dependencies:
     pip install pdfplumber
+    pip install zstandard      # only for --zstd
 """
 
 from __future__ import annotations
@@ -50,6 +65,11 @@ except ImportError:  # pragma: no cover
     sys.stderr.write("pdfplumber is required. Install it with 'pip install pdfplumber'\n")
     sys.exit(1)
 
+# The bundle writer lives with the backend modules
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
 # ----------------------------------------------------------------------------
 # Regular‑expression patterns for structural markers
 # ----------------------------------------------------------------------------
@@ -110,6 +130,7 @@ def parse_pdf(path: str | Path) -> Dict[str, Any]:
                         "part_number": m.group(1),
                         "part_title": m.group(2),
                         "chapters": [],
+                        "rules": [],
                     }
                     structure.append(cur_part)
                     cur_chapter = cur_section = None
@@ -121,6 +142,7 @@ def parse_pdf(path: str | Path) -> Dict[str, Any]:
                         "chapter_number": m.group(1),
                         "chapter_title": m.group(2),
                         "sections": [],
+                        "rules": [],
                     }
                     cur_part["chapters"].append(cur_chapter)
                     cur_section = None
@@ -137,13 +159,17 @@ def parse_pdf(path: str | Path) -> Dict[str, Any]:
                     current_paragraph_sink = None
                     continue
 
-                if (m := RULE_RE.match(line)) and cur_section is not None:
+                # Rules belong to the innermost open node (not every chapter has sections),
+                # except inside the preamble/application blocks, which keep their own rules
+                in_block = current_paragraph_sink is preamble or current_paragraph_sink is application
+                parent = cur_section or cur_chapter or cur_part
+                if (m := RULE_RE.match(line)) and parent is not None and not in_block:
                     rule_obj = {
                         "rule_number": m.group(1),
                         "rule_title": m.group(2),
                         "paragraphs": [],
                     }
-                    cur_section["rules"].append(rule_obj)
+                    parent["rules"].append(rule_obj)
                     # subsequent free‑running lines are rule paragraphs
                     current_paragraph_sink = rule_obj["paragraphs"]
                     continue
@@ -170,6 +196,8 @@ def main() -> None:  # pragma: no cover
         description="Export UPC Rules of Procedure PDF to a clean JSON representation for web apps.")
     parser.add_argument("--input", required=True, help="Path to the RoP PDF file")
     parser.add_argument("--output", required=True, help="Destination path for JSON export")
+    parser.add_argument("--bundle", help="Also write a binary rule bundle to this path")
+    parser.add_argument("--zstd", action="store_true", help="Compress bundle records with zstd")
     args = parser.parse_args()
 
     result = {
@@ -183,5 +211,12 @@ def main() -> None:  # pragma: no cover
 
     print(f"✔️  Export complete → {args.output}")
 
+    if args.bundle:
+        from rop_bundle import write_bundle
+        from rop_importer import iter_rop_texts
+
+        count = write_bundle(iter_rop_texts(result), Path(args.bundle), compress=args.zstd)
+        print(f"✔️  Bundle written → {args.bundle} ({count} rules)")
+
 if __name__ == "__main__":
     main()
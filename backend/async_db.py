@@ -0,0 +1,146 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional
+
+# Every blocking pymongo call runs here, never on the event loop. The pool is
+# bounded so a burst of slow queries queues up instead of exhausting threads.
+MONGO_EXECUTOR_WORKERS = int(os.environ.get("MONGO_EXECUTOR_WORKERS", "16"))
+DEFAULT_BATCH_SIZE = 100
+
+_executor = ThreadPoolExecutor(max_workers=MONGO_EXECUTOR_WORKERS, thread_name_prefix="mongo")
+
+
+async def run_blocking(fn: Callable, *args, **kwargs) -> Any:
+    """Run a blocking callable in the bounded Mongo executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(fn, *args, **kwargs))
+
+
+class AsyncCursor:
+    """Awaitable view of a pymongo cursor, fetched in batches off the event loop"""
+
+    def __init__(self, factory: Callable, batch_size: int = DEFAULT_BATCH_SIZE):
+        self._factory = factory
+        self._cursor = None
+        self._modifiers: List = []
+        self._batch_size = batch_size
+
+    def _chain(self, name: str, *args, **kwargs) -> "AsyncCursor":
+        if self._cursor is not None:
+            raise RuntimeError(f"Cannot call {name}() on a cursor that is already iterating")
+        self._modifiers.append((name, args, kwargs))
+        return self
+
+    def sort(self, *args, **kwargs) -> "AsyncCursor":
+        return self._chain("sort", *args, **kwargs)
+
+    def skip(self, *args, **kwargs) -> "AsyncCursor":
+        return self._chain("skip", *args, **kwargs)
+
+    def limit(self, *args, **kwargs) -> "AsyncCursor":
+        return self._chain("limit", *args, **kwargs)
+
+    def hint(self, *args, **kwargs) -> "AsyncCursor":
+        return self._chain("hint", *args, **kwargs)
+
+    def batch_size(self, batch_size: int) -> "AsyncCursor":
+        self._batch_size = batch_size
+        return self._chain("batch_size", batch_size)
+
+    def _open(self):
+        if self._cursor is None:
+            cursor = self._factory()
+            for name, args, kwargs in self._modifiers:
+                cursor = getattr(cursor, name)(*args, **kwargs)
+            self._cursor = cursor
+        return self._cursor
+
+    def _next_batch(self, size: int) -> List[Dict]:
+        return list(islice(self._open(), size))
+
+    async def next_batch(self, size: Optional[int] = None) -> List[Dict]:
+        """Fetch up to ``size`` documents; an empty list means the cursor is exhausted"""
+        return await run_blocking(self._next_batch, size or self._batch_size)
+
+    async def to_list(self, length: Optional[int] = None) -> List[Dict]:
+        if length is not None:
+            return await self.next_batch(length)
+        return await run_blocking(lambda: list(self._open()))
+
+    async def explain(self) -> Dict:
+        return await run_blocking(lambda: self._open().explain())
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        while True:
+            batch = await self.next_batch()
+            if not batch:
+                return
+            for document in batch:
+                yield document
+
+    async def close(self) -> None:
+        if self._cursor is not None and hasattr(self._cursor, "close"):
+            await run_blocking(self._cursor.close)
+
+
+class AsyncCollection:
+    """Thin async facade over a pymongo collection.
+
+    ``delegate`` is the underlying pymongo collection, for code that already
+    runs in a worker thread (importers, scrapers, startup tasks).
+    """
+
+    def __init__(self, collection):
+        self.delegate = collection
+        self.name = collection.name
+
+    def find(self, *args, **kwargs) -> AsyncCursor:
+        return AsyncCursor(partial(self.delegate.find, *args, **kwargs))
+
+    def aggregate(self, pipeline: List[Dict], **kwargs) -> AsyncCursor:
+        return AsyncCursor(partial(self.delegate.aggregate, pipeline, **kwargs))
+
+    async def find_one(self, *args, **kwargs):
+        return await run_blocking(self.delegate.find_one, *args, **kwargs)
+
+    async def count_documents(self, *args, **kwargs) -> int:
+        return await run_blocking(self.delegate.count_documents, *args, **kwargs)
+
+    async def distinct(self, *args, **kwargs) -> List:
+        return await run_blocking(self.delegate.distinct, *args, **kwargs)
+
+    async def insert_one(self, *args, **kwargs):
+        return await run_blocking(self.delegate.insert_one, *args, **kwargs)
+
+    async def insert_many(self, *args, **kwargs):
+        return await run_blocking(self.delegate.insert_many, *args, **kwargs)
+
+    async def update_one(self, *args, **kwargs):
+        return await run_blocking(self.delegate.update_one, *args, **kwargs)
+
+    async def update_many(self, *args, **kwargs):
+        return await run_blocking(self.delegate.update_many, *args, **kwargs)
+
+    async def replace_one(self, *args, **kwargs):
+        return await run_blocking(self.delegate.replace_one, *args, **kwargs)
+
+    async def delete_one(self, *args, **kwargs):
+        return await run_blocking(self.delegate.delete_one, *args, **kwargs)
+
+    async def delete_many(self, *args, **kwargs):
+        return await run_blocking(self.delegate.delete_many, *args, **kwargs)
+
+    async def bulk_write(self, *args, **kwargs):
+        return await run_blocking(self.delegate.bulk_write, *args, **kwargs)
+
+    async def create_index(self, *args, **kwargs):
+        return await run_blocking(self.delegate.create_index, *args, **kwargs)
+
+    async def create_indexes(self, *args, **kwargs):
+        return await run_blocking(self.delegate.create_indexes, *args, **kwargs)
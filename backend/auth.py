@@ -9,6 +9,8 @@ from pymongo import MongoClient
 import os
 import uuid
 
+from async_db import run_blocking
+
 # Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "romulus-secret-key-change-in-production")
 ALGORITHM = "HS256"
@@ -25,6 +27,7 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # OAuth2 scheme
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 # Enums
 from enum import Enum
@@ -158,11 +161,20 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     except JWTError:
         raise credentials_exception
     
-    user = get_user(email=token_data.email)
+    user = await run_blocking(get_user, email=token_data.email)
     if user is None:
         raise credentials_exception
     return user
 
+async def get_optional_user(credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)):
+    """Current user for public endpoints with extra options for logged-in users; None if anonymous"""
+    if credentials is None:
+        return None
+    try:
+        return await get_current_user(credentials)
+    except HTTPException:
+        return None
+
 async def get_current_active_user(current_user: UserInDB = Depends(get_current_user)):
     return current_user
 
@@ -0,0 +1,148 @@
+"""Server-side CSV/XLSX/JSON export of filtered cases.
+
+Columns mirror frontend/src/ExportUtils.js so server and browser exports look
+the same. Rows come straight from a Mongo cursor: CSV and JSON are streamed
+one cursor batch at a time, XLSX is written row by row by xlsxwriter in
+constant_memory mode to a temporary file that is then streamed and deleted.
+Memory stays bounded by the batch size whatever the size of the export.
+"""
+
+import csv
+import io
+import os
+import tempfile
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import xlsxwriter
+
+from fast_json import dumps
+
+EXPORT_BATCH_SIZE = 500
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    "excel": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    "json": ("application/json", "json"),
+}
+
+SHEET_NAME = "Décisions UPC"
+HEADER_FORMAT = {"bold": True, "font_color": "#FFFFFF", "bg_color": "#F97316",
+                 "align": "center", "valign": "vcenter"}
+
+
+def format_date(value: Optional[str]) -> str:
+    """dd/mm/yyyy like toLocaleDateString('fr-FR'); unparseable dates pass through"""
+    if not value:
+        return ""
+    try:
+        return datetime.strptime(str(value)[:10], "%Y-%m-%d").strftime("%d/%m/%Y")
+    except ValueError:
+        return str(value)
+
+
+Column = Tuple[str, Callable[[Dict], object], int]
+
+
+def _join_parties(case: Dict, separator: str) -> str:
+    parties = case.get("parties")
+    if isinstance(parties, list):
+        return separator.join(str(party) for party in parties)
+    return parties or ""
+
+
+def _columns(party_separator: str) -> List[Column]:
+    """(header, extractor, Excel width) in ExportUtils.js order"""
+    return [
+        ("Date", lambda case: format_date(case.get("date")), 12),
+        ("Référence", lambda case: case.get("reference") or case.get("order_reference") or "", 20),
+        ("Type", lambda case: case.get("type") or "", 10),
+        ("Division", lambda case: case.get("court_division") or "", 15),
+        ("Parties", lambda case: _join_parties(case, party_separator), 30),
+        ("Résumé", lambda case: case.get("summary") or "", 40),
+        ("Numéro de registre", lambda case: case.get("registry_number") or "", 15),
+        ("Langue", lambda case: case.get("language_of_proceedings") or "", 10),
+        ("Type d'action", lambda case: case.get("type_of_action") or "", 15),
+    ]
+
+
+# Like the browser export, Excel joins parties with ", " and has a Documents column; CSV uses "; "
+XLSX_COLUMNS: List[Column] = _columns(", ") + [("Documents", lambda case: case.get("documents_count") or 0, 10)]
+CSV_COLUMNS: List[Column] = _columns("; ")
+
+ROW_PROJECTION = {
+    "_id": 0, "date": 1, "reference": 1, "order_reference": 1, "type": 1, "court_division": 1,
+    "parties": 1, "summary": 1, "registry_number": 1, "language_of_proceedings": 1, "type_of_action": 1,
+    "documents_count": {"$size": {"$ifNull": ["$documents", []]}},
+}
+
+
+def row_pipeline(query: Dict, sort: List[Tuple[str, int]]) -> List[Dict]:
+    """Only the exported fields; documents are counted in the database instead of shipped"""
+    pipeline: List[Dict] = [{"$match": query}] if query else []
+    pipeline += [{"$sort": dict(sort)}, {"$project": ROW_PROJECTION}]
+    return pipeline
+
+
+def export_filename(extension: str, now: Optional[datetime] = None) -> str:
+    timestamp = (now or datetime.utcnow()).strftime("%Y-%m-%dT%H-%M-%S")
+    return f"decisions_upc_{timestamp}.{extension}"
+
+
+def _csv_chunk(rows: List[List]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer, quoting=csv.QUOTE_ALL, lineterminator="\n").writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+async def csv_chunks(cursor, first_batch: List[Dict]) -> AsyncIterator[bytes]:
+    """Header then one CSV chunk per cursor batch; the BOM lets Excel detect UTF-8"""
+    try:
+        yield b"\xef\xbb\xbf" + _csv_chunk([[header for header, _, _ in CSV_COLUMNS]])
+        batch = first_batch
+        while batch:
+            yield _csv_chunk([[extract(case) for _, extract, _ in CSV_COLUMNS] for case in batch])
+            batch = await cursor.next_batch()
+    finally:
+        await cursor.close()
+
+
+async def json_chunks(cursor, first_batch: List[Dict]) -> AsyncIterator[bytes]:
+    """A JSON array assembled one cursor batch at a time"""
+    try:
+        yield b"["
+        batch = first_batch
+        separator = b""
+        while batch:
+            yield separator + b",".join(dumps(document) for document in batch)
+            separator = b","
+            batch = await cursor.next_batch()
+        yield b"]"
+    finally:
+        await cursor.close()
+
+
+def write_xlsx(collection, pipeline: List[Dict]) -> str:
+    """Write the export to a temporary .xlsx and return its path; runs in a worker thread"""
+    handle, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(handle)
+    try:
+        workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+        sheet = workbook.add_worksheet(SHEET_NAME)
+        header_format = workbook.add_format(HEADER_FORMAT)
+        for column, (header, _, width) in enumerate(XLSX_COLUMNS):
+            sheet.set_column(column, column, width)
+            sheet.write_string(0, column, header, header_format)
+        # constant_memory flushes each row once the next one starts, so rows must go in order
+        cursor = collection.aggregate(pipeline, batchSize=EXPORT_BATCH_SIZE)
+        try:
+            for row, case in enumerate(cursor, start=1):
+                sheet.write_row(row, 0, [extract(case) for _, extract, _ in XLSX_COLUMNS])
+        finally:
+            cursor.close()
+        workbook.close()
+    except Exception:
+        os.remove(path)
+        raise
+    return path
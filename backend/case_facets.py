@@ -0,0 +1,163 @@
+"""Filter facets for the case list, computed with one $facet aggregation.
+
+The result is cached in memory. Writers bump a version counter in the
+``cache_versions`` collection (the scraper runs in its own process), and the
+cache re-checks that counter at most every ``VERSION_CHECK_INTERVAL`` seconds,
+so a cached answer costs no database round trip at all.
+
+The same document keeps the case ids written by the last ``CHANGE_LOG_SIZE``
+bumps, so indexes held in memory re-read only those cases instead of diffing
+the whole collection.
+"""
+
+import asyncio
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from async_db import run_blocking
+
+FILTERS_CACHE_TTL = int(os.environ.get("FILTERS_CACHE_TTL", "600"))
+VERSION_CHECK_INTERVAL = 5.0
+CASES_VERSION_ID = "cases"
+CHANGE_LOG_SIZE = 50
+
+# Facet name -> grouping expression; tags are unwound first
+FACET_FIELDS = {
+    "case_types": "$type",
+    "court_divisions": "$court_division",
+    "languages": "$language_of_proceedings",
+    "action_types": "$type_of_action",
+    # Byte substring of the ISO date; $substr is MongoDB's alias of $substrBytes
+    "years": {"$substr": ["$date", 0, 4]},
+    "tags": "$tags",
+}
+
+
+def _facet_stages(name: str, expression) -> List[Dict]:
+    group = {"_id": expression, "count": {"$sum": 1}}
+    if name == "court_divisions":
+        group["code"] = {"$first": "$division_code"}
+    stages = [{"$unwind": "$tags"}] if name == "tags" else []
+    return stages + [
+        {"$group": group},
+        {"$match": {"_id": {"$nin": [None, ""]}}},
+        {"$sort": {"count": -1, "_id": 1}},
+    ]
+
+
+def build_facet_pipeline() -> List[Dict]:
+    projection = {"type": 1, "court_division": 1, "division_code": 1, "language_of_proceedings": 1,
+                  "type_of_action": 1, "date": 1, "tags": 1}
+    return [
+        {"$match": {"excluded": {"$ne": True}}},
+        {"$project": projection},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            **{name: _facet_stages(name, expression) for name, expression in FACET_FIELDS.items()},
+        }},
+    ]
+
+
+def compute_filters(collection) -> Dict:
+    """Run the facet aggregation and shape it for /api/filters"""
+    result = next(collection.aggregate(build_facet_pipeline()), {})
+    filters = {"total": (result.get("total") or [{"count": 0}])[0]["count"], "counts": {}}
+    for name in FACET_FIELDS:
+        buckets = []
+        for bucket in result.get(name, []):
+            entry = {"value": bucket["_id"], "count": bucket["count"]}
+            if "code" in bucket:
+                entry["code"] = bucket["code"]
+            buckets.append(entry)
+        if name == "years":
+            buckets.sort(key=lambda entry: entry["value"], reverse=True)
+        filters["counts"][name] = buckets
+        filters[name] = [entry["value"] for entry in buckets]
+    return filters
+
+
+def read_cases_version(db) -> int:
+    document = db["cache_versions"].find_one({"_id": CASES_VERSION_ID}, {"version": 1})
+    return document["version"] if document else 0
+
+
+def read_case_changes(db, since: Optional[int]) -> Tuple[int, Optional[List[str]]]:
+    """Current version and the ids of cases written after version since; None if the log doesn't reach back"""
+    document = db["cache_versions"].find_one({"_id": CASES_VERSION_ID})
+    if not document:
+        return 0, []
+    version = document["version"]
+    if since is None:
+        return version, None
+    missing = version - since
+    if missing <= 0:
+        return version, []
+    changes = document.get("changes", [])
+    if missing > len(changes):
+        return version, None
+    case_ids = set()
+    for entry in changes[-missing:]:
+        # Bumps that didn't say which cases they wrote
+        if entry is None:
+            return version, None
+        case_ids.update(entry)
+    return version, sorted(case_ids)
+
+
+def bump_cases_version(db, case_ids: Optional[Iterable[str]] = None) -> None:
+    """Mark every cached view of the cases collection as stale, in all processes
+
+    case_ids lists the cases written; bulk writes leave it out and readers
+    then diff the whole collection.
+    """
+    entry = sorted({str(case_id) for case_id in case_ids}) if case_ids is not None else None
+    db["cache_versions"].update_one(
+        {"_id": CASES_VERSION_ID},
+        {"$inc": {"version": 1}, "$push": {"changes": {"$each": [entry], "$slice": -CHANGE_LOG_SIZE}}},
+        upsert=True)
+
+
+class FiltersCache:
+    """In-memory /api/filters result, invalidated by case writes or after a TTL"""
+
+    def __init__(self, db, ttl: int = FILTERS_CACHE_TTL, check_interval: float = VERSION_CHECK_INTERVAL):
+        self.db = db
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self._value: Optional[Dict] = None
+        self._version: Optional[int] = None
+        self._expires_at = 0.0
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._value = None
+
+    async def _is_fresh(self) -> bool:
+        now = time.monotonic()
+        if self._value is None or now >= self._expires_at:
+            return False
+        if now - self._checked_at < self.check_interval:
+            return True
+        version = await run_blocking(read_cases_version, self.db)
+        if version != self._version:
+            self.invalidate()
+            return False
+        self._checked_at = now
+        return True
+
+    async def get(self) -> Dict:
+        if await self._is_fresh():
+            return self._value
+        async with self._lock:
+            # Another request may have refreshed the cache while we waited
+            if await self._is_fresh():
+                return self._value
+            version = await run_blocking(read_cases_version, self.db)
+            self._value = await run_blocking(compute_filters, self.db["cases"])
+            now = time.monotonic()
+            self._version = version
+            self._expires_at = now + self.ttl
+            self._checked_at = now
+            return self._value
@@ -0,0 +1,357 @@
+"""TF-IDF vectors of cases for the "similar decisions" panel.
+
+Each public case is one row of a sparse CSR matrix (float32, L2-normalized)
+over the stemmed words of its summary and headnotes, plus one feature per
+cited legal norm and per tag. Summaries and headnotes are English whatever
+the language of proceedings, so they always go through the English analyzer:
+identically worded EN and DE cases then share their features. The cases most similar to one are the largest
+entries of the product of the matrix with its row (cosine similarity): a
+vectorized gather over a column-major copy of the rows present when that
+copy was made, plus a row-wise pass over the few rows appended since.
+
+A matrix is never modified in place. A sync produces a new one with changed
+cases tombstoned and their vectors appended, weighted with the document
+frequencies of the moment, which is swapped in on the event loop. Once too
+many rows have drifted from the last build, the matrix is rebuilt. Every
+version is written to ``SIMILAR_CASES_PATH``, so a restart only applies the
+changes made since.
+"""
+
+import asyncio
+import os
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from async_db import run_blocking
+from case_facets import VERSION_CHECK_INTERVAL, read_cases_version
+from citation_scanner import cross_reference_labels, scan as scan_citations
+from field_presets import CASE_FIELD_PRESETS
+from text_analysis import fold, tokens
+
+SIMILAR_CASES_PATH = Path(os.environ.get(
+    "SIMILAR_CASES_PATH", Path(__file__).resolve().parent / "Ressources" / "similar_cases.npz"))
+# Bumped whenever features change, so saved matrices are rebuilt rather than mixed
+FORMAT_VERSION = 2
+
+TEXT_FIELDS = ("summary", "headnotes")
+TEXT_LANGUAGE = "EN"
+# Only public cases are vectorized
+SOURCE_QUERY = {"excluded": {"$ne": True}}
+SOURCE_PROJECTION = {"summary": 1, "headnotes": 1, "legal_norms": 1, "tags": 1, "content_hash": 1}
+REFRESH_BATCH_SIZE = 1000
+# Rebuild once rows appended or tombstoned since the last build reach this share of the live rows
+REBUILD_RATIO = 0.2
+# Rows scored row-wise before the column-major copy is remade
+MAX_TAIL_ROWS = 2000
+
+
+def _values(value) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [str(item) for item in value if item]
+    return [str(value)]
+
+
+def _label(text: str) -> str:
+    return " ".join(fold(text).split())
+
+
+def case_features(case: Dict) -> Counter:
+    """Term counts: stemmed words of the text fields, then norm: and tag: features"""
+    features: Counter = Counter()
+    for field in TEXT_FIELDS:
+        for text in _values(case.get(field)):
+            features.update(token.term for token in tokens(text, TEXT_LANGUAGE))
+    for norm in _values(case.get("legal_norms")):
+        labels = cross_reference_labels(scan_citations(norm)) or [norm]
+        features.update(f"norm:{_label(label)}" for label in labels)
+    for tag in _values(case.get("tags")):
+        features[f"tag:{_label(tag)}"] += 1
+    return features
+
+
+class _ColumnMajor(NamedTuple):
+    """The first ``row_count`` rows, grouped by column"""
+    row_count: int
+    colptr: np.ndarray
+    rows: np.ndarray
+    values: np.ndarray
+
+
+def _column_major(indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, term_count: int) -> _ColumnMajor:
+    row_count = indptr.size - 1
+    rows = np.repeat(np.arange(row_count, dtype=np.int32), np.diff(indptr))
+    order = np.argsort(indices, kind="stable")
+    colptr = np.zeros(term_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(indices, minlength=term_count), out=colptr[1:])
+    return _ColumnMajor(row_count, colptr, rows[order], data[order])
+
+
+class SimilarityMatrix:
+    """One immutable version of the case vectors"""
+
+    def __init__(self, terms: List[str], df: np.ndarray, ids: List[str], hashes: List[str], alive: np.ndarray,
+                 indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, built_rows: int,
+                 vocabulary: Optional[Dict[str, int]] = None, columns: Optional[_ColumnMajor] = None):
+        self.terms = terms
+        self.vocabulary = vocabulary if vocabulary is not None else {term: i for i, term in enumerate(terms)}
+        self.df = df
+        self.ids = ids
+        self.hashes = hashes
+        self.alive = alive
+        self.rows = {ids[row]: row for row in np.flatnonzero(alive).tolist()}
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.built_rows = built_rows
+        if columns is None or len(ids) - columns.row_count > MAX_TAIL_ROWS:
+            columns = _column_major(indptr, indices, data, len(terms))
+        self.columns = columns
+
+    @classmethod
+    def empty(cls) -> "SimilarityMatrix":
+        return cls([], np.zeros(0, dtype=np.int32), [], [], np.zeros(0, dtype=np.bool_),
+                   np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32), 0)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def drift(self) -> int:
+        """Rows appended or tombstoned since the last build"""
+        return len(self.ids) - self.built_rows + int(self.built_rows - self.alive[:self.built_rows].sum())
+
+    def indexed_hashes(self) -> Dict[str, str]:
+        return {case_id: self.hashes[row] for case_id, row in self.rows.items()}
+
+    def similar(self, case_id: str, limit: int = 10) -> Optional[List[Tuple[str, float]]]:
+        """(case id, cosine similarity) of the closest other cases; None when the case is not indexed"""
+        row = self.rows.get(case_id)
+        if row is None:
+            return None
+        start, end = self.indptr[row], self.indptr[row + 1]
+        columns, weights = self.indices[start:end], self.data[start:end]
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+
+        # Column-major part: gather every (row, value) of the query's columns in one pass
+        major = self.columns
+        known = columns < major.colptr.size - 1
+        starts = major.colptr[columns[known]]
+        lengths = major.colptr[columns[known] + 1] - starts
+        total = int(lengths.sum())
+        if total:
+            offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(total)
+            products = major.values[offsets] * np.repeat(weights[known], lengths)
+            scores[:major.row_count] = np.bincount(major.rows[offsets], weights=products,
+                                                   minlength=major.row_count)
+        # Rows appended since: dot product of each with the query row
+        if major.row_count < len(self.ids):
+            dense = np.zeros(len(self.terms), dtype=np.float32)
+            dense[columns] = weights
+            tail = self.indptr[major.row_count]
+            products = self.data[tail:] * dense[self.indices[tail:]]
+            tail_rows = np.repeat(np.arange(len(self.ids) - major.row_count), np.diff(self.indptr[major.row_count:]))
+            scores[major.row_count:] = np.bincount(tail_rows, weights=products,
+                                                   minlength=len(self.ids) - major.row_count)
+
+        scores[~self.alive] = 0
+        scores[row] = 0
+        candidates = np.flatnonzero(scores > 0)
+        if candidates.size > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(self.ids[candidate], round(float(scores[candidate]), 4)) for candidate in candidates.tolist()]
+
+
+def extend_matrix(matrix: SimilarityMatrix, cases: List[Dict], removed: Iterable[str]) -> SimilarityMatrix:
+    """A new matrix with the removed ids tombstoned and the cases appended (replacing any indexed version)"""
+    alive = matrix.alive.copy()
+    df = matrix.df.copy()
+    for case_id in list(removed) + [str(case["_id"]) for case in cases]:
+        row = matrix.rows.get(case_id)
+        if row is not None and alive[row]:
+            alive[row] = False
+            np.subtract.at(df, matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]], 1)
+
+    terms = list(matrix.terms)
+    vocabulary = dict(matrix.vocabulary)
+    features = [case_features(case) for case in cases]
+    for counts in features:
+        for term in counts:
+            if term not in vocabulary:
+                vocabulary[term] = len(terms)
+                terms.append(term)
+    columns = [np.fromiter((vocabulary[term] for term in counts), dtype=np.int32, count=len(counts))
+               for counts in features]
+    df = np.concatenate([df, np.zeros(len(terms) - df.size, dtype=np.int32)])
+    if columns:
+        df += np.bincount(np.concatenate(columns), minlength=len(terms)).astype(np.int32)
+
+    # Smoothed IDF over the live rows, sublinear TF
+    live = int(alive.sum()) + len(cases)
+    idf = (np.log((1 + live) / (1 + df)) + 1).astype(np.float32)
+    row_data = []
+    for counts, row_columns in zip(features, columns):
+        tf = 1 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+        weights = tf * idf[row_columns]
+        norm = np.linalg.norm(weights)
+        row_data.append(weights / norm if norm else weights)
+
+    lengths = np.array([column.size for column in columns], dtype=np.int64)
+    indptr = np.concatenate([matrix.indptr, matrix.indptr[-1] + np.cumsum(lengths)])
+    indices = np.concatenate([matrix.indices] + columns)
+    data = np.concatenate([matrix.data] + row_data).astype(np.float32, copy=False)
+    return SimilarityMatrix(terms, df, matrix.ids + [str(case["_id"]) for case in cases],
+                            matrix.hashes + [case.get("content_hash") or "" for case in cases],
+                            np.concatenate([alive, np.ones(len(cases), dtype=np.bool_)]),
+                            indptr, indices, data, matrix.built_rows, vocabulary, matrix.columns)
+
+
+def build_matrix(db) -> SimilarityMatrix:
+    """Vectors of every public case with one consistent IDF; runs in a worker thread"""
+    cases = list(db["cases"].find(SOURCE_QUERY, SOURCE_PROJECTION))
+    matrix = extend_matrix(SimilarityMatrix.empty(), cases, [])
+    matrix.built_rows = len(matrix.ids)
+    matrix.columns = _column_major(matrix.indptr, matrix.indices, matrix.data, len(matrix.terms))
+    return matrix
+
+
+def update_matrix(db, matrix: SimilarityMatrix, path: Path = SIMILAR_CASES_PATH) -> SimilarityMatrix:
+    """Apply case changes found by comparing content hashes, saving the result; runs in a worker thread.
+
+    Returns the same matrix when nothing changed.
+    """
+    collection = db["cases"]
+    current = {str(case["_id"]): case.get("content_hash") or ""
+               for case in collection.find(SOURCE_QUERY, {"content_hash": 1})}
+    indexed = matrix.indexed_hashes()
+    changed = [case_id for case_id, content_hash in current.items() if indexed.get(case_id) != content_hash]
+    removed = [case_id for case_id in indexed if case_id not in current]
+    if not changed and not removed:
+        return matrix
+    cases = []
+    for start in range(0, len(changed), REFRESH_BATCH_SIZE):
+        batch = changed[start:start + REFRESH_BATCH_SIZE]
+        cases += collection.find({"_id": {"$in": batch}}, SOURCE_PROJECTION)
+    matrix = extend_matrix(matrix, cases, removed)
+    if matrix.drift > REBUILD_RATIO * max(len(matrix), 1):
+        matrix = build_matrix(db)
+    save_matrix(matrix, path)
+    return matrix
+
+
+def _pack(strings: List[str]) -> np.ndarray:
+    return np.frombuffer("\n".join(strings).encode("utf-8"), dtype=np.uint8)
+
+
+def _unpack(array: np.ndarray, count: int) -> List[str]:
+    return array.tobytes().decode("utf-8").split("\n") if count else []
+
+
+def save_matrix(matrix: SimilarityMatrix, path: Path = SIMILAR_CASES_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(path.stem + ".tmp.npz")
+    np.savez(temporary, header=np.array([FORMAT_VERSION, matrix.built_rows, len(matrix.terms), len(matrix.ids)]),
+             terms=_pack(matrix.terms), ids=_pack(matrix.ids), hashes=_pack(matrix.hashes), df=matrix.df,
+             alive=matrix.alive, indptr=matrix.indptr, indices=matrix.indices, data=matrix.data)
+    os.replace(temporary, path)
+
+
+def load_matrix(path: Path = SIMILAR_CASES_PATH) -> Optional[SimilarityMatrix]:
+    """The saved matrix, or None when there is none or it was written by another format version"""
+    if not path.exists():
+        return None
+    with np.load(path) as saved:
+        version, built_rows, term_count, row_count = saved["header"].tolist()
+        if version != FORMAT_VERSION:
+            return None
+        return SimilarityMatrix(_unpack(saved["terms"], term_count), saved["df"], _unpack(saved["ids"], row_count),
+                                _unpack(saved["hashes"], row_count), saved["alive"], saved["indptr"],
+                                saved["indices"], saved["data"], built_rows)
+
+
+def fetch_similar(db, matches: List[Tuple[str, float]]) -> List[Dict]:
+    """Similar cases in similarity order with their list fields; runs in a worker thread"""
+    projection = {field: 1 for field in CASE_FIELD_PRESETS["list"]}
+    cases = {str(case["_id"]): case
+             for case in db["cases"].find({"_id": {"$in": [case_id for case_id, _ in matches]}}, projection)}
+    items = []
+    for case_id, score in matches:
+        case = cases.get(case_id)
+        if case is None:
+            continue
+        case.pop("_id", None)
+        items.append({"id": case_id, "score": score, **case})
+    return items
+
+
+class SimilarCases:
+    """Holds the live SimilarityMatrix and keeps it in step with the cases collection"""
+
+    def __init__(self, path: Path = SIMILAR_CASES_PATH, check_interval: float = VERSION_CHECK_INTERVAL):
+        self.path = path
+        self.matrix: Optional[SimilarityMatrix] = None
+        self.check_interval = check_interval
+        self._cases_version: Optional[int] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.matrix is not None
+
+    async def load(self, db) -> None:
+        """Open the saved matrix and apply later changes, or build it when there is none"""
+        started = time.perf_counter()
+        try:
+            matrix = await run_blocking(load_matrix, self.path)
+        except Exception as e:
+            print(f"Similar cases matrix unreadable, rebuilding: {e}")
+            matrix = None
+        try:
+            if matrix is None:
+                matrix = await run_blocking(build_matrix, db)
+                await run_blocking(save_matrix, matrix, self.path)
+        except Exception as e:
+            print(f"Similar cases warning: {e}")
+            return
+        self.matrix = matrix
+        print(f"Similar cases matrix loaded with {len(matrix)} cases in {time.perf_counter() - started:.1f}s")
+        await self.refresh(db)
+
+    async def refresh(self, db) -> None:
+        """Bring the matrix in line with the cases collection"""
+        if self.matrix is None:
+            return
+        async with self._lock:
+            version = await run_blocking(read_cases_version, db)
+            previous = self.matrix
+            self.matrix = await run_blocking(update_matrix, db, previous, self.path)
+            self._cases_version = version
+            self._checked_at = time.monotonic()
+        if self.matrix is not previous:
+            print(f"Similar cases matrix refreshed: {len(self.matrix)} cases")
+
+    async def check_version(self, db) -> None:
+        """Pick up case writes made by other processes (the scraper) in the background"""
+        now = time.monotonic()
+        if self.matrix is None or now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        version = await run_blocking(read_cases_version, db)
+        if version != self._cases_version:
+            self._refresh_task = asyncio.create_task(self.refresh(db))
+
+    def similar(self, case_id: str, limit: int = 10) -> Optional[List[Tuple[str, float]]]:
+        return self.matrix.similar(case_id, limit)
+
+
+similar_cases = SimilarCases()
@@ -0,0 +1,64 @@
+"""Materialized dashboard statistics for /api/stats.
+
+All counters and the recent-cases slice come from one $facet aggregation and
+are stored in a single ``stats`` document. Writers refresh it after changing
+cases; readers fetch it with one find_one and only recompute it when it is
+missing or older than ``STATS_MAX_AGE`` (the "last 30 days" window moves).
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+STATS_DOCUMENT_ID = "cases"
+STATS_MAX_AGE = timedelta(seconds=int(os.environ.get("STATS_MAX_AGE", "3600")))
+RECENT_DAYS = 30
+RECENT_LIMIT = 10
+
+
+def build_stats_pipeline(now: datetime) -> List[Dict]:
+    since = (now - timedelta(days=RECENT_DAYS)).strftime("%Y-%m-%d")
+    return [
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "by_type": [{"$group": {"_id": "$type", "count": {"$sum": 1}}}],
+            "recent_cases": [
+                {"$match": {"date": {"$gte": since}}},
+                {"$sort": {"date": -1, "_id": -1}},
+                {"$limit": RECENT_LIMIT},
+            ],
+        }},
+    ]
+
+
+def compute_stats(collection, now: Optional[datetime] = None) -> Dict:
+    """Run the stats aggregation and shape it like the /api/stats response"""
+    now = now or datetime.utcnow()
+    result = next(collection.aggregate(build_stats_pipeline(now)), {})
+    by_type = {bucket["_id"]: bucket["count"] for bucket in result.get("by_type", [])}
+    recent_cases = result.get("recent_cases", [])
+    for case in recent_cases:
+        case["id"] = str(case.pop("_id"))
+    return {
+        "total_cases": (result.get("total") or [{"count": 0}])[0]["count"],
+        "total_orders": by_type.get("Order", 0),
+        "total_decisions": by_type.get("Decision", 0),
+        "recent_cases": recent_cases,
+        "computed_at": now,
+    }
+
+
+def refresh_stats(db) -> Dict:
+    """Recompute the stats and store them in the materialized document"""
+    stats = compute_stats(db["cases"])
+    db["stats"].replace_one({"_id": STATS_DOCUMENT_ID}, {"_id": STATS_DOCUMENT_ID, **stats}, upsert=True)
+    return stats
+
+
+def load_stats(db, max_age: timedelta = STATS_MAX_AGE) -> Dict:
+    """Read the materialized stats, recomputing them if missing or stale"""
+    stats = db["stats"].find_one({"_id": STATS_DOCUMENT_ID})
+    if stats is None or datetime.utcnow() - stats["computed_at"] > max_age:
+        return refresh_stats(db)
+    stats.pop("_id")
+    return stats
@@ -0,0 +1,109 @@
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+# One alternation per citation kind; the optional trailing instrument applies to all of them.
+CITATION_RE = re.compile(
+    r"""
+    \b(?:
+        (?P<rule>Rules?|RoP)\s*(?P<rule_number>\d+[A-Z]?(?:\.\d+)*)
+      | (?P<article>Articles?|Art\.)\s*(?P<article_number>\d+[a-z]?(?:\.\d+)*)
+      | (?P<paragraph>paragraphs?)\s+(?P<paragraph_number>\d+(?:\.\d+)*[a-z]?)
+    )
+    (?P<subdivision>(?:\s?\(\d+[a-z]?\))*(?:\s?\([a-z]\))?)
+    (?:\s*,?\s*(?:of\s+the\s+)?(?P<instrument>UPCA|Agreement|RoP|Rules\s+of\s+Procedure|EPC|Statute)\b)?
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+INSTRUMENTS = {
+    "upca": "UPCA",
+    "agreement": "UPCA",
+    "rop": "RoP",
+    "rules of procedure": "RoP",
+    "epc": "EPC",
+    "statute": "Statute",
+}
+
+KIND_LABELS = {"rule": "Rule", "article": "Article", "paragraph": "paragraph"}
+
+# Below this many texts a process pool costs more than it saves
+PARALLEL_THRESHOLD = 200
+
+
+class Citation(NamedTuple):
+    kind: str
+    number: str
+    subdivision: str
+    instrument: Optional[str]
+    text: str
+    spans: List[Tuple[int, int]]
+
+    @property
+    def start(self) -> int:
+        return self.spans[0][0]
+
+    @property
+    def end(self) -> int:
+        return self.spans[0][1]
+
+    @property
+    def label(self) -> str:
+        """Kind and number without subdivision or instrument, e.g. 'Article 49'"""
+        return f"{KIND_LABELS[self.kind]} {self.number}"
+
+
+def _normalize(match: re.Match) -> Tuple[str, str, str, Optional[str]]:
+    for kind in ("rule", "article", "paragraph"):
+        if match.group(kind):
+            number = match.group(f"{kind}_number")
+            break
+    subdivision = re.sub(r"\s+", "", match.group("subdivision") or "")
+    instrument = match.group("instrument")
+    if instrument:
+        instrument = INSTRUMENTS[re.sub(r"\s+", " ", instrument.lower())]
+    if kind == "rule" and match.group("rule").lower() == "rop":
+        instrument = "RoP"
+    return kind, number.upper() if kind == "rule" else number.lower(), subdivision, instrument
+
+
+def scan(text: str) -> List[Citation]:
+    """Find every legal citation in text in one pass.
+
+    Citations are normalized ('Art. 32 of the Agreement' -> 'Article 32 UPCA')
+    and de-duplicated in order of first appearance; ``spans`` keeps the
+    character offsets of every occurrence.
+    """
+    if not text:
+        return []
+    found = {}
+    for match in CITATION_RE.finditer(text):
+        kind, number, subdivision, instrument = _normalize(match)
+        normalized = f"{KIND_LABELS[kind]} {number}{subdivision}"
+        if instrument and not (kind == "rule" and instrument == "RoP"):
+            normalized += f" {instrument}"
+        citation = found.get(normalized)
+        if citation is None:
+            found[normalized] = Citation(kind, number, subdivision, instrument, normalized, [match.span()])
+        else:
+            citation.spans.append(match.span())
+    return list(found.values())
+
+
+def scan_many(texts: Iterable[str], processes: Optional[int] = None, chunksize: int = 64) -> List[List[Citation]]:
+    """Scan a batch of texts, fanning out to a process pool for large corpora"""
+    texts = list(texts)
+    if processes == 1 or len(texts) < PARALLEL_THRESHOLD:
+        return [scan(text) for text in texts]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(scan, texts, chunksize=chunksize))
+
+
+def cross_reference_labels(citations: Iterable[Citation]) -> List[str]:
+    """Labels used for upc_texts.cross_references ('Rule 13', 'Article 32 UPCA', ...)"""
+    labels = set()
+    for citation in citations:
+        labels.add(citation.label)
+        if citation.kind == "article" and citation.instrument:
+            labels.add(f"{citation.label} {citation.instrument}")
+    return sorted(labels)
@@ -0,0 +1,180 @@
+"""gzip/brotli response compression.
+
+``CompressionMiddleware`` compresses uncached responses per request, off the
+event loop for buffered bodies and incrementally for streamed ones. The
+response cache uses the same helpers to keep precompressed variants of hot
+entries (see response_cache.ResponseCacheMiddleware), so those are
+compressed once, at a higher level, instead of on every hit.
+"""
+
+import asyncio
+import gzip
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+MINIMUM_SIZE = 1024
+COMPRESSIBLE_TYPES = (b"application/json", b"application/x-ndjson", b"text/", b"application/javascript",
+                      b"application/xml", b"image/svg+xml")
+
+# Per-request compression favours speed; cached variants are compressed once and kept
+DYNAMIC_LEVELS = {"br": 4, "gzip": 6}
+CACHED_LEVELS = {"br": 9, "gzip": 9}
+
+Headers = List[Tuple[bytes, bytes]]
+
+
+def supported_encodings() -> List[str]:
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header, honouring q-values"""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding.strip()] = quality
+    candidates = [(weights.get(coding, weights.get("*", 0.0)), -rank, coding)
+                  for rank, coding in enumerate(supported_encodings())]
+    quality, _, coding = max(candidates)
+    return coding if quality > 0 else None
+
+
+def header_value(headers: Headers, name: bytes) -> Optional[bytes]:
+    return next((value for key, value in headers if key == name), None)
+
+
+def is_compressible(status: int, headers: Headers, size: int) -> bool:
+    if status != 200 or size < MINIMUM_SIZE or header_value(headers, b"content-encoding") is not None:
+        return False
+    content_type = header_value(headers, b"content-type") or b""
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(body: bytes, encoding: str, levels: Dict[str, int] = DYNAMIC_LEVELS) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=levels["br"])
+    return gzip.compress(body, compresslevel=levels["gzip"], mtime=0)
+
+
+async def compress_off_loop(body: bytes, encoding: str, levels: Dict[str, int] = DYNAMIC_LEVELS) -> bytes:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, compress, body, encoding, levels)
+
+
+def with_vary(headers: Headers) -> Headers:
+    vary = header_value(headers, b"vary")
+    if vary is None:
+        return headers + [(b"vary", b"Accept-Encoding")]
+    if b"accept-encoding" in vary.lower():
+        return headers
+    return [(key, value) for key, value in headers if key != b"vary"] + [(b"vary", vary + b", Accept-Encoding")]
+
+
+def encoded_headers(headers: Headers, encoding: str, length: Optional[int]) -> Headers:
+    """Headers for the encoded representation; strong ETags become weak"""
+    result = []
+    for key, value in headers:
+        if key == b"content-length":
+            continue
+        if key == b"etag" and not value.startswith(b"W/"):
+            value = b"W/" + value
+        result.append((key, value))
+    result.append((b"content-encoding", encoding.encode("ascii")))
+    if length is not None:
+        result.append((b"content-length", str(length).encode("ascii")))
+    return with_vary(result)
+
+
+class _StreamCompressor:
+    """Incremental compressor that flushes after every chunk so streams stay live"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=DYNAMIC_LEVELS["br"])
+        else:
+            self._compressor = zlib.compressobj(DYNAMIC_LEVELS["gzip"], zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """ASGI middleware negotiating gzip/brotli for responses that are not encoded yet"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding((header_value(scope["headers"], b"accept-encoding") or b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        stream: Optional[_StreamCompressor] = None
+        passthrough = False
+
+        async def compressing_send(message):
+            nonlocal start_message, stream, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            headers = list(start_message["headers"])
+
+            if stream is not None:
+                data = stream.chunk(body) if more_body else stream.chunk(body) + stream.finish()
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+                return
+
+            if more_body:
+                # Streamed response: compress chunk by chunk if the type allows it
+                if not is_compressible(start_message["status"], headers, MINIMUM_SIZE):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                stream = _StreamCompressor(encoding)
+                await send({**start_message, "headers": encoded_headers(headers, encoding, None)})
+                await send({"type": "http.response.body", "body": stream.chunk(body), "more_body": True})
+                return
+
+            if not is_compressible(start_message["status"], headers, len(body)):
+                await send(start_message)
+                await send(message)
+                return
+            compressed = await compress_off_loop(body, encoding)
+            await send({**start_message, "headers": encoded_headers(headers, encoding, len(compressed))})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, compressing_send)
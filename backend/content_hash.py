@@ -0,0 +1,42 @@
+"""Content hashes stamped on documents at write time.
+
+``content_hash`` identifies one version of a case or UPC text. The API derives
+strong ETags from it, so a read never has to hash the serialized response.
+"""
+
+import hashlib
+import json
+from typing import Dict, List
+
+from pymongo import UpdateOne
+
+BULK_BATCH_SIZE = 500
+EXCLUDED_FIELDS = {"_id", "id", "content_hash"}
+
+
+def compute_content_hash(document: Dict) -> str:
+    """SHA-256 (first 128 bits, hex) of the document's canonical JSON"""
+    content = {key: value for key, value in document.items() if key not in EXCLUDED_FIELDS}
+    payload = json.dumps(content, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def stamp_content_hash(document: Dict) -> Dict:
+    """Set content_hash on a document about to be written"""
+    document["content_hash"] = compute_content_hash(document)
+    return document
+
+
+def backfill_content_hashes(collection, batch_size: int = BULK_BATCH_SIZE) -> int:
+    """One-off migration: stamp every document that has no content_hash yet"""
+    operations: List[UpdateOne] = []
+    updated = 0
+    for document in collection.find({"content_hash": {"$exists": False}}):
+        operations.append(UpdateOne({"_id": document["_id"]},
+                                    {"$set": {"content_hash": compute_content_hash(document)}}))
+        if len(operations) >= batch_size:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        updated += collection.bulk_write(operations, ordered=False).modified_count
+    return updated
@@ -0,0 +1,177 @@
+"""Canonical model of UPC court divisions.
+
+The court division scraped from the UPC site comes in many spellings
+("Milan (IT) Local Division", "Court of First Instance - Milano (IT)",
+"Local Division - München (DE)", ...). Cases are enriched at write time with a
+structured ``division`` and an indexed ``division_code`` so filtering is an
+exact match instead of a case-insensitive regex over every document.
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, NamedTuple, Optional
+
+from pymongo import UpdateOne
+
+from content_hash import compute_content_hash
+
+BULK_BATCH_SIZE = 500
+
+TIER_LABELS = {"cfi": "Court of First Instance", "coa": "Court of Appeal"}
+DIVISION_TYPE_LABELS = {"local": "Local Division", "regional": "Regional Division", "central": "Central Division"}
+
+# Canonical city -> (country code, spellings seen on the UPC site and in documents)
+CITIES = {
+    "Vienna": ("AT", ["vienna", "wien"]),
+    "Brussels": ("BE", ["brussels", "bruxelles", "brussel"]),
+    "Copenhagen": ("DK", ["copenhagen", "kobenhavn", "koebenhavn"]),
+    "Helsinki": ("FI", ["helsinki", "helsingfors"]),
+    "Paris": ("FR", ["paris"]),
+    "Düsseldorf": ("DE", ["dusseldorf", "duesseldorf"]),
+    "Hamburg": ("DE", ["hamburg"]),
+    "Mannheim": ("DE", ["mannheim"]),
+    "Munich": ("DE", ["munich", "munchen", "muenchen"]),
+    "Milan": ("IT", ["milan", "milano"]),
+    "The Hague": ("NL", ["the hague", "den haag", "la haye"]),
+    "Lisbon": ("PT", ["lisbon", "lisboa"]),
+    "Ljubljana": ("SI", ["ljubljana"]),
+    "Luxembourg": ("LU", ["luxembourg"]),
+    "Nordic-Baltic": ("SE", ["nordic-baltic", "nordic baltic", "stockholm"]),
+}
+
+CITY_RE = re.compile(
+    r"\b(" + "|".join(sorted((re.escape(alias) for _, aliases in CITIES.values() for alias in aliases),
+                             key=len, reverse=True)) + r")\b"
+)
+CITY_BY_ALIAS = {alias: city for city, (_, aliases) in CITIES.items() for alias in aliases}
+# Cities seating a section of the Central Division next to their Local Division
+CENTRAL_DIVISION_SEATS = {"Paris", "Munich", "Milan"}
+# What is left of "Paris (FR)" once the city is taken out: then it names no particular division
+BARE_CITY_RE = re.compile(r"[\s,.-]*(?:\([a-z]{2}\))?[\s,.-]*")
+
+
+class CourtDivision(NamedTuple):
+    tier: str  # "cfi" or "coa"
+    division_type: Optional[str]  # "local", "regional", "central"; None for the Court of Appeal
+    city: str
+    country_code: str
+
+    @property
+    def division_code(self) -> str:
+        """Stable key used for filtering, e.g. 'cfi-local-milan' or 'coa-luxembourg'"""
+        slug = _fold(self.city).replace(" ", "-")
+        if self.division_type is None:
+            return f"{self.tier}-{slug}"
+        return f"{self.tier}-{self.division_type}-{slug}"
+
+    @property
+    def label(self) -> str:
+        """Display name, e.g. 'Court of First Instance - Milan (IT) Local Division'"""
+        if self.division_type is None:
+            return f"{TIER_LABELS[self.tier]} - {self.city} ({self.country_code})"
+        if self.division_type == "regional":
+            return f"{TIER_LABELS[self.tier]} - {self.city} Regional Division"
+        return f"{TIER_LABELS[self.tier]} - {self.city} ({self.country_code}) {DIVISION_TYPE_LABELS[self.division_type]}"
+
+    def to_dict(self) -> Dict:
+        return {
+            "tier": self.tier,
+            "division_type": self.division_type,
+            "city": self.city,
+            "country_code": self.country_code,
+            "code": self.division_code,
+        }
+
+
+def _fold(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def parse_division(raw: Optional[str]) -> Optional[CourtDivision]:
+    """Parse any scraped court division string; None if it names no known division"""
+    if not raw:
+        return None
+    folded = _fold(raw)
+    match = CITY_RE.search(folded)
+    if not match:
+        return None
+    city = CITY_BY_ALIAS[match.group(1)]
+    country_code = CITIES[city][0]
+
+    if "court of appeal" in folded or city == "Luxembourg":
+        return CourtDivision("coa", None, city, country_code)
+    if "central" in folded:
+        division_type = "central"
+    elif "regional" in folded or city == "Nordic-Baltic":
+        division_type = "regional"
+    else:
+        division_type = "local"
+    return CourtDivision("cfi", division_type, city, country_code)
+
+
+def city_divisions(city: str) -> List[CourtDivision]:
+    """Every division seated in a city"""
+    division = parse_division(city)
+    if city in CENTRAL_DIVISION_SEATS:
+        return [division, CourtDivision("cfi", "central", city, division.country_code)]
+    return [division]
+
+
+def parse_divisions(raw: Optional[str]) -> List[CourtDivision]:
+    """Divisions a user-entered string may mean: all of a city's for a bare city name like 'Paris'"""
+    division = parse_division(raw)
+    if division is None:
+        return []
+    folded = _fold(raw).strip()
+    match = CITY_RE.search(folded)
+    if BARE_CITY_RE.fullmatch(folded[:match.start()] + folded[match.end():]):
+        return city_divisions(division.city)
+    return [division]
+
+
+def enrich_case(case: Dict) -> Dict:
+    """Add the canonical division fields to a case document before it is written"""
+    division = parse_division(case.get("court_division"))
+    if division is None:
+        case["division"] = None
+        case["division_code"] = None
+        return case
+    case["division"] = division.to_dict()
+    case["division_code"] = division.division_code
+    case["court_division"] = division.label
+    return case
+
+
+def division_filter(value: str) -> Dict:
+    """Exact-match query for a division code, any spelling of a division, or a city's divisions
+
+    Anything else falls back to the case-insensitive substring match on the
+    label that the filter used before division codes existed.
+    """
+    divisions = parse_divisions(value)
+    if len(divisions) == 1:
+        return {"division_code": divisions[0].division_code}
+    if divisions:
+        return {"division_code": {"$in": [division.division_code for division in divisions]}}
+    if re.fullmatch(r"[a-z]+(?:-[a-z]+)+", value):
+        return {"division_code": value}
+    return {"court_division": {"$regex": re.escape(value), "$options": "i"}}
+
+
+def backfill_divisions(collection, batch_size: int = BULK_BATCH_SIZE) -> int:
+    """One-off migration: enrich every case that has no division_code yet (and restamp the content hash)"""
+    operations: List[UpdateOne] = []
+    updated = 0
+    for case in collection.find({"division_code": {"$exists": False}}):
+        enrich_case(case)
+        update = {field: case.get(field) for field in ("division", "division_code", "court_division")}
+        if "content_hash" in case:
+            update["content_hash"] = compute_content_hash(case)
+        operations.append(UpdateOne({"_id": case["_id"]}, {"$set": update}))
+        if len(operations) >= batch_size:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        updated += collection.bulk_write(operations, ordered=False).modified_count
+    return updated
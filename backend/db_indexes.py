@@ -0,0 +1,137 @@
+"""Declared MongoDB indexes and a startup audit of the hot query shapes.
+
+Compound indexes follow the equality, sort, range order: the equality filters
+used by get_cases come first, then the (date, _id) sort key, which also serves
+date range filters. Every list query then walks one index in order instead of
+scanning the collection and sorting in memory. The audit explains the same
+``list_pipeline`` aggregations the list endpoints run, so a ``$sort`` the
+planner cannot push down into the index shows up as well.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pymongo import IndexModel
+
+from field_presets import list_pipeline
+from pagination import CASES_SORT, UPC_TEXTS_SORT
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "cases": [
+        IndexModel([("summary", "text"), ("parties", "text"), ("reference", "text")]),
+        IndexModel(CASES_SORT),
+        IndexModel([("excluded", 1)] + CASES_SORT),
+        IndexModel([("type", 1)] + CASES_SORT),
+        IndexModel([("language_of_proceedings", 1)] + CASES_SORT),
+        IndexModel([("excluded", 1), ("type", 1)] + CASES_SORT),
+        IndexModel([("excluded", 1), ("language_of_proceedings", 1)] + CASES_SORT),
+        IndexModel([("division_code", 1)] + CASES_SORT),
+        IndexModel([("excluded", 1), ("division_code", 1)] + CASES_SORT),
+        # Multikey: /api/parties/{id}/cases
+        IndexModel([("party_ids", 1)] + CASES_SORT),
+        # Duplicate lookups in UPCScraper.save_to_mongodb
+        IndexModel([("registry_number", 1)]),
+        IndexModel([("order_reference", 1)]),
+    ],
+    "upc_texts": [
+        IndexModel([("title", "text"), ("content", "text"), ("article_number", "text")]),
+        IndexModel(UPC_TEXTS_SORT),
+        IndexModel([("document_type", 1)] + UPC_TEXTS_SORT),
+    ],
+    "newsletter": [
+        IndexModel([("subject", "text"), ("content", "text")]),
+    ],
+    "users": [
+        IndexModel([("email", 1)], unique=True),
+    ],
+}
+
+# (collection, filter, sort) shapes issued by the API that must stay index-backed; sorted
+# shapes are list pages, audited as list_pipeline aggregations, the others as find()
+SAMPLE_DATE_RANGE = {"$gte": "2024-01-01", "$lte": "2024-12-31"}
+AUDITED_QUERIES: List[Tuple[str, Dict, Optional[List[Tuple[str, int]]]]] = [
+    ("cases", {}, CASES_SORT),
+    ("cases", {"excluded": False}, CASES_SORT),
+    ("cases", {"type": "Order"}, CASES_SORT),
+    ("cases", {"language_of_proceedings": "EN"}, CASES_SORT),
+    ("cases", {"excluded": False, "type": "Order"}, CASES_SORT),
+    ("cases", {"excluded": False, "language_of_proceedings": "EN"}, CASES_SORT),
+    ("cases", {"division_code": "cfi-local-munich"}, CASES_SORT),
+    ("cases", {"excluded": False, "division_code": "cfi-local-munich"}, CASES_SORT),
+    ("cases", {"date": SAMPLE_DATE_RANGE}, CASES_SORT),
+    ("cases", {"excluded": False, "date": SAMPLE_DATE_RANGE}, CASES_SORT),
+    ("cases", {"type": "Order", "date": SAMPLE_DATE_RANGE}, CASES_SORT),
+    ("cases", {"registry_number": "App_0/2025"}, None),
+    ("cases", {"party_ids": "renault-deutschland-ag", "excluded": {"$ne": True}}, CASES_SORT),
+    ("upc_texts", {}, UPC_TEXTS_SORT),
+    ("upc_texts", {"document_type": "rules_of_procedure"}, UPC_TEXTS_SORT),
+]
+
+# Query plan stages, plus a pipeline $sort left over after the cursor stage (sorted in memory)
+FLAGGED_STAGES = {"COLLSCAN", "SORT", "$sort"}
+
+
+def ensure_indexes(db) -> Dict[str, List[str]]:
+    """Create every declared index; existing ones are left untouched"""
+    created = {}
+    for collection_name, indexes in INDEXES.items():
+        try:
+            created[collection_name] = db[collection_name].create_indexes(indexes)
+        except Exception as e:
+            print(f"Index creation warning on {collection_name}: {e}")
+    return created
+
+
+def _plan_stages(plan) -> Iterator[str]:
+    """Stages of the winning plan(s) anywhere in an explain output, rejected plans aside"""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for key, value in plan.items():
+            if key != "rejectedPlans":
+                yield from _plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _plan_stages(item)
+
+
+def _pipeline_stages(explained: Dict) -> Iterator[str]:
+    """Aggregation stages run after the query layer, like a $sort that was not pushed down"""
+    for stage in explained.get("stages", []):
+        yield from (name for name in stage if name != "$cursor")
+
+
+def explain_query(db, collection_name: str, query: Dict, sort: Optional[List[Tuple[str, int]]]) -> Dict:
+    """Query planner output for a query shape, run the way the API runs it"""
+    if sort is None:
+        return db[collection_name].find(query).limit(100).explain()
+    pipeline = list_pipeline(query, sort, None, 100)
+    return db.command({"explain": {"aggregate": collection_name, "pipeline": pipeline, "cursor": {}},
+                       "verbosity": "queryPlanner"})
+
+
+def audit_query_plans(db) -> List[str]:
+    """Explain each audited query shape and warn about COLLSCAN or blocking SORT stages"""
+    warnings = []
+    audited = 0
+    for collection_name, query, sort in AUDITED_QUERIES:
+        try:
+            explained = explain_query(db, collection_name, query, sort)
+        except Exception as e:
+            print(f"Index audit skipped for {collection_name} {query}: {e}")
+            continue
+        audited += 1
+        stages = set(_plan_stages(explained)) | set(_pipeline_stages(explained))
+        flagged = sorted(FLAGGED_STAGES.intersection(stages))
+        if flagged:
+            shape = f"aggregate({query}) sort({sort})" if sort else f"find({query})"
+            warning = f"{collection_name} {shape} uses {', '.join(flagged)}"
+            warnings.append(warning)
+            print(f"⚠️  Index audit: {warning}")
+    if audited and not warnings:
+        print(f"Index audit: {audited} query shapes are index-backed")
+    return warnings
+
+
+def ensure_indexes_and_audit(db) -> List[str]:
+    ensure_indexes(db)
+    return audit_query_plans(db)
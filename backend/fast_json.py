@@ -0,0 +1,49 @@
+"""orjson-backed JSON responses.
+
+orjson serializes datetime, date and UUID natively and is several times faster
+than json.dumps on large lists of documents. Read endpoints that return
+``json_response(...)`` also skip FastAPI's jsonable_encoder pass, since the
+documents coming out of Mongo are already JSON-ready.
+"""
+
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _default(value: Any) -> Any:
+    # ObjectId, Decimal128 and anything else orjson does not know natively
+    return str(value)
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(content: Any, response: Optional[Response] = None, status_code: int = 200) -> FastJSONResponse:
+    """Serialize content directly, carrying over headers set on the injected Response"""
+    headers = dict(response.headers) if response is not None else None
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
+
+
+async def ndjson_lines(cursor, first_batch: List[Dict]) -> AsyncIterator[bytes]:
+    """One NDJSON chunk per cursor batch, so memory stays bounded by the batch size"""
+    try:
+        batch = first_batch
+        while batch:
+            yield b"".join(dumps(document) + b"\n" for document in batch)
+            batch = await cursor.next_batch()
+    finally:
+        await cursor.close()
@@ -0,0 +1,67 @@
+"""Named field presets for list endpoints, mapped to Mongo projections.
+
+``full`` returns whole documents (the historical behaviour). The other presets
+only ship what a view renders. ``ids`` projects nothing outside the
+(date, _id) sort key, so unfiltered and date/keyset queries are covered by the
+pagination index and never fetch documents. ``list`` cannot be covered
+because ``parties`` is an array (multikey indexes do not cover).
+``content_hash`` rides along so list ETags never hash response bodies; ``ids``
+pages, which cannot carry it and stay covered, are tagged with the cases
+version counter instead.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+CASE_FIELD_PRESETS: Dict[str, Optional[List[str]]] = {
+    "ids": ["date"],
+    "list": [
+        "date", "type", "registry_number", "order_reference", "court_division", "division_code",
+        "type_of_action", "language_of_proceedings", "parties", "party_ids", "content_hash",
+    ],
+    "card": [
+        "date", "type", "registry_number", "order_reference", "court_division", "division_code",
+        "type_of_action", "language_of_proceedings", "parties", "party_ids", "patent",
+        "summary", "admin_summary", "tags", "legal_norms", "content_hash",
+    ],
+    "full": None,
+}
+
+UPC_TEXT_FIELD_PRESETS: Dict[str, Optional[List[str]]] = {
+    "list": [
+        "document_type", "article_number", "title", "language",
+        "part_number", "part_title", "chapter_number", "chapter_title", "section_number", "section_title",
+        "content_hash",
+    ],
+    "full": None,
+}
+
+
+def projection_for(presets: Dict[str, Optional[List[str]]], name: str,
+                   sort: List[Tuple[str, int]]) -> Optional[Dict[str, int]]:
+    """Projection for a preset; sort fields are always kept so cursors can be built"""
+    if name not in presets:
+        raise ValueError(f"Unknown fields preset '{name}'. Use one of: {', '.join(presets)}")
+    fields = presets[name]
+    if fields is None:
+        return None
+    projection = {field: 1 for field in fields}
+    for field, _ in sort:
+        projection[field] = 1
+    return projection
+
+
+def list_pipeline(query: Dict, sort: List[Tuple[str, int]], projection: Optional[Dict[str, int]],
+                  limit: Optional[int], skip: int = 0) -> List[Dict]:
+    """Aggregation for a list page that renames _id to id inside the database; no limit streams everything"""
+    pipeline: List[Dict] = [{"$match": query}] if query else []
+    pipeline.append({"$sort": dict(sort)})
+    if skip:
+        pipeline.append({"$skip": skip})
+    if limit is not None:
+        pipeline.append({"$limit": limit})
+    if projection is None:
+        pipeline += [{"$addFields": {"id": "$_id"}}, {"$project": {"_id": 0}}]
+    else:
+        fields = {field: 1 for field in projection if field != "_id"}
+        pipeline.append({"$project": {"_id": 0, "id": "$_id", **fields}})
+    return pipeline
@@ -0,0 +1,98 @@
+"""Character trigram index for typo-tolerant matching of search terms.
+
+Holds the index terms that occur in parties, patent numbers and references.
+A misspelt query word is expanded to the vocabulary terms sharing enough
+trigrams with it (counted over precomputed trigram postings, never by
+scanning the vocabulary), and those candidates are kept and ranked by
+Damerau-Levenshtein (optimal string alignment) distance.
+"""
+
+from array import array
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+MIN_FUZZY_LENGTH = 4
+MAX_CANDIDATES = 200
+MAX_EXPANSIONS = 8
+
+
+def max_distance(word: str) -> int:
+    """Edits tolerated for a query word of this length"""
+    if len(word) < MIN_FUZZY_LENGTH:
+        return 0
+    return 1 if len(word) < 8 else 2
+
+
+def trigrams(word: str) -> List[str]:
+    padded = f"${word}$"
+    return list(dict.fromkeys(padded[i:i + 3] for i in range(len(padded) - 2)))
+
+
+def edit_distance(left: str, right: str, limit: int) -> int:
+    """Optimal string alignment distance, so "renualt" is one edit from "renault"; stops past limit"""
+    if abs(len(left) - len(right)) > limit:
+        return limit + 1
+    previous_previous = None
+    previous = list(range(len(right) + 1))
+    for i, left_char in enumerate(left, start=1):
+        current = [i] + [0] * len(right)
+        for j, right_char in enumerate(right, start=1):
+            cost = left_char != right_char
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and i > 1 and j > 1 and left_char == right[j - 2]
+                    and left[i - 2] == right_char):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class FuzzyIndex:
+    def __init__(self):
+        self.terms: List[str] = []
+        self._term_ids: Dict[str, int] = {}
+        self._postings: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self._term_ids
+
+    def add(self, term: str) -> None:
+        if term in self._term_ids or len(term) < MIN_FUZZY_LENGTH - 1:
+            return
+        term_id = len(self.terms)
+        self.terms.append(term)
+        self._term_ids[term] = term_id
+        for gram in trigrams(term):
+            postings = self._postings.get(gram)
+            if postings is None:
+                postings = self._postings[gram] = array("I")
+            postings.append(term_id)
+
+    def expand(self, word: str) -> List[Tuple[str, int]]:
+        """Vocabulary terms within the word's edit budget, closest first, as (term, distance)"""
+        limit = max_distance(word)
+        if not limit:
+            return []
+        grams = trigrams(word)
+        lists = [np.frombuffer(self._postings[gram], dtype=np.uint32) for gram in grams if gram in self._postings]
+        if not lists:
+            return []
+        # An edit destroys at most three trigrams, a transposition four
+        required = max(1, len(grams) - 4 * limit)
+        counts = np.bincount(np.concatenate(lists))
+        candidates = np.flatnonzero(counts >= required)
+        if candidates.size > MAX_CANDIDATES:
+            candidates = candidates[np.argsort(-counts[candidates], kind="stable")[:MAX_CANDIDATES]]
+        matches = []
+        for term_id in candidates.tolist():
+            term = self.terms[term_id]
+            distance = edit_distance(word, term, limit)
+            if distance <= limit:
+                matches.append((distance, -int(counts[term_id]), term))
+        matches.sort()
+        return [(term, distance) for distance, _, term in matches[:MAX_EXPANSIONS]]
@@ -0,0 +1,63 @@
+"""ETag and Cache-Control helpers for read endpoints."""
+
+import hashlib
+import json
+from typing import Dict, Iterable, Optional
+
+from fastapi import Request, Response
+
+# Browsers revalidate quickly; a CDN may keep a copy a little longer and serve
+# it stale while it revalidates in the background.
+CASES_CACHE_CONTROL = "public, max-age=60, s-maxage=300, stale-while-revalidate=60"
+UPC_TEXTS_CACHE_CONTROL = "public, max-age=300, s-maxage=3600, stale-while-revalidate=300"
+
+
+def document_etag(document: Dict) -> Optional[str]:
+    """Strong ETag from the content_hash stored with the document"""
+    content_hash = document.get("content_hash")
+    return f'"{content_hash}"' if content_hash else None
+
+
+def list_etag(items: Iterable[Dict], variant: str, version: Optional[int] = None) -> str:
+    """Strong ETag for a list response, combining the items' stored hashes.
+
+    ``variant`` covers everything else that shapes the body (query string,
+    fields preset). Presets that project no content_hash (``ids``) pass the
+    collection's version counter instead, read before the query; the tag is
+    then built from variant and version alone and no item is looked at.
+    Items still missing a content_hash otherwise are hashed directly.
+    """
+    digest = hashlib.sha256(variant.encode("utf-8"))
+    if version is not None:
+        digest.update(f"\0version:{version}".encode("ascii"))
+        return f'"{digest.hexdigest()[:32]}"'
+    for item in items:
+        content_hash = item.get("content_hash")
+        if content_hash:
+            digest.update(content_hash.encode("ascii"))
+        else:
+            digest.update(json.dumps(item, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison; compression middleware may add W/
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def conditional_response(request: Request, response: Response, etag: Optional[str],
+                         cache_control: str) -> Optional[Response]:
+    """Set validators on response; return a 304 to send instead when the client copy is current"""
+    if etag is None:
+        return None
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return None
@@ -0,0 +1,119 @@
+import json
+import os
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+VOCABULARY_PATH = Path(
+    os.environ.get(
+        "LEGAL_VOCABULARY_PATH",
+        Path(__file__).resolve().parent / "Ressources" / "legal_vocabulary.json",
+    )
+)
+
+
+def load_vocabulary(path: Optional[Path] = None) -> Dict[str, List[str]]:
+    """Load the legal vocabulary (keywords, tags, detail_tags) from JSON"""
+    with open(path or VOCABULARY_PATH, encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+class KeywordTagger:
+    """Aho-Corasick automaton matching a fixed vocabulary in a single pass.
+
+    Matching is case-insensitive and only whole words count: a term must not
+    be directly preceded or followed by a letter or digit.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms: List[str] = []
+        self._lengths: List[int] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        seen = set()
+        for term in terms:
+            key = term.strip().lower()
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            self._add(key, len(self.terms))
+            self.terms.append(term.strip())
+            self._lengths.append(len(key))
+        self._build_failure_links()
+
+    def _add(self, key: str, term_id: int) -> None:
+        state = 0
+        for char in key:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(term_id)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _iter_matches(self, text: str) -> Iterable[Tuple[int, int]]:
+        """Yield (term_id, start) for every whole-word occurrence"""
+        text = text.lower()
+        length = len(text)
+        state = 0
+        goto, fail, output = self._goto, self._fail, self._output
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not output[state]:
+                continue
+            after = position + 1
+            if after < length and text[after].isalnum():
+                continue
+            for term_id in output[state]:
+                start = after - self._lengths[term_id]
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                yield term_id, start
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Return occurrence counts for every vocabulary term found in text"""
+        counts: Dict[str, int] = {}
+        if not text:
+            return counts
+        for term_id, _ in self._iter_matches(text):
+            term = self.terms[term_id]
+            counts[term] = counts.get(term, 0) + 1
+        return counts
+
+    def rank(self, text: str, limit: Optional[int] = None) -> List[str]:
+        """Return matched terms ordered by frequency, then by first occurrence"""
+        if not text:
+            return []
+        counts: Dict[int, int] = {}
+        first_seen: Dict[int, int] = {}
+        for term_id, start in self._iter_matches(text):
+            counts[term_id] = counts.get(term_id, 0) + 1
+            first_seen.setdefault(term_id, start)
+        ranked = sorted(counts, key=lambda term_id: (-counts[term_id], first_seen[term_id]))
+        return [self.terms[term_id] for term_id in ranked[:limit]]
+
+
+VOCABULARY = load_vocabulary()
+KEYWORD_TAGGER = KeywordTagger(VOCABULARY.get("keywords", []))
+TAG_TAGGER = KeywordTagger(VOCABULARY.get("tags", []))
+DETAIL_TAG_TAGGER = KeywordTagger(VOCABULARY.get("detail_tags", []))
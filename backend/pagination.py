@@ -0,0 +1,62 @@
+import base64
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+# Sort orders for keyset pagination. The trailing _id makes every key unique,
+# so a page boundary never splits or repeats documents that share a sort value.
+CASES_SORT: List[Tuple[str, int]] = [("date", -1), ("_id", -1)]
+UPC_TEXTS_SORT: List[Tuple[str, int]] = [("article_number", 1), ("_id", 1)]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _sort_value(document: Dict, field: str) -> Any:
+    # List pipelines already renamed _id to id
+    if field == "_id" and "_id" not in document:
+        return document.get("id")
+    return document.get(field)
+
+
+def encode_cursor(document: Dict, sort: List[Tuple[str, int]]) -> str:
+    """Opaque cursor pointing just after document in the given sort order"""
+    values = [_sort_value(document, field) for field, _ in sort]
+    payload = json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: List[Tuple[str, int]]) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise InvalidCursor("Malformed pagination cursor")
+    if not isinstance(values, list) or len(values) != len(sort):
+        raise InvalidCursor("Pagination cursor does not match this endpoint")
+    return values
+
+
+def seek_filter(values: List[Any], sort: List[Tuple[str, int]]) -> Dict:
+    """Filter matching documents strictly after the cursor position.
+
+    For sort [(a, -1), (b, -1)] and values [x, y] this is
+    ``{$or: [{a: {$lt: x}}, {a: x, b: {$lt: y}}]}``, which Mongo answers
+    with a bounded scan of the matching compound index.
+    """
+    clauses = []
+    for position, (field, direction) in enumerate(sort):
+        clause = {sort[i][0]: values[i] for i in range(position)}
+        clause[field] = {"$lt" if direction < 0 else "$gt": values[position]}
+        clauses.append(clause)
+    return {"$or": clauses}
+
+
+def apply_cursor(query: Dict, cursor: Optional[str], sort: List[Tuple[str, int]]) -> Dict:
+    """AND the seek filter for cursor into query; an empty cursor is the first page"""
+    if not cursor:
+        return query
+    seek = seek_filter(decode_cursor(cursor, sort), sort)
+    if not query:
+        return seek
+    return {"$and": [query, seek]}
@@ -0,0 +1,102 @@
+"""Stable identifiers for the parties of a case.
+
+Party names scraped from the UPC site come in many spellings ("Renault
+Deutschland AG", "Renault Deutschland AG.", "RENAULT DEUTSCHLAND
+Aktiengesellschaft") and sometimes as one concatenated "A v. B" string.
+Cases are enriched at write time with an indexed ``party_ids`` array of
+normalized slugs (casefolded, diacritics and punctuation stripped, legal
+forms canonicalized), so finding a party's cases is an exact match instead
+of a regex or text search over ``parties``.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from pymongo import UpdateOne
+
+from content_hash import compute_content_hash
+from text_analysis import fold
+
+BULK_BATCH_SIZE = 500
+
+# Spelled-out legal forms (folded, punctuation stripped) -> canonical abbreviation
+LEGAL_FORMS = {
+    "aktiengesellschaft": "ag",
+    "gesellschaft mit beschrankter haftung": "gmbh",
+    "kommanditgesellschaft": "kg",
+    "public limited company": "plc",
+    "limited liability company": "llc",
+    "limited": "ltd",
+    "incorporated": "inc",
+    "corporation": "corp",
+    "company": "co",
+    "societe anonyme": "sa",
+    "societe par actions simplifiee": "sas",
+    "societa per azioni": "spa",
+    "societa a responsabilita limitata": "srl",
+    "besloten vennootschap": "bv",
+    "naamloze vennootschap": "nv",
+}
+_LEGAL_FORM_RE = re.compile(
+    r"\b(" + "|".join(sorted(LEGAL_FORMS, key=len, reverse=True)) + r")\b")
+# "s.r.l.", "S.p.A.", "B.V." -> "srl", "spa", "bv"
+_DOTTED_RE = re.compile(r"\b(?:[a-z]\.){2,}(?:[a-z]\b)?")
+# "A v. B", "A vs. B", "A versus B", and "AGv. B" as the site sometimes glues it
+_VERSUS_RE = re.compile(r"\s+(?:v|vs|versus)\.?\s+|(?<=[A-Z])v\.(?=\s)|\s*[;\n]\s*")
+
+
+def split_party_text(text: str) -> List[str]:
+    """Party names from a string that may hold several, like 'Company A v. Company B'"""
+    return [part.strip(" ,") for part in _VERSUS_RE.split(text or "") if part.strip(" ,")]
+
+
+def normalize_party(name: str) -> str:
+    """Comparison key: 'Renault Deutschland AG.' and 'RENAULT Deutschland Aktiengesellschaft' agree"""
+    key = fold(name).replace("&", " and ")
+    key = _DOTTED_RE.sub(lambda match: match.group().replace(".", ""), key)
+    key = " ".join(re.sub(r"[\W_]+", " ", key).split())
+    key = _LEGAL_FORM_RE.sub(lambda match: LEGAL_FORMS[match.group(1)], key)
+    if key.startswith("the "):
+        key = key[4:]
+    return key
+
+
+def party_id(name: str) -> Optional[str]:
+    """URL-safe slug of the normalized name, or None when nothing is left of it"""
+    key = normalize_party(name)
+    return key.replace(" ", "-") if key else None
+
+
+def party_ids(parties: List[str]) -> List[str]:
+    """Distinct ids of every party named, in order of appearance"""
+    ids: Dict[str, None] = {}
+    for text in parties or []:
+        for name in split_party_text(str(text)):
+            identifier = party_id(name)
+            if identifier:
+                ids[identifier] = None
+    return list(ids)
+
+
+def enrich_parties(case: Dict) -> Dict:
+    """Add the party ids to a case document before it is written"""
+    case["party_ids"] = party_ids(case.get("parties") or [])
+    return case
+
+
+def backfill_party_ids(collection, batch_size: int = BULK_BATCH_SIZE) -> int:
+    """One-off migration: add party ids (and restamp the content hash) on cases that have none yet"""
+    operations: List[UpdateOne] = []
+    updated = 0
+    for case in collection.find({"party_ids": {"$exists": False}}):
+        enrich_parties(case)
+        update = {"party_ids": case["party_ids"]}
+        if "content_hash" in case:
+            update["content_hash"] = compute_content_hash(case)
+        operations.append(UpdateOne({"_id": case["_id"]}, {"$set": update}))
+        if len(operations) >= batch_size:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        updated += collection.bulk_write(operations, ordered=False).modified_count
+    return updated
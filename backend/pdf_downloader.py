@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DOWNLOAD_DIR = Path(os.environ.get("UPC_DOWNLOAD_DIR", Path(__file__).resolve().parent / "downloads"))
+CHUNK_SIZE = 8192
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'application/pdf,text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    # Byte ranges and sizes only line up with the file on disk without content coding
+    'Accept-Encoding': 'identity',
+    'Connection': 'keep-alive',
+}
+
+
+class DownloadError(Exception):
+    pass
+
+
+class DownloadResult(NamedTuple):
+    path: Path
+    status: str  # "downloaded", "resumed" or "not_modified"
+    bytes_transferred: int
+
+
+class PDFDownloader:
+    """Download files into a persistent directory over a pooled session.
+
+    Each file has a ``<name>.meta.json`` sidecar with the URL, validators
+    (ETag/Last-Modified), size and SHA-256. Completed files are re-hashed and
+    then revalidated with a conditional request, so a file corrupted on disk
+    is downloaded again rather than reported as not modified; interrupted
+    downloads are kept as ``.part`` files and resumed with a Range request.
+    """
+
+    def __init__(self, download_dir: Optional[Path] = None, session: Optional[requests.Session] = None,
+                 pool_size: int = 4, timeout: int = 60, retries: int = 3):
+        self.download_dir = Path(download_dir or DOWNLOAD_DIR)
+        self.download_dir.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=pool_size,
+                pool_maxsize=pool_size,
+                max_retries=Retry(total=retries, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(DEFAULT_HEADERS)
+        self.session = session
+
+    def _meta_path(self, path: Path) -> Path:
+        return path.with_name(path.name + ".meta.json")
+
+    def _read_meta(self, path: Path) -> Dict:
+        try:
+            with open(self._meta_path(path), encoding="utf-8") as fp:
+                return json.load(fp)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_meta(self, path: Path, meta: Dict) -> None:
+        with open(self._meta_path(path), "w", encoding="utf-8") as fp:
+            json.dump(meta, fp)
+
+    @staticmethod
+    def _sha256(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as fp:
+            for chunk in iter(lambda: fp.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _intact(self, path: Path, meta: Dict, expected_sha256: Optional[str]) -> bool:
+        """Whether a completed file still has the size and SHA-256 recorded for it"""
+        if path.stat().st_size != meta.get("size"):
+            return False
+        sha256 = self._sha256(path)
+        if expected_sha256 and sha256 != expected_sha256.lower():
+            return False
+        return sha256 == meta.get("sha256")
+
+    @staticmethod
+    def _validators(response: requests.Response) -> Dict:
+        return {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+
+    def download(self, url: str, filename: Optional[str] = None,
+                 expected_sha256: Optional[str] = None) -> DownloadResult:
+        """Download url, skipping unchanged files and resuming partial ones"""
+        path = self.download_dir / (filename or Path(urlparse(url).path).name)
+        part_path = path.with_name(path.name + ".part")
+        meta = self._read_meta(path)
+        if meta.get("url") != url:
+            meta = {}
+
+        headers = {}
+        offset = 0
+        if path.exists() and meta.get("complete") and not self._intact(path, meta, expected_sha256):
+            path.unlink(missing_ok=True)
+            self._meta_path(path).unlink(missing_ok=True)
+            meta = {}
+        if path.exists() and meta.get("complete"):
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        elif part_path.exists() and (meta.get("etag") or meta.get("last_modified")):
+            offset = part_path.stat().st_size
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = meta.get("etag") or meta["last_modified"]
+
+        try:
+            response = self.session.get(url, headers=headers, stream=True, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise DownloadError(f"Error downloading {url}: {e}") from e
+
+        with response:
+            if response.status_code == 304:
+                return DownloadResult(path, "not_modified", 0)
+            if response.status_code == 416:
+                # Our partial file does not match the remote one any more
+                part_path.unlink(missing_ok=True)
+                return self.download(url, filename, expected_sha256)
+            try:
+                response.raise_for_status()
+            except requests.HTTPError as e:
+                raise DownloadError(str(e)) from e
+
+            resumed = response.status_code == 206
+            if resumed:
+                total_size = int(response.headers.get("Content-Range", "*/0").rsplit("/", 1)[-1])
+            else:
+                offset = 0
+                total_size = int(response.headers.get("Content-Length") or 0)
+                # Record validators first so an interrupted transfer can be resumed
+                self._write_meta(path, {"url": url, "complete": False, **self._validators(response)})
+
+            transferred = 0
+            try:
+                with open(part_path, "ab" if resumed else "wb") as fp:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        fp.write(chunk)
+                        transferred += len(chunk)
+            except (requests.RequestException, OSError) as e:
+                raise DownloadError(f"Download of {url} interrupted after {offset + transferred} bytes: {e}") from e
+
+            validators = self._validators(response) if not resumed else {
+                "etag": meta.get("etag"), "last_modified": meta.get("last_modified")}
+
+        size = part_path.stat().st_size
+        if total_size and size != total_size:
+            raise DownloadError(f"Size mismatch for {url}: expected {total_size} bytes, got {size}")
+        sha256 = self._sha256(part_path)
+        if expected_sha256 and sha256 != expected_sha256.lower():
+            part_path.unlink(missing_ok=True)
+            raise DownloadError(f"SHA-256 mismatch for {url}")
+
+        os.replace(part_path, path)
+        self._write_meta(path, {"url": url, "complete": True, "size": size, "sha256": sha256, **validators})
+        return DownloadResult(path, "resumed" if resumed else "downloaded", transferred)
@@ -0,0 +1,254 @@
+"""In-process TTL/LRU cache for public GET responses.
+
+Endpoints opt in with ``@cache_response(tags=[...], ttl=...)``. The ASGI
+middleware keys entries by path plus sorted query string, stores the
+serialized body and headers, and replays them without running the endpoint.
+Write paths call ``response_cache.invalidate(tag)`` to drop every entry
+derived from the data they changed. Data written by other processes (the
+scraper) is covered by ``track_version``: the tag's ``cache_versions`` counter
+is re-read at most every ``VERSION_CHECK_INTERVAL`` seconds on lookup, and the
+tag's entries are dropped when it moves. Requests with an Authorization header
+are never cached, since their responses may depend on the user.
+
+Entries also keep gzip/brotli variants of their body, compressed once (off
+the event loop) the first time a client asks for that encoding.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from async_db import run_blocking
+from case_facets import VERSION_CHECK_INTERVAL
+from compression import CACHED_LEVELS, compress_off_loop, encoded_headers, header_value, is_compressible, \
+    negotiate_encoding, with_vary
+from http_caching import etag_matches
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+DEFAULT_TTL = 60
+
+CACHE_POLICY_ATTRIBUTE = "__response_cache__"
+
+
+class CachePolicy(NamedTuple):
+    tags: Tuple[str, ...]
+    ttl: int
+
+
+class CachedResponse(NamedTuple):
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    tags: Tuple[str, ...]
+    expires_at: float
+    variants: Dict[str, bytes]
+
+
+def cache_response(tags: Iterable[str], ttl: int = DEFAULT_TTL) -> Callable:
+    """Mark a GET endpoint as cacheable; apply it below the @app.get decorator"""
+    def decorator(endpoint: Callable) -> Callable:
+        setattr(endpoint, CACHE_POLICY_ATTRIBUTE, CachePolicy(tuple(tags), ttl))
+        return endpoint
+    return decorator
+
+
+def cache_key(path: str, query_string: bytes) -> str:
+    """Normalized key: parameter order and encoding do not matter"""
+    params = sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True))
+    return f"{path}?{urlencode(params)}" if params else path
+
+
+class ResponseCache:
+    """Size-bounded LRU of serialized responses with per-entry TTL and tags"""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+                 check_interval: float = VERSION_CHECK_INTERVAL):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.check_interval = check_interval
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        # tag -> (blocking version reader, last version seen)
+        self._versions: Dict[str, Tuple[Callable[[], int], Optional[int]]] = {}
+        self._checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(self, key: str, status: int, headers: List[Tuple[bytes, bytes]], body: bytes,
+            tags: Iterable[str], ttl: int) -> None:
+        if len(body) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = CachedResponse(status, headers, body, tuple(tags), time.monotonic() + ttl, {})
+        self._bytes += len(body)
+        self._evict()
+
+    def variant(self, key: str, encoding: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        return entry.variants.get(encoding) if entry is not None else None
+
+    def add_variant(self, key: str, encoding: str, body: bytes) -> None:
+        """Keep an encoded copy of an entry's body, if the entry is still cached"""
+        entry = self._entries.get(key)
+        if entry is None or encoding in entry.variants:
+            return
+        entry.variants[encoding] = body
+        self._bytes += len(body)
+        self._evict()
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry.body) + sum(len(variant) for variant in entry.variants.values())
+
+    def track_version(self, tag: str, read_version: Callable[[], int]) -> None:
+        """Drop the tag's entries whenever read_version() (blocking, run off the event loop) returns a new value"""
+        self._versions[tag] = (read_version, None)
+
+    async def check_versions(self) -> None:
+        """Re-read the tracked version counters, at most every check_interval seconds"""
+        now = time.monotonic()
+        if not self._versions or now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        for tag, (read_version, seen) in list(self._versions.items()):
+            version = await run_blocking(read_version)
+            if seen is not None and version != seen:
+                self.invalidate(tag)
+            self._versions[tag] = (read_version, version)
+
+    def invalidate(self, *tags: str) -> int:
+        """Drop every entry carrying any of the given tags"""
+        stale = [key for key, entry in self._entries.items() if set(entry.tags).intersection(tags)]
+        for key in stale:
+            self._remove(key)
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "compressed_variants": sum(len(entry.variants) for entry in self._entries.values()),
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+NOT_MODIFIED_HEADERS = {b"etag", b"cache-control", b"vary"}
+
+
+def _not_modified(scope, entry: CachedResponse) -> bool:
+    """Whether the request's If-None-Match matches the cached response's ETag"""
+    if_none_match = next((value for name, value in scope["headers"] if name == b"if-none-match"), None)
+    etag = next((value for name, value in entry.headers if name == b"etag"), None)
+    if if_none_match is None or etag is None:
+        return False
+    return etag_matches(if_none_match.decode("latin-1"), etag.decode("latin-1"))
+
+
+class ResponseCacheMiddleware:
+    """ASGI middleware serving and filling a ResponseCache for opted-in endpoints"""
+
+    def __init__(self, app, cache: ResponseCache):
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or \
+                any(name == b"authorization" for name, _ in scope["headers"]):
+            await self.app(scope, receive, send)
+            return
+
+        key = cache_key(scope["path"], scope["query_string"])
+        await self.cache.check_versions()
+        entry = self.cache.get(key)
+        if entry is not None:
+            if _not_modified(scope, entry):
+                headers = [(name, value) for name, value in entry.headers if name in NOT_MODIFIED_HEADERS]
+                await send({"type": "http.response.start", "status": 304,
+                            "headers": headers + [(b"x-cache", b"HIT")]})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            headers, body = await self._representation(scope, key, entry.status, entry.headers, entry.body)
+            await send({"type": "http.response.start", "status": entry.status,
+                        "headers": headers + [(b"x-cache", b"HIT")]})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        start_message = None
+        chunks: List[bytes] = []
+
+        async def capture(message):
+            nonlocal start_message
+            policy = getattr(scope.get("endpoint"), CACHE_POLICY_ATTRIBUTE, None)
+            if policy is None:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body"):
+                return
+            body = b"".join(chunks)
+            headers = list(start_message["headers"])
+            if start_message["status"] == 200:
+                self.cache.set(key, 200, headers, body, policy.tags, policy.ttl)
+            headers, body = await self._representation(scope, key, start_message["status"], headers, body)
+            await send({**start_message, "headers": headers + [(b"x-cache", b"MISS")]})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, capture)
+
+    async def _representation(self, scope, key: str, status: int, headers: List[Tuple[bytes, bytes]],
+                              body: bytes) -> Tuple[List[Tuple[bytes, bytes]], bytes]:
+        """Headers and body in the encoding the client accepts, reusing stored variants"""
+        if not is_compressible(status, headers, len(body)):
+            return headers, body
+        encoding = negotiate_encoding((header_value(scope["headers"], b"accept-encoding") or b"").decode("latin-1"))
+        if encoding is None:
+            return with_vary(headers), body
+        encoded = self.cache.variant(key, encoding)
+        if encoded is None:
+            encoded = await compress_off_loop(body, encoding, CACHED_LEVELS)
+            self.cache.add_variant(key, encoding, encoded)
+        return encoded_headers(headers, encoding, len(encoded)), encoded
+
+
+response_cache = ResponseCache()
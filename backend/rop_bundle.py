@@ -0,0 +1,179 @@
+"""Compact binary bundle of the Rules of Procedure.
+
+Layout (little endian)::
+
+    header   magic b"ROPB" | version u16 | flags u16 | count u32 | reserved u32
+    index    count x (key 12s | offset u32 | length u32), sorted by key
+    records  length-prefixed (u32) compact JSON, zstd-compressed when FLAG_ZSTD is set
+
+Keys are normalized rule numbers ("13", "5A", "PREAMBLE"). The loader
+memory-maps the file and binary-searches the index in place, so looking up one
+rule touches a few index pages and that rule's record only.
+"""
+
+import argparse
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+try:
+    import zstandard as zstd
+except ImportError:  # pragma: no cover
+    zstd = None
+
+from rop_importer import ROP_JSON_PATH, iter_rop_texts, load_rop
+
+ROP_BUNDLE_PATH = ROP_JSON_PATH.with_suffix(".bin")
+
+MAGIC = b"ROPB"
+VERSION = 1
+FLAG_ZSTD = 0x1
+
+KEY_SIZE = 12
+HEADER = struct.Struct("<4sHHII")
+INDEX_ENTRY = struct.Struct(f"<{KEY_SIZE}sII")
+LENGTH = struct.Struct("<I")
+
+RECORD_FIELDS = [
+    "article_number", "title", "content",
+    "part_number", "part_title", "chapter_number", "chapter_title",
+    "section_number", "section_title",
+]
+
+
+def normalize_key(rule_number: str) -> bytes:
+    """'Rule 5a' / '5A' / 'preamble' -> b'5A' / b'PREAMBLE'"""
+    key = rule_number.strip().upper()
+    if key.startswith("RULE"):
+        key = key[4:].strip()
+    encoded = key.encode("ascii")
+    if len(encoded) > KEY_SIZE:
+        raise ValueError(f"Rule key too long for bundle index: {rule_number!r}")
+    return encoded
+
+
+def write_bundle(texts: Iterable[Dict], path: Path = ROP_BUNDLE_PATH, compress: bool = False) -> int:
+    """Write flattened RoP texts (see rop_importer.iter_rop_texts) to a bundle"""
+    if compress and zstd is None:
+        raise RuntimeError("zstandard is required for compressed bundles. Install it with 'pip install zstandard'")
+    compressor = zstd.ZstdCompressor(level=19) if compress else None
+
+    records = {}
+    for text in texts:
+        key = normalize_key(text["article_number"])
+        payload = json.dumps({field: text.get(field) for field in RECORD_FIELDS},
+                             ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        records[key] = compressor.compress(payload) if compressor else payload
+
+    keys = sorted(records)
+    offset = HEADER.size + INDEX_ENTRY.size * len(keys)
+    index = bytearray()
+    body = bytearray()
+    for key in keys:
+        payload = records[key]
+        index += INDEX_ENTRY.pack(key, offset + len(body), len(payload))
+        body += LENGTH.pack(len(payload)) + payload
+
+    with open(path, "wb") as fp:
+        fp.write(HEADER.pack(MAGIC, VERSION, FLAG_ZSTD if compress else 0, len(keys), 0))
+        fp.write(index)
+        fp.write(body)
+    return len(keys)
+
+
+def build_bundle_from_json(json_path: Optional[Path] = None, path: Path = ROP_BUNDLE_PATH,
+                           compress: bool = False) -> int:
+    """Build the bundle straight from an existing rop.json export"""
+    return write_bundle(iter_rop_texts(load_rop(json_path)), path, compress=compress)
+
+
+class RoPBundle:
+    """Memory-mapped reader that decodes single rules on demand"""
+
+    def __init__(self, path: Path = ROP_BUNDLE_PATH):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, flags, self.count, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{self.path} is not a RoP bundle (version {VERSION})")
+        self.compressed = bool(flags & FLAG_ZSTD)
+        if self.compressed and zstd is None:
+            self.close()
+            raise RuntimeError("zstandard is required to read this compressed bundle")
+        self._decompressor = zstd.ZstdDecompressor() if self.compressed else None
+
+    def _key_at(self, position: int) -> bytes:
+        return INDEX_ENTRY.unpack_from(self._map, HEADER.size + position * INDEX_ENTRY.size)[0].rstrip(b"\0")
+
+    def _find(self, key: bytes) -> Optional[int]:
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self._key_at(low) == key:
+            return low
+        return None
+
+    def get_raw(self, rule_number: str) -> Optional[bytes]:
+        """Return the JSON-encoded record for a rule, without parsing it"""
+        try:
+            position = self._find(normalize_key(rule_number))
+        except (ValueError, UnicodeEncodeError):
+            return None
+        if position is None:
+            return None
+        _, offset, length = INDEX_ENTRY.unpack_from(self._map, HEADER.size + position * INDEX_ENTRY.size)
+        start = offset + LENGTH.size
+        payload = self._map[start:start + length]
+        return self._decompressor.decompress(payload) if self._decompressor else payload
+
+    def get(self, rule_number: str) -> Optional[Dict]:
+        raw = self.get_raw(rule_number)
+        return json.loads(raw) if raw is not None else None
+
+    def keys(self) -> Iterator[str]:
+        for position in range(self.count):
+            yield self._key_at(position).decode("ascii")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, rule_number: str) -> bool:
+        try:
+            return self._find(normalize_key(rule_number)) is not None
+        except (ValueError, UnicodeEncodeError):
+            return False
+
+    def close(self) -> None:
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main() -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(description="Build the binary RoP bundle from rop.json")
+    parser.add_argument("--input", default=str(ROP_JSON_PATH), help="Path to rop.json")
+    parser.add_argument("--output", default=str(ROP_BUNDLE_PATH), help="Destination path for the bundle")
+    parser.add_argument("--zstd", action="store_true", help="Compress each rule record with zstd")
+    args = parser.parse_args()
+
+    count = build_bundle_from_json(Path(args.input), Path(args.output), compress=args.zstd)
+    print(f"✔️  Bundle written → {args.output} ({count} rules)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+import json
+import re
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from pymongo import UpdateOne
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
+
+from legal_tagger import KEYWORD_TAGGER
+from content_hash import stamp_content_hash
+
+ROP_JSON_PATH = Path(__file__).resolve().parent / "Ressources" / "rop.json"
+DOCUMENT_TYPE = "rules_of_procedure"
+BULK_BATCH_SIZE = 500
+
+APPLICATION_TITLE = "Application and Interpretation of the Rules"
+
+# Table-of-contents entries end with dot leaders and a page number
+TOC_LEADER_RE = re.compile(r"\s*\.{4,}\s*\d*\s*$")
+PAGE_FOOTER_RE = re.compile(r"^-\s*\d+\s*-$")
+PARAGRAPH_START_RE = re.compile(r"^(?:\d+[A-Za-z]?\.|\([a-z]+\))\s")
+RULE_HEADING_RE = re.compile(r"^Rule\s+([0-9]+[A-Z]?)\s+[–-]\s+(.*)$")
+
+NODE_TYPES = ["preamble", "application_rule", "part", "chapter", "section", "rule"]
+# Top-level blocks of paragraph lines that precede the Parts
+BLOCKS = ("preamble", "application_and_interpretation")
+# Array holding each container node type, and the arrays below it
+CONTAINERS = {"part": "content", "chapter": "chapters", "section": "sections"}
+CHILD_CONTAINERS = {"part": ("chapter",), "chapter": ("section",), "section": ()}
+
+
+class RoPNode(NamedTuple):
+    """One node of the RoP tree, as walked or streamed from rop.json"""
+    node_type: str  # a key of BLOCKS, a key of CONTAINERS or "rule"
+    fields: Any  # lines of a block, scalar fields of a part/chapter/section, or the whole rule
+    parents: Tuple[Dict, ...]  # scalar fields of the enclosing part, chapter and section
+
+
+def load_rop(path: Optional[Path] = None) -> Dict:
+    """Load the exported Rules of Procedure JSON"""
+    with open(path or ROP_JSON_PATH, encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def _walk_container(node_type: str, node: Dict, parents: Tuple[Dict, ...]) -> Iterator[RoPNode]:
+    fields = {key: value for key, value in node.items() if not isinstance(value, list)}
+    inner = parents + (fields,)
+    for child_type in CHILD_CONTAINERS[node_type]:
+        for child in node.get(CONTAINERS[child_type], []):
+            yield from _walk_container(child_type, child, inner)
+    for rule in node.get("rules", []):
+        yield RoPNode("rule", rule, inner)
+    yield RoPNode(node_type, fields, parents)
+
+
+def walk_rop(data: Dict) -> Iterator[RoPNode]:
+    """Nodes of an already loaded RoP tree, in the order stream_rop yields them"""
+    for block in BLOCKS:
+        if block in data:
+            yield RoPNode(block, data[block], ())
+    for part in data.get("content", []):
+        yield from _walk_container("part", part, ())
+
+
+def _container_type(prefix: str, parent_prefix: str) -> Optional[str]:
+    for node_type, array in CONTAINERS.items():
+        if prefix == (f"{parent_prefix}.{array}.item" if parent_prefix else f"{array}.item"):
+            return node_type
+    return None
+
+
+def stream_rop(path: Optional[Path] = None) -> Iterator[RoPNode]:
+    """Nodes of rop.json parsed incrementally, so only one rule is held in memory at a time.
+
+    A part, chapter or section is yielded once it is closed, after its rules;
+    their titles are written before their children by rop_to_json.py, so they
+    are known by the time those rules are yielded. Without ijson the file is
+    loaded whole and walked.
+    """
+    if ijson is None:
+        yield from walk_rop(load_rop(path))
+        return
+    # Open parts/chapters/sections: (node type, prefix, scalar fields)
+    stack: List[Tuple[str, str, Dict]] = []
+    builder, built_prefix = None, None
+    with open(path or ROP_JSON_PATH, "rb") as fp:
+        for prefix, event, value in ijson.parse(fp):
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == built_prefix and event in ("end_map", "end_array"):
+                    parents = tuple(fields for _, _, fields in stack)
+                    yield RoPNode(built_prefix if built_prefix in BLOCKS else "rule", builder.value, parents)
+                    builder = None
+                continue
+            parent_prefix = stack[-1][1] if stack else ""
+            if (event == "start_array" and prefix in BLOCKS) or \
+                    (event == "start_map" and stack and prefix == f"{parent_prefix}.rules.item"):
+                builder, built_prefix = ijson.ObjectBuilder(), prefix
+                builder.event(event, value)
+            elif event == "start_map" and (node_type := _container_type(prefix, parent_prefix)):
+                stack.append((node_type, prefix, {}))
+            elif event == "end_map" and stack and prefix == parent_prefix:
+                node_type, _, fields = stack.pop()
+                yield RoPNode(node_type, fields, tuple(fields for _, _, fields in stack))
+            elif event in ("string", "number", "boolean", "null") and stack and \
+                    prefix.rpartition(".")[0] == parent_prefix:
+                stack[-1][2][prefix.rpartition(".")[2]] = value
+
+
+def _clean_title(title: Optional[str]) -> Optional[str]:
+    """Strip table-of-contents dot leaders and page numbers from a title"""
+    if title is None:
+        return None
+    return TOC_LEADER_RE.sub("", title).strip()
+
+
+def _is_toc_entry(title: Optional[str]) -> bool:
+    return bool(title and TOC_LEADER_RE.search(title))
+
+
+def _join_paragraphs(lines: List[str]) -> str:
+    """Re-join PDF lines into paragraphs, dropping page footers"""
+    paragraphs: List[str] = []
+    for line in lines:
+        if PAGE_FOOTER_RE.match(line):
+            continue
+        if not paragraphs or PARAGRAPH_START_RE.match(line):
+            paragraphs.append(line)
+        else:
+            paragraphs[-1] += " " + line
+    return "\n".join(paragraphs)
+
+
+def _split_application_rules(lines: List[str]) -> Iterator[Dict]:
+    """Split the flat 'Application and Interpretation' block into rules"""
+    current = None
+    for line in lines:
+        match = RULE_HEADING_RE.match(line)
+        if match:
+            if current:
+                yield current
+            current = {"rule_number": match.group(1), "rule_title": match.group(2), "paragraphs": []}
+        elif current is not None:
+            current["paragraphs"].append(line)
+    if current:
+        yield current
+
+
+def _text_document(article_number: str, title: str, content: str, **hierarchy) -> Dict:
+    return {
+        "document_type": DOCUMENT_TYPE,
+        "part_number": hierarchy.get("part_number"),
+        "part_title": hierarchy.get("part_title"),
+        "chapter_number": hierarchy.get("chapter_number"),
+        "chapter_title": hierarchy.get("chapter_title"),
+        "section_number": hierarchy.get("section_number"),
+        "section_title": hierarchy.get("section_title"),
+        "article_number": article_number,
+        "title": title,
+        "content": content,
+        "language": "EN",
+    }
+
+
+def _hierarchy(parents: Tuple[Dict, ...]) -> Dict:
+    hierarchy = {key: value for fields in parents for key, value in fields.items()}
+    for key in ("part_title", "chapter_title", "section_title"):
+        hierarchy[key] = _clean_title(hierarchy.get(key))
+    return hierarchy
+
+
+def iter_rop_texts(
+    data: Union[Dict, Iterable[RoPNode]],
+    import_preamble: bool = True,
+    import_application_rules: bool = True,
+    import_content: bool = True,
+    counts: Optional[Dict[str, int]] = None,
+) -> Iterator[Dict]:
+    """Flatten the RoP tree into upc_texts documents, one per rule.
+
+    ``data`` is a loaded rop.json or the nodes streamed from one (see stream_rop).
+    Parts, chapters and sections are not stored on their own; their numbers and
+    titles are copied onto every rule below them, whether the rule sits in a
+    section or directly in a chapter or part. Table-of-contents entries exported
+    by rop_to_json.py are skipped. ``counts`` is filled in per node type.
+    """
+    if counts is None:
+        counts = {}
+    for node_type in NODE_TYPES:
+        counts.setdefault(node_type, 0)
+
+    for node in walk_rop(data) if isinstance(data, dict) else data:
+        if node.node_type == "preamble":
+            if import_preamble and node.fields:
+                counts["preamble"] += 1
+                yield _text_document("Preamble", "Preamble", _join_paragraphs(node.fields))
+        elif node.node_type == "application_and_interpretation":
+            if not import_application_rules:
+                continue
+            for rule in _split_application_rules(node.fields):
+                counts["application_rule"] += 1
+                yield _text_document(
+                    f"Rule {rule['rule_number']}",
+                    rule["rule_title"],
+                    _join_paragraphs(rule["paragraphs"]),
+                    part_title=APPLICATION_TITLE,
+                )
+        elif import_content:
+            part = node.parents[0] if node.parents else node.fields
+            if _is_toc_entry(part.get("part_title")):
+                continue
+            if node.node_type != "rule":
+                counts[node.node_type] += 1
+                continue
+            rule = node.fields
+            counts["rule"] += 1
+            yield _text_document(
+                f"Rule {rule['rule_number']}",
+                _clean_title(rule["rule_title"]),
+                _join_paragraphs(rule.get("paragraphs", [])),
+                **_hierarchy(node.parents),
+            )
+
+
+def _upsert_operation(text: Dict, overwrite_existing: bool, today: str) -> UpdateOne:
+    key = {"document_type": text["document_type"], "article_number": text["article_number"]}
+    on_insert = {"_id": str(uuid.uuid4()), "created_date": today, "is_editable": True}
+    fields = stamp_content_hash({**text, "last_updated": today})
+    if overwrite_existing:
+        update = {"$set": fields, "$setOnInsert": on_insert}
+    else:
+        update = {"$setOnInsert": {**fields, **on_insert}}
+    return UpdateOne(key, update, upsert=True)
+
+
+def import_rop(
+    collection,
+    overwrite_existing: bool = False,
+    import_preamble: bool = True,
+    import_application_rules: bool = True,
+    import_content: bool = True,
+    path: Optional[Path] = None,
+    cross_reference_fn: Optional[Callable[[str], List[str]]] = None,
+    batch_size: int = BULK_BATCH_SIZE,
+) -> Dict:
+    """Import rop.json into the upc_texts collection with batched bulk upserts.
+
+    Rules are keyed on (document_type, article_number). Existing texts are only
+    replaced when ``overwrite_existing`` is set, otherwise they are counted as skipped.
+    """
+    started = time.perf_counter()
+    today = datetime.now().strftime("%Y-%m-%d")
+    counts: Dict[str, int] = {}
+    imported_count = skipped_count = total_processed = 0
+
+    def flush(operations: List[UpdateOne]) -> None:
+        nonlocal imported_count, skipped_count
+        if not operations:
+            return
+        result = collection.bulk_write(operations, ordered=False)
+        imported_count += result.upserted_count + (result.modified_count if overwrite_existing else 0)
+        if not overwrite_existing:
+            skipped_count += result.matched_count
+        else:
+            skipped_count += result.matched_count - result.modified_count
+
+    batch: List[UpdateOne] = []
+    texts = iter_rop_texts(
+        stream_rop(path),
+        import_preamble=import_preamble,
+        import_application_rules=import_application_rules,
+        import_content=import_content,
+        counts=counts,
+    )
+    for text in texts:
+        text["cross_references"] = cross_reference_fn(text["content"]) if cross_reference_fn else []
+        text["keywords"] = KEYWORD_TAGGER.rank(text["content"], limit=10)
+        batch.append(_upsert_operation(text, overwrite_existing, today))
+        total_processed += 1
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    flush(batch)
+
+    return {
+        "imported_count": imported_count,
+        "skipped_count": skipped_count,
+        "total_processed": total_processed,
+        "counts": counts,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
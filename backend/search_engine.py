@@ -0,0 +1,772 @@
+"""In-process BM25 search over cases and UPC legal texts.
+
+The index is an inverted index held in memory: one postings list per term,
+stored as compact ``array`` columns (document numbers, weighted term
+frequencies, positions) that NumPy loads through the buffer protocol at query
+time, so scoring a term is a handful of vectorized operations however long
+its postings are.
+
+Query syntax: bare words must all match (stemmed, so "patents" finds
+"patent"), ``"quoted phrases"`` must match as consecutive words and a
+trailing ``*`` makes a word a prefix. Tokens joined by punctuation, like
+``App_31860/2025``, are matched as a phrase.
+
+With ``fuzzy`` (or as a fallback when nothing matches exactly), query words
+are also expanded to nearby terms from parties, patent numbers and
+references through a trigram index (see fuzzy_index), scored lower the more
+edits they are away.
+
+The same documents feed the /api/suggest prefix index (see suggest_index).
+
+Hits carry a snippet instead of their full summary or content. The index keeps
+the character offset of every word of those fields, so the best window of
+matches is found from the postings' positions and the stored text is only
+sliced, never re-tokenized per query.
+
+Writers never touch the index directly. ``SearchEngine.refresh`` compares
+``content_hash`` values against the index, re-analyzes changed documents in a
+worker thread and applies them on the event loop, where all searches run.
+Writes pass the ids they touched (other processes log them with the cases
+version, see case_facets), so only those documents are re-read; the whole
+collections are diffed at startup and every ``RECONCILE_INTERVAL`` seconds. Replaced documents are tombstoned; once too many accumulate a
+fresh index is built in a background task, caught up with any writes made
+meanwhile and swapped in, while refreshes keep applying to the live one.
+"""
+
+import asyncio
+import math
+import re
+import time
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from async_db import run_blocking
+from citation_scanner import cross_reference_labels, scan as scan_citations
+from case_facets import VERSION_CHECK_INTERVAL, read_case_changes, read_cases_version
+from field_presets import CASE_FIELD_PRESETS, UPC_TEXT_FIELD_PRESETS
+from fuzzy_index import FuzzyIndex
+from suggest_index import CATEGORY_ARTICLE, CATEGORY_CITATION, CATEGORY_DIVISION, CATEGORY_PARTY, \
+    CATEGORY_PATENT, SuggestIndex, Suggestion
+from text_analysis import ALL_STOPWORDS, TOKEN_RE, fold, query_variants, tokens
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+MAX_PREFIX_EXPANSIONS = 64
+# Rebuild once this share of document slots holds replaced or deleted documents
+COMPACT_RATIO = 0.25
+# Positions skipped between field values so a phrase never spans two of them
+POSITION_GAP = 100
+REFRESH_BATCH_SIZE = 1000
+# Full diff against the collections, for deletes and writes that weren't logged
+RECONCILE_INTERVAL = 3600.0
+
+KIND_CASE = "case"
+KIND_UPC_TEXT = "upc_text"
+COLLECTIONS = {KIND_CASE: "cases", KIND_UPC_TEXT: "upc_texts"}
+
+# Indexed fields and their term-frequency weight
+INDEXED_FIELDS = {
+    KIND_CASE: [("registry_number", 3.0), ("order_reference", 3.0), ("reference", 3.0), ("patent", 3.0),
+                ("parties", 2.0), ("summary", 1.0), ("headnotes", 1.0)],
+    KIND_UPC_TEXT: [("article_number", 3.0), ("title", 2.0), ("content", 1.0)],
+}
+# Fields whose terms feed the typo-tolerant trigram index
+FUZZY_FIELDS = {
+    KIND_CASE: {"registry_number", "order_reference", "reference", "patent", "parties"},
+    KIND_UPC_TEXT: set(),
+}
+# Score multiplier for a term one edit away from the query word; squared for two edits
+FUZZY_DECAY = 0.5
+# Only public cases are searchable
+SOURCE_QUERIES = {KIND_CASE: {"excluded": {"$ne": True}}, KIND_UPC_TEXT: {}}
+# Case summaries and headnotes are English whatever the language of proceedings
+CASE_TEXT_LANGUAGE = "EN"
+FILTER_FIELDS = ("kind", "type", "division_code", "language", "document_type")
+# Long text fields returned as a snippet around the matches rather than whole
+SNIPPET_FIELDS = {KIND_CASE: ("summary", "headnotes"), KIND_UPC_TEXT: ("content",)}
+SNIPPET_WORDS = 30
+# Words kept before the first match in a snippet window
+SNIPPET_LEAD = 6
+SNIPPET_ELLIPSIS = "…"
+# Fields returned with each hit
+HIT_FIELDS = {
+    KIND_CASE: [field for field in CASE_FIELD_PRESETS["card"] if field not in SNIPPET_FIELDS[KIND_CASE]],
+    KIND_UPC_TEXT: UPC_TEXT_FIELD_PRESETS["list"],
+}
+
+
+class TextOffsets(NamedTuple):
+    """Character offsets of every word of one snippet field value"""
+    field: str
+    value: int  # index of the value when the field holds a list
+    base: int  # position of the first word
+    starts: array
+
+
+class AnalyzedDocument(NamedTuple):
+    kind: str
+    id: str
+    content_hash: Optional[str]
+    attributes: Dict[str, str]
+    date: int
+    length: float
+    terms: Dict[str, List]  # term -> [weighted tf, positions]
+    fuzzy_terms: Tuple[str, ...]
+    suggestions: Tuple[Tuple[str, str], ...]  # (category, value) entries for SuggestIndex
+    text_offsets: Tuple[TextOffsets, ...]
+
+
+class QueryWord(NamedTuple):
+    offset: int
+    text: str
+    variants: Tuple[str, ...]
+    prefix: bool
+    # Edit distance of each variant from the query word, for fuzzy expansions
+    distances: Tuple[int, ...] = ()
+
+
+class Snippet(NamedTuple):
+    """A window of one field value, as character offsets of words in it"""
+    field: str
+    value: int
+    start: int  # first word of the window
+    last: int  # last word of the window
+    highlights: Tuple[int, ...]  # matched words
+    clipped_start: bool
+    clipped_end: bool
+    content_hash: Optional[str]  # of the indexed version, so stale offsets are never applied
+
+
+class SearchHit(NamedTuple):
+    kind: str
+    id: str
+    score: float
+    snippet: Optional[Snippet] = None
+
+
+class SearchResult(NamedTuple):
+    total: int
+    hits: List[SearchHit]
+    fuzzy: bool
+
+
+def _field_values(value) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [str(item) for item in value if item]
+    return [str(value)]
+
+
+def _date_number(value) -> int:
+    """YYYY-MM-DD as an integer (20250108) for vectorized range filters; 0 when unknown"""
+    digits = re.sub(r"\D", "", str(value or ""))[:8]
+    return int(digits) if len(digits) == 8 else 0
+
+
+def source_projection(kind: str) -> Dict[str, int]:
+    fields = [field for field, _ in INDEXED_FIELDS[kind]]
+    fields += ["content_hash", "date", "type", "division_code", "language_of_proceedings", "language",
+               "document_type", "court_division", "legal_norms"]
+    return {field: 1 for field in fields}
+
+
+def suggestion_entries(kind: str, document: Dict) -> Tuple[Tuple[str, str], ...]:
+    """Autocomplete entries a document contributes to, each counted once"""
+    if kind == KIND_UPC_TEXT:
+        return tuple((CATEGORY_ARTICLE, value) for value in _field_values(document.get("article_number")))
+    entries = [(CATEGORY_PARTY, party.strip()) for party in _field_values(document.get("parties"))]
+    entries += [(CATEGORY_PATENT, patent) for patent in _field_values(document.get("patent"))]
+    entries += [(CATEGORY_DIVISION, division) for division in _field_values(document.get("court_division"))]
+    for norm in _field_values(document.get("legal_norms")):
+        entries += [(CATEGORY_CITATION, label) for label in cross_reference_labels(scan_citations(norm))]
+    return tuple(dict.fromkeys(entries))
+
+
+def analyze_document(kind: str, document: Dict) -> AnalyzedDocument:
+    """Tokenize a Mongo document into weighted term frequencies and positions"""
+    language = document.get("language_of_proceedings") or document.get("language") or ""
+    text_language = CASE_TEXT_LANGUAGE if kind == KIND_CASE else language
+    terms: Dict[str, List] = {}
+    fuzzy_terms = set()
+    text_offsets = []
+    position = 0
+    length = 0.0
+    for field, weight in INDEXED_FIELDS[kind]:
+        fuzzy = field in FUZZY_FIELDS[kind]
+        snippet = field in SNIPPET_FIELDS[kind]
+        for value, text in enumerate(_field_values(document.get(field))):
+            last = position
+            starts = None
+            if snippet:
+                starts = array("I")
+                text_offsets.append(TextOffsets(field, value, position, starts))
+            for token in tokens(text, text_language, position, starts):
+                if fuzzy:
+                    fuzzy_terms.add(token.term)
+                entry = terms.get(token.term)
+                if entry is None:
+                    entry = terms[token.term] = [0.0, []]
+                entry[0] += weight
+                entry[1].append(token.position)
+                length += weight
+                last = token.position
+            position = last + POSITION_GAP
+    attributes = {
+        "kind": kind,
+        "type": document.get("type") or "",
+        "division_code": document.get("division_code") or "",
+        "language": (language or "").upper(),
+        "document_type": document.get("document_type") or "",
+    }
+    return AnalyzedDocument(kind, str(document["_id"]), document.get("content_hash"), attributes,
+                            _date_number(document.get("date")), length, terms, tuple(fuzzy_terms),
+                            suggestion_entries(kind, document), tuple(text_offsets))
+
+
+def parse_query(query: str, language: str = "") -> List[List[QueryWord]]:
+    """Split a query into clauses; each clause is a word or a phrase of words"""
+    clauses = []
+    for match in re.finditer(r'"([^"]*)"|(\S+)', query):
+        phrase, chunk = match.group(1), match.group(2)
+        text = phrase if phrase is not None else chunk
+        prefix = chunk is not None and chunk.endswith("*")
+        words = list(TOKEN_RE.finditer(text))
+        clause = []
+        for offset, word in enumerate(words):
+            folded = fold(word.group())
+            is_prefix = prefix and offset == len(words) - 1
+            if folded in ALL_STOPWORDS and not is_prefix and len(words) > 1:
+                continue
+            variants = () if is_prefix else tuple(query_variants(folded, language))
+            clause.append(QueryWord(offset, folded, variants, is_prefix))
+        if clause:
+            clauses.append(clause)
+    return clauses
+
+
+class _Postings:
+    """Postings for one term; documents are appended in increasing number order.
+
+    Positions are stored as ``doc << 32 | position`` keys, so they stay sorted
+    and a phrase check is a vectorized intersection of key arrays.
+    """
+
+    __slots__ = ("docs", "tfs", "positions")
+
+    def __init__(self):
+        self.docs = array("I")
+        self.tfs = array("f")
+        self.positions = array("q")
+
+    def add(self, doc: int, tf: float, positions: List[int]) -> None:
+        self.docs.append(doc)
+        self.tfs.append(tf)
+        base = doc << 32
+        self.positions.extend(base | position for position in positions)
+
+    def position_keys(self, offset: int, candidates: np.ndarray) -> np.ndarray:
+        """Sorted (doc << 32 | position - offset) keys for candidate documents"""
+        keys = np.frombuffer(self.positions, dtype=np.int64) - offset
+        return keys[candidates[keys >> 32]]
+
+
+def _intersect_sorted(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    if not left.size or not right.size:
+        return left[:0]
+    index = np.minimum(np.searchsorted(right, left), right.size - 1)
+    return left[right[index] == left]
+
+
+class _DocTable(NamedTuple):
+    """NumPy copies of the per-document columns, rebuilt only after the index changes"""
+    alive: np.ndarray
+    norms: np.ndarray
+    dates: np.ndarray
+    codes: Dict[str, np.ndarray]
+
+
+class SearchIndex:
+    def __init__(self):
+        self.postings: Dict[str, _Postings] = {}
+        self.keys: List[Tuple[str, str]] = []
+        self.hashes: List[Optional[str]] = []
+        self.suggestion_entries: List[Tuple[Tuple[str, str], ...]] = []
+        # Per document (field, value, base position, index of its first offset, word count)
+        self.field_texts: List[Tuple[Tuple[str, int, int, int, int], ...]] = []
+        self.word_starts = array("I")
+        self.lookup: Dict[Tuple[str, str], int] = {}
+        self.alive = bytearray()
+        self.lengths = array("f")
+        self.dates = array("I")
+        self.attribute_codes: Dict[str, array] = {field: array("I") for field in FILTER_FIELDS}
+        # Code 0 is reserved for "no value"
+        self.attribute_values: Dict[str, Dict[str, int]] = {field: {"": 0} for field in FILTER_FIELDS}
+        self.live_count = 0
+        self.total_length = 0.0
+        self.fuzzy = FuzzyIndex()
+        self.suggestions = SuggestIndex()
+        self._vocabulary: Optional[List[str]] = None
+        self._table: Optional[_DocTable] = None
+
+    def __len__(self) -> int:
+        return self.live_count
+
+    @property
+    def dead_ratio(self) -> float:
+        return 1 - self.live_count / len(self.keys) if self.keys else 0.0
+
+    def indexed_hashes(self, kind: str) -> Dict[str, Optional[str]]:
+        return {key[1]: self.hashes[doc] for key, doc in self.lookup.items() if key[0] == kind}
+
+    def add(self, document: AnalyzedDocument) -> int:
+        self.remove(document.kind, document.id)
+        doc = len(self.keys)
+        self.keys.append((document.kind, document.id))
+        self.hashes.append(document.content_hash)
+        self.suggestion_entries.append(document.suggestions)
+        field_texts = []
+        for offsets in document.text_offsets:
+            field_texts.append((offsets.field, offsets.value, offsets.base, len(self.word_starts),
+                                len(offsets.starts)))
+            self.word_starts.extend(offsets.starts)
+        self.field_texts.append(tuple(field_texts))
+        self.lookup[(document.kind, document.id)] = doc
+        self.alive.append(1)
+        self.lengths.append(document.length)
+        self.dates.append(document.date)
+        for field in FILTER_FIELDS:
+            values = self.attribute_values[field]
+            value = document.attributes.get(field) or ""
+            if value not in values:
+                values[value] = len(values)
+            self.attribute_codes[field].append(values[value])
+        for term, (tf, positions) in document.terms.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = _Postings()
+                self._vocabulary = None
+            postings.add(doc, tf, positions)
+        for term in document.fuzzy_terms:
+            self.fuzzy.add(term)
+        self.suggestions.update(document.suggestions, 1)
+        self.live_count += 1
+        self.total_length += document.length
+        self._table = None
+        return doc
+
+    def remove(self, kind: str, document_id: str) -> bool:
+        """Tombstone a document; its postings are skipped until the next rebuild"""
+        doc = self.lookup.pop((kind, document_id), None)
+        if doc is None:
+            return False
+        self.alive[doc] = 0
+        self.suggestions.update(self.suggestion_entries[doc], -1)
+        self.live_count -= 1
+        self.total_length -= self.lengths[doc]
+        self._table = None
+        return True
+
+    def _doc_table(self) -> _DocTable:
+        if self._table is None:
+            average_length = self.total_length / self.live_count if self.live_count else 1.0
+            lengths = np.array(self.lengths, dtype=np.float32)
+            self._table = _DocTable(
+                alive=np.array(self.alive, dtype=np.bool_),
+                norms=BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(average_length, 1e-6)),
+                dates=np.array(self.dates, dtype=np.uint32),
+                codes={field: np.array(codes, dtype=np.uint32) for field, codes in self.attribute_codes.items()},
+            )
+        return self._table
+
+    def expand_prefix(self, prefix: str) -> List[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        start = bisect_left(self._vocabulary, prefix)
+        terms = []
+        for term in self._vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def _word_terms(self, word: QueryWord) -> List[str]:
+        terms = self.expand_prefix(word.text) if word.prefix else list(word.variants)
+        return [term for term in terms if term in self.postings]
+
+    def _word_scores(self, word: QueryWord, table: _DocTable) -> Tuple[np.ndarray, List[str]]:
+        """BM25 contribution of one query word per document: best score over its terms"""
+        terms = self._word_terms(word)
+        decay = {term: FUZZY_DECAY ** distance for term, distance in zip(word.variants, word.distances)}
+        scores = np.zeros(len(self.keys), dtype=np.float32)
+        for term in terms:
+            postings = self.postings[term]
+            docs = np.frombuffer(postings.docs, dtype=np.uint32)[:len(postings.docs)].astype(np.intp)
+            tfs = np.frombuffer(postings.tfs, dtype=np.float32).copy()
+            live = table.alive[docs]
+            df = int(live.sum())
+            if df == 0:
+                continue
+            idf = math.log(1 + (self.live_count - df + 0.5) / (df + 0.5))
+            term_scores = decay.get(term, 1.0) * idf * tfs * (BM25_K1 + 1) / (tfs + table.norms[docs])
+            scores[docs] = np.maximum(scores[docs], term_scores)
+        return scores, terms
+
+    def _phrase_mask(self, clause: List[QueryWord], clause_terms: List[List[str]],
+                     candidates: np.ndarray) -> np.ndarray:
+        """Candidates where the clause's words occur at consecutive positions.
+
+        Each word's occurrences become sorted (document, start position) keys;
+        intersecting them leaves the places where the whole phrase starts.
+        """
+        keys = None
+        for word, terms in zip(clause, clause_terms):
+            word_keys = [self.postings[term].position_keys(word.offset, candidates) for term in terms]
+            word_keys = word_keys[0] if len(word_keys) == 1 else np.unique(np.concatenate(word_keys))
+            keys = word_keys if keys is None else _intersect_sorted(keys, word_keys)
+            if not keys.size:
+                break
+        mask = np.zeros_like(candidates)
+        mask[keys >> 32] = True
+        return mask
+
+    def _filter_mask(self, table: _DocTable, filters: Dict[str, str],
+                     date_from: int, date_to: int) -> Optional[np.ndarray]:
+        mask = table.alive.copy()
+        for field, value in filters.items():
+            if not value:
+                continue
+            code = self.attribute_values[field].get(value)
+            if code is None:
+                return None
+            mask &= table.codes[field] == code
+        if date_from:
+            mask &= table.dates >= date_from
+        if date_to:
+            mask &= table.dates <= date_to
+        return mask
+
+    def fuzzy_clauses(self, clauses: List[List[QueryWord]]) -> Optional[List[List[QueryWord]]]:
+        """Clauses with words widened to nearby vocabulary terms; None when nothing was widened"""
+        widened = False
+        result = []
+        for clause in clauses:
+            words = []
+            for word in clause:
+                expansions = [] if word.prefix else self.fuzzy.expand(word.text)
+                extra = [(term, distance) for term, distance in expansions if term not in word.variants]
+                if extra:
+                    widened = True
+                    word = word._replace(
+                        variants=word.variants + tuple(term for term, _ in extra),
+                        distances=(0,) * len(word.variants) + tuple(distance for _, distance in extra))
+                words.append(word)
+            result.append(words)
+        return result if widened else None
+
+    def search(self, clauses: List[List[QueryWord]], filters: Optional[Dict[str, str]] = None,
+               date_from: int = 0, date_to: int = 0, skip: int = 0,
+               limit: int = 20) -> Tuple[int, List[SearchHit]]:
+        """Documents matching every clause, ranked by BM25; returns (total, page)"""
+        if not clauses or not self.live_count:
+            return 0, []
+        table = self._doc_table()
+        mask = self._filter_mask(table, filters or {}, date_from, date_to)
+        if mask is None:
+            return 0, []
+        total_scores = np.zeros(len(self.keys), dtype=np.float32)
+        phrases = []
+        for clause in clauses:
+            clause_terms = []
+            for word in clause:
+                scores, terms = self._word_scores(word, table)
+                if not terms:
+                    return 0, []
+                mask &= scores > 0
+                total_scores += scores
+                clause_terms.append(terms)
+            if len(clause) > 1:
+                phrases.append((clause, clause_terms))
+        # Positions are only checked for documents that already contain every word
+        for clause, clause_terms in phrases:
+            mask &= self._phrase_mask(clause, clause_terms, mask)
+
+        hits = np.flatnonzero(mask)
+        total = int(hits.size)
+        wanted = min(skip + limit, total)
+        if wanted <= skip:
+            return total, []
+        scores = total_scores[hits]
+        if wanted < total:
+            top = np.argpartition(-scores, wanted - 1)[:wanted]
+            hits, scores = hits[top], scores[top]
+        # Highest score first, newer documents first on ties
+        order = np.lexsort((-table.dates[hits].astype(np.int64), -scores))[skip:wanted]
+        page = [SearchHit(*self.keys[doc], round(float(scores[position]), 4))
+                for position, doc in zip(order.tolist(), hits[order].tolist())]
+        return total, page
+
+    def matched_terms(self, clauses: List[List[QueryWord]]) -> List[str]:
+        """Index terms the clauses' words match, for highlighting"""
+        terms = [term for clause in clauses for word in clause for term in self._word_terms(word)]
+        return list(dict.fromkeys(terms))
+
+    def snippet(self, kind: str, document_id: str, terms: List[str]) -> Optional[Snippet]:
+        """Best window of a document's snippet fields: most distinct terms, then most matches"""
+        doc = self.lookup.get((kind, document_id))
+        if doc is None or not self.field_texts[doc]:
+            return None
+        low, high = doc << 32, (doc + 1) << 32
+        matches = []
+        for term in terms:
+            keys = np.frombuffer(self.postings[term].positions, dtype=np.int64)
+            start, end = np.searchsorted(keys, (low, high))
+            matches += [(key - low, term) for key in keys[start:end].tolist()]
+        matches.sort()
+
+        best = None
+        for field_text in self.field_texts[doc]:
+            base, count = field_text[2], field_text[4]
+            inside = [match for match in matches if base <= match[0] < base + count]
+            window: Dict[str, int] = {}
+            right = 0
+            for left, (position, _) in enumerate(inside):
+                while right < len(inside) and inside[right][0] < position + SNIPPET_WORDS:
+                    window[inside[right][1]] = window.get(inside[right][1], 0) + 1
+                    right += 1
+                rank = (len(window), right - left)
+                if best is None or rank > best[0]:
+                    best = (rank, field_text, position, [match[0] for match in inside[left:right]])
+                term = inside[left][1]
+                window[term] -= 1
+                if not window[term]:
+                    del window[term]
+        if best is None:
+            # Nothing matched in the text itself (a party or reference did): show its opening words
+            field_texts = [field_text for field_text in self.field_texts[doc] if field_text[4]]
+            if not field_texts:
+                return None
+            best = (None, field_texts[0], field_texts[0][2], [])
+
+        _, (field, value, base, first, count), position, positions = best
+        window_start = max(base, position - SNIPPET_LEAD)
+        window_end = min(window_start + SNIPPET_WORDS, base + count)
+        window_start = max(base, window_end - SNIPPET_WORDS)
+        positions = [p for p in positions if p < window_end]
+        return Snippet(field, value, self.word_starts[first + window_start - base],
+                       self.word_starts[first + window_end - 1 - base],
+                       tuple(self.word_starts[first + p - base] for p in positions),
+                       window_start > base, window_end < base + count, self.hashes[doc])
+
+
+def _read_documents(collection, kind: str, query: Dict) -> Iterable[AnalyzedDocument]:
+    for document in collection.find(query, source_projection(kind)):
+        yield analyze_document(kind, document)
+
+
+def build_index(db) -> SearchIndex:
+    """Full index over every searchable document; runs in a worker thread"""
+    index = SearchIndex()
+    for kind, name in COLLECTIONS.items():
+        for document in _read_documents(db[name], kind, SOURCE_QUERIES[kind]):
+            index.add(document)
+    return index
+
+
+def _current_hashes(collection, kind: str, ids: Optional[List[str]]) -> Dict[str, Optional[str]]:
+    if ids is None:
+        documents = collection.find(SOURCE_QUERIES[kind], {"content_hash": 1})
+        return {str(document["_id"]): document.get("content_hash") for document in documents}
+    current = {}
+    for start in range(0, len(ids), REFRESH_BATCH_SIZE):
+        query = {**SOURCE_QUERIES[kind], "_id": {"$in": ids[start:start + REFRESH_BATCH_SIZE]}}
+        current.update((str(document["_id"]), document.get("content_hash"))
+                       for document in collection.find(query, {"content_hash": 1}))
+    return current
+
+
+def collect_changes(db, index: SearchIndex, kinds: Iterable[str],
+                    ids: Optional[Iterable[str]] = None) -> Tuple[List[AnalyzedDocument], List[Tuple[str, str]]]:
+    """Documents to (re)index and keys to drop, by comparing content hashes; runs in a worker thread
+
+    With ids only those documents are compared, otherwise the whole collections.
+    """
+    ids = sorted({str(document_id) for document_id in ids}) if ids is not None else None
+    added: List[AnalyzedDocument] = []
+    removed: List[Tuple[str, str]] = []
+    for kind in kinds:
+        collection = db[COLLECTIONS[kind]]
+        current = _current_hashes(collection, kind, ids)
+        indexed = index.indexed_hashes(kind)
+        changed = [document_id for document_id, content_hash in current.items()
+                   if document_id not in indexed or indexed[document_id] != content_hash]
+        candidates = indexed if ids is None else (document_id for document_id in ids if document_id in indexed)
+        removed += [(kind, document_id) for document_id in candidates if document_id not in current]
+        for start in range(0, len(changed), REFRESH_BATCH_SIZE):
+            batch = changed[start:start + REFRESH_BATCH_SIZE]
+            added += _read_documents(collection, kind, {"_id": {"$in": batch}})
+    return added, removed
+
+
+def _word_end(text: str, start: int) -> int:
+    match = TOKEN_RE.match(text, start)
+    return match.end() if match else start
+
+
+def cut_snippet(document: Dict, snippet: Snippet) -> Optional[Dict]:
+    """Snippet text with highlight ranges relative to it; None if the document changed since indexing"""
+    values = _field_values(document.get(snippet.field))
+    if snippet.content_hash != document.get("content_hash") or snippet.value >= len(values):
+        return None
+    text = values[snippet.value]
+    end = _word_end(text, snippet.last)
+    prefix = SNIPPET_ELLIPSIS if snippet.clipped_start else ""
+    suffix = SNIPPET_ELLIPSIS if snippet.clipped_end else ""
+    offset = len(prefix) - snippet.start
+    highlights = [[start + offset, _word_end(text, start) + offset] for start in snippet.highlights]
+    return {"field": snippet.field, "text": prefix + text[snippet.start:end] + suffix, "highlights": highlights}
+
+
+def fetch_hits(db, hits: List[SearchHit]) -> List[Dict]:
+    """Hit documents in ranking order, one $in query per kind, with snippets in place of long text;
+    runs in a worker thread"""
+    documents: Dict[Tuple[str, str], Dict] = {}
+    for kind, name in COLLECTIONS.items():
+        ids = [hit.id for hit in hits if hit.kind == kind]
+        if ids:
+            # Snippet fields are read to be sliced here, never returned whole
+            projection = {field: 1 for field in list(HIT_FIELDS[kind]) + list(SNIPPET_FIELDS[kind])}
+            for document in db[name].find({"_id": {"$in": ids}}, projection):
+                documents[(kind, str(document["_id"]))] = document
+    items = []
+    for hit in hits:
+        document = documents.get((hit.kind, hit.id))
+        if document is None:
+            continue
+        document.pop("_id", None)
+        snippet = cut_snippet(document, hit.snippet) if hit.snippet else None
+        for field in SNIPPET_FIELDS[hit.kind]:
+            document.pop(field, None)
+        items.append({"kind": hit.kind, "id": hit.id, "score": hit.score, **document, "snippet": snippet})
+    return items
+
+
+class SearchEngine:
+    """Holds the live SearchIndex and keeps it in step with the database"""
+
+    def __init__(self, check_interval: float = VERSION_CHECK_INTERVAL):
+        self.index: Optional[SearchIndex] = None
+        self.check_interval = check_interval
+        self._cases_version: Optional[int] = None
+        self._checked_at = 0.0
+        self._reconciled_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._compact_task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.index is not None
+
+    async def load(self, db) -> None:
+        started = time.perf_counter()
+        try:
+            version = await run_blocking(read_cases_version, db)
+            index = await run_blocking(build_index, db)
+        except Exception as e:
+            print(f"Search index warning: {e}")
+            return
+        async with self._lock:
+            self.index = index
+            self._cases_version = version
+            self._checked_at = self._reconciled_at = time.monotonic()
+        print(f"Search index loaded with {len(index)} documents in {time.perf_counter() - started:.1f}s")
+
+    async def refresh(self, db, kinds: Iterable[str] = tuple(COLLECTIONS), ids: Optional[Iterable[str]] = None,
+                      version: Optional[int] = None) -> None:
+        """Bring the index in line with the given collections, or only with the given document ids
+
+        version is the cases version the ids bring the index up to, when they come from the change log.
+        """
+        if self.index is None:
+            return
+        async with self._lock:
+            if ids is None:
+                version = await run_blocking(read_cases_version, db)
+            added, removed = await run_blocking(collect_changes, db, self.index, list(kinds), ids)
+            for kind, document_id in removed:
+                self.index.remove(kind, document_id)
+            for document in added:
+                self.index.add(document)
+            now = time.monotonic()
+            if version is not None:
+                self._cases_version = version
+                self._checked_at = now
+            if ids is None:
+                self._reconciled_at = now
+            if self.index.dead_ratio > COMPACT_RATIO and (self._compact_task is None or self._compact_task.done()):
+                self._compact_task = asyncio.create_task(self.compact(db))
+        if added or removed:
+            print(f"Search index refreshed: {len(added)} indexed, {len(removed)} removed")
+
+    async def compact(self, db) -> None:
+        """Rebuild without tombstones off the write path, then swap the new index in"""
+        started = time.perf_counter()
+        try:
+            index = await run_blocking(build_index, db)
+        except Exception as e:
+            print(f"Search index compaction warning: {e}")
+            return
+        async with self._lock:
+            # Writes that landed while building are diffed in by content hash, as in refresh
+            added, removed = await run_blocking(collect_changes, db, index, list(COLLECTIONS))
+            for kind, document_id in removed:
+                index.remove(kind, document_id)
+            for document in added:
+                index.add(document)
+            self.index = index
+        print(f"Search index compacted to {len(index)} documents in {time.perf_counter() - started:.1f}s")
+
+    async def check_version(self, db) -> None:
+        """Pick up case writes made by other processes (the scraper) in the background, and reconcile now and then"""
+        now = time.monotonic()
+        if self.index is None or now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        if now - self._reconciled_at >= RECONCILE_INTERVAL:
+            self._refresh_task = asyncio.create_task(self.refresh(db))
+            return
+        version, case_ids = await run_blocking(read_case_changes, db, self._cases_version)
+        if version != self._cases_version:
+            self._refresh_task = asyncio.create_task(self.refresh(db, [KIND_CASE], case_ids, version))
+
+    def search(self, query: str, filters: Optional[Dict[str, str]] = None, date_from: Optional[str] = None,
+               date_to: Optional[str] = None, skip: int = 0, limit: int = 20, language: str = "",
+               fuzzy: bool = False) -> SearchResult:
+        """Exact search, or fuzzy when asked for or when the exact search finds nothing"""
+        clauses = parse_query(query, language)
+        bounds = (_date_number(date_from), _date_number(date_to), skip, limit)
+        total, hits, widened = 0, [], None
+        if not fuzzy:
+            total, hits = self.index.search(clauses, filters, *bounds)
+        if fuzzy or not total:
+            widened = self.index.fuzzy_clauses(clauses)
+            if widened is not None:
+                clauses = widened
+            if widened is not None or fuzzy:
+                total, hits = self.index.search(clauses, filters, *bounds)
+        terms = self.index.matched_terms(clauses)
+        hits = [hit._replace(snippet=self.index.snippet(hit.kind, hit.id, terms)) for hit in hits]
+        return SearchResult(total, hits, widened is not None)
+
+    def suggest(self, prefix: str, limit: int = 10, category: Optional[str] = None) -> List[Suggestion]:
+        """Autocomplete entries starting with prefix, most frequent first"""
+        return self.index.suggestions.suggest(prefix, limit, category)
+
+
+search_engine = SearchEngine()
@@ -1,6 +1,7 @@
-from fastapi import FastAPI, HTTPException, Query, Depends, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Query, Depends, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, Response
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel, EmailStr
 from typing import List, Optional, Dict, Any
 from datetime import datetime, date, timedelta
@@ -13,6 +14,7 @@ import asyncio
 import threading
 import json
 import re
+import time
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -30,8 +32,29 @@ from auth import (
     UserCreate, UserLogin, UserResponse, Token, UserInDB,
     authenticate_user, create_access_token, create_user,
     get_current_user, get_current_active_user, get_admin_user, get_editor_or_admin_user,
-    create_initial_admin, ACCESS_TOKEN_EXPIRE_MINUTES
+    get_optional_user, create_initial_admin, ACCESS_TOKEN_EXPIRE_MINUTES, UserRole
 )
+from rop_importer import ROP_JSON_PATH, import_rop
+from async_db import AsyncCollection, run_blocking
+from citation_scanner import scan as scan_citations, cross_reference_labels
+from rop_bundle import ROP_BUNDLE_PATH, RoPBundle, build_bundle_from_json
+from pagination import CASES_SORT, UPC_TEXTS_SORT, InvalidCursor, apply_cursor, encode_cursor
+from db_indexes import ensure_indexes_and_audit
+from court_divisions import backfill_divisions, division_filter, enrich_case
+from party_names import backfill_party_ids, enrich_parties, party_id as normalize_party_id
+from case_facets import FiltersCache, bump_cases_version, read_cases_version
+from case_stats import load_stats, refresh_stats
+from field_presets import CASE_FIELD_PRESETS, UPC_TEXT_FIELD_PRESETS, list_pipeline, projection_for
+from fast_json import NDJSON_MEDIA_TYPE, FastJSONResponse, json_response, ndjson_lines
+from response_cache import ResponseCacheMiddleware, cache_key, cache_response, response_cache
+from compression import CompressionMiddleware
+from content_hash import backfill_content_hashes, stamp_content_hash
+from search_engine import KIND_CASE, KIND_UPC_TEXT, fetch_hits, search_engine
+from suggest_index import CATEGORIES as SUGGEST_CATEGORIES
+from case_similarity import fetch_similar, similar_cases
+from http_caching import CASES_CACHE_CONTROL, UPC_TEXTS_CACHE_CONTROL, conditional_response, document_etag, list_etag
+from case_export import EXPORT_BATCH_SIZE, EXPORT_FORMATS, csv_chunks, export_filename, json_chunks, row_pipeline, \
+    write_xlsx
 
 # Import the scraper at module level
 try:
@@ -56,20 +79,19 @@ except ImportError as e:
 MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017/')
 client = MongoClient(MONGO_URL)
 db = client['upc_legal']
-cases_collection = db['cases']
-documents_collection = db['documents']
-upc_texts_collection = db['upc_texts']
-users_collection = db['users']
-pending_changes_collection = db['pending_changes']
-newsletter_collection = db['newsletter']
-newsletter_campaigns_collection = db['newsletter_campaigns']
-newsletter_subscribers_collection = db['newsletter_subscribers']
-settings_collection = db['settings']
-permissions_collection = db['permissions']
-gdpr_consents_collection = db['gdpr_consents']
-gdpr_requests_collection = db['gdpr_requests']
-seo_metadata_collection = db['seo_metadata']
-
+cases_collection = AsyncCollection(db['cases'])
+documents_collection = AsyncCollection(db['documents'])
+upc_texts_collection = AsyncCollection(db['upc_texts'])
+users_collection = AsyncCollection(db['users'])
+pending_changes_collection = AsyncCollection(db['pending_changes'])
+newsletter_collection = AsyncCollection(db['newsletter'])
+newsletter_campaigns_collection = AsyncCollection(db['newsletter_campaigns'])
+newsletter_subscribers_collection = AsyncCollection(db['newsletter_subscribers'])
+settings_collection = AsyncCollection(db['settings'])
+permissions_collection = AsyncCollection(db['permissions'])
+gdpr_consents_collection = AsyncCollection(db['gdpr_consents'])
+gdpr_requests_collection = AsyncCollection(db['gdpr_requests'])
+seo_metadata_collection = AsyncCollection(db['seo_metadata'])
 # Email service helper
 class EmailService:
     def __init__(self):
@@ -80,7 +102,7 @@ class EmailService:
     def load_config(self):
         """Load email configuration from settings"""
         try:
-            email_settings = settings_collection.find_one({"key": "email_service"})
+            email_settings = settings_collection.delegate.find_one({"key": "email_service"})
             if email_settings:
                 self.config = email_settings["value"]
                 self.enabled = self.config.get("enabled", False)  # Vérifier si activé
@@ -202,39 +224,33 @@ class EmailService:
 # Initialize email service
 email_service = EmailService()
 
+# Memory-mapped Rules of Procedure bundle, opened at startup
+rop_bundle: Optional[RoPBundle] = None
+
+# Cached /api/filters facets
+filters_cache = FiltersCache(db)
+# Cached case responses also follow case writes made by other processes (the scraper)
+response_cache.track_version("cases", lambda: read_cases_version(db))
+
+async def notify_cases_changed(case_ids: Optional[List[str]] = None):
+    """Invalidate cached views of the cases collection after a write to case_ids (None: a bulk write)"""
+    await run_blocking(bump_cases_version, db, case_ids)
+    await search_engine.refresh(db, [KIND_CASE], case_ids)
+    await similar_cases.refresh(db)
+    filters_cache.invalidate()
+    response_cache.invalidate("cases")
+    await run_blocking(refresh_stats, db)
+
+async def list_etag_version(projection: Optional[Dict[str, int]]) -> Optional[int]:
+    """Cases version to tag a list page with when its preset projects no content_hash"""
+    if projection is None or "content_hash" in projection:
+        return None
+    return await run_blocking(read_cases_version, db)
+
 # Helper function to detect cross-references in text
 def detect_cross_references(text: str) -> List[str]:
     """Detect cross-references in text content"""
-    references = []
-    
-    # Pattern for Rule references (e.g., "Rule 13", "Rule 206.1")
-    rule_pattern = r'Rule\s+(\d+(?:\.\d+)?(?:[a-z])?)'
-    rule_matches = re.findall(rule_pattern, text, re.IGNORECASE)
-    for match in rule_matches:
-        references.append(f"Rule {match}")
-    
-    # Pattern for Article references (e.g., "Article 32", "Article 60 UPCA")
-    article_pattern = r'Article\s+(\d+(?:\.\d+)?(?:[a-z])?)'
-    article_matches = re.findall(article_pattern, text, re.IGNORECASE)
-    for match in article_matches:
-        references.append(f"Article {match}")
-    
-    # Pattern for specific Agreement references
-    agreement_pattern = r'Article\s+(\d+(?:\.\d+)?(?:[a-z])?)\s+(?:of\s+the\s+)?(?:Agreement|UPCA)'
-    agreement_matches = re.findall(agreement_pattern, text, re.IGNORECASE)
-    for match in agreement_matches:
-        references.append(f"Article {match} UPCA")
-    
-    # Pattern for paragraph references within same rule
-    paragraph_pattern = r'paragraph\s+(\d+(?:\.\d+)?(?:[a-z])?)'
-    paragraph_matches = re.findall(paragraph_pattern, text, re.IGNORECASE)
-    for match in paragraph_matches:
-        references.append(f"paragraph {match}")
-    
-    # Remove duplicates and sort
-    references = sorted(list(set(references)))
-    
-    return references
+    return cross_reference_labels(scan_citations(text))
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -242,7 +258,7 @@ async def lifespan(app: FastAPI):
     print("Starting up...")
     
     # Create initial admin user
-    create_initial_admin()
+    await run_blocking(create_initial_admin)
     
     # Initialize default settings
     default_settings = [
@@ -300,28 +316,32 @@ async def lifespan(app: FastAPI):
     
     # Insert default settings if they don't exist
     for setting in default_settings:
-        existing = settings_collection.find_one({"key": setting["key"]})
+        existing = await settings_collection.find_one({"key": setting["key"]})
         if not existing:
-            settings_collection.insert_one({
+            await settings_collection.insert_one({
                 **setting,
                 "updated_at": datetime.utcnow(),
                 "updated_by": "system"
             })
     
-    # Create text index for search
+    # Create the declared indexes and audit query plans without delaying startup
+    index_task = asyncio.create_task(run_blocking(ensure_indexes_and_audit, db))
+    
+    # Open the binary RoP bundle, building it from rop.json on first start or after a new export
+    global rop_bundle
     try:
-        cases_collection.create_index([("summary", "text"), ("parties", "text"), ("reference", "text")])
-        upc_texts_collection.create_index([("title", "text"), ("content", "text"), ("article_number", "text")])
-        newsletter_collection.create_index([("subject", "text"), ("content", "text")])
-        users_collection.create_index([("email", 1)], unique=True)
+        if not ROP_BUNDLE_PATH.exists() or ROP_BUNDLE_PATH.stat().st_mtime < ROP_JSON_PATH.stat().st_mtime:
+            build_bundle_from_json()
+        rop_bundle = RoPBundle(ROP_BUNDLE_PATH)
+        print(f"RoP bundle loaded with {len(rop_bundle)} rules")
     except Exception as e:
-        print(f"Index creation warning: {e}")
+        print(f"RoP bundle warning: {e}")
     
     # Check if we have any cases in the database
-    case_count = cases_collection.count_documents({})
+    case_count = await cases_collection.count_documents({})
     
     # Initialize UPC texts if they don't exist
-    upc_text_count = upc_texts_collection.count_documents({})
+    upc_text_count = await upc_texts_collection.count_documents({})
     if upc_text_count == 0:
         print("No UPC texts found. Loading sample UPC legal texts...")
         sample_upc_texts = [
@@ -347,7 +367,7 @@ async def lifespan(app: FastAPI):
         ]
         
         try:
-            upc_texts_collection.insert_many(sample_upc_texts)
+            await upc_texts_collection.insert_many([stamp_content_hash(text) for text in sample_upc_texts])
             print("Sample UPC legal texts loaded")
         except Exception as e:
             print(f"UPC texts loading warning: {e}")
@@ -410,18 +430,61 @@ async def lifespan(app: FastAPI):
             }
         ]
         try:
-            cases_collection.insert_many(sample_cases)
+            await cases_collection.insert_many([stamp_content_hash(enrich_parties(enrich_case(case))) for case in sample_cases])
+            await notify_cases_changed([case["_id"] for case in sample_cases])
             print("Sample data loaded as fallback")
         except Exception as e:
             print(f"Sample data loading warning: {e}")
     else:
         print(f"Database already contains {case_count} cases")
+        # Migrate cases stored before division codes existed
+        try:
+            backfilled = await run_blocking(backfill_divisions, cases_collection.delegate)
+            if backfilled:
+                print(f"Backfilled division codes for {backfilled} cases")
+                await notify_cases_changed()
+        except Exception as e:
+            print(f"Division backfill warning: {e}")
+        # Migrate cases stored before party ids existed
+        try:
+            backfilled = await run_blocking(backfill_party_ids, cases_collection.delegate)
+            if backfilled:
+                print(f"Backfilled party ids for {backfilled} cases")
+                await notify_cases_changed()
+        except Exception as e:
+            print(f"Party ids backfill warning: {e}")
+    
+    # Stamp content hashes (used for ETags) on documents written before they existed
+    try:
+        for collection in (cases_collection, upc_texts_collection):
+            stamped = await run_blocking(backfill_content_hashes, collection.delegate)
+            if stamped:
+                print(f"Stamped content hashes on {stamped} {collection.name} documents")
+    except Exception as e:
+        print(f"Content hash backfill warning: {e}")
+    
+    # Build the in-memory search index in the background; /api/search answers 503 until it is ready
+    search_task = asyncio.create_task(search_engine.load(db))
+    # Open the saved TF-IDF matrix (or build it) for /api/cases/{id}/similar
+    similar_task = asyncio.create_task(similar_cases.load(db))
     
     yield
     # Shutdown
     print("Shutting down...")
+    search_task.cancel()
+    similar_task.cancel()
+    if not index_task.done():
+        await index_task
+    if rop_bundle is not None:
+        rop_bundle.close()
+
+app = FastAPI(title="UPC Legal API", version="1.0.0", lifespan=lifespan, default_response_class=FastJSONResponse)
 
-app = FastAPI(title="UPC Legal API", version="1.0.0", lifespan=lifespan)
+# Server-side cache for public GET endpoints, inside CORS so hits get CORS headers too.
+# Cached entries carry their own precompressed variants; everything else is
+# compressed by the outer CompressionMiddleware.
+app.add_middleware(ResponseCacheMiddleware, cache=response_cache)
+app.add_middleware(CompressionMiddleware)
 
 # CORS middleware
 app.add_middleware(
@@ -499,6 +562,12 @@ class ApportModel(BaseModel):
     regulation: str
     citation: str
 
+class CaseBatchRequestModel(BaseModel):
+    ids: List[str] = []
+    registry_numbers: List[str] = []
+    order_references: List[str] = []
+    fields: str = "full"
+
 # Enhanced Newsletter Models
 class NewsletterCampaignModel(BaseModel):
     id: str
@@ -802,7 +871,7 @@ class SEOMetadataUpdateModel(BaseModel):
 async def register(user: UserCreate):
     """Register a new user"""
     try:
-        new_user = create_user(user)
+        new_user = await run_blocking(create_user, user)
         
         # If user opted in for newsletter, add them to subscribers
         if user.newsletter_opt_in:
@@ -817,7 +886,7 @@ async def register(user: UserCreate):
                     "username": user.username
                 }
             }
-            newsletter_subscribers_collection.insert_one(newsletter_subscriber)
+            await newsletter_subscribers_collection.insert_one(newsletter_subscriber)
         
         return UserResponse(
             id=new_user.id,
@@ -834,7 +903,7 @@ async def register(user: UserCreate):
 @app.post("/api/auth/login", response_model=Token)
 async def login(user: UserLogin):
     """Login user and return access token"""
-    authenticated_user = authenticate_user(user.email, user.password)
+    authenticated_user = await run_blocking(authenticate_user, user.email, user.password)
     if not authenticated_user:
         raise HTTPException(
             status_code=401,
@@ -866,13 +935,13 @@ async def subscribe_to_newsletter(subscription: NewsletterSubscriptionModel):
     """Subscribe to newsletter"""
     try:
         # Check if already subscribed
-        existing = newsletter_subscribers_collection.find_one({"email": subscription.email})
+        existing = await newsletter_subscribers_collection.find_one({"email": subscription.email})
         if existing:
             if existing["status"] == "active":
                 return {"message": "Already subscribed", "status": "success"}
             else:
                 # Reactivate subscription
-                newsletter_subscribers_collection.update_one(
+                await newsletter_subscribers_collection.update_one(
                     {"email": subscription.email},
                     {"$set": {
                         "status": "active",
@@ -894,7 +963,7 @@ async def subscribe_to_newsletter(subscription: NewsletterSubscriptionModel):
             "metadata": subscription.metadata
         }
         
-        newsletter_subscribers_collection.insert_one(subscriber)
+        await newsletter_subscribers_collection.insert_one(subscriber)
         
         return {"message": "Subscribed successfully", "status": "success"}
     except Exception as e:
@@ -904,7 +973,7 @@ async def subscribe_to_newsletter(subscription: NewsletterSubscriptionModel):
 async def unsubscribe_from_newsletter(email: EmailStr):
     """Unsubscribe from newsletter"""
     try:
-        result = newsletter_subscribers_collection.update_one(
+        result = await newsletter_subscribers_collection.update_one(
             {"email": email},
             {"$set": {
                 "status": "inactive",
@@ -934,7 +1003,7 @@ async def get_newsletter_campaigns(
         
         cursor = newsletter_campaigns_collection.find(query).skip(skip).limit(limit).sort("created_at", -1)
         campaigns = []
-        for campaign in cursor:
+        async for campaign in cursor:
             campaign["id"] = str(campaign.pop("_id"))
             campaigns.append(campaign)
         return campaigns
@@ -956,7 +1025,7 @@ async def get_newsletter_subscribers(
         
         cursor = newsletter_subscribers_collection.find(query).skip(skip).limit(limit).sort("opt_in_date", -1)
         subscribers = []
-        for subscriber in cursor:
+        async for subscriber in cursor:
             subscriber["id"] = str(subscriber.pop("_id"))
             subscribers.append(subscriber)
         return subscribers
@@ -978,7 +1047,7 @@ async def create_newsletter_campaign(
             recipients_count = len(campaign_data.recipients)
         else:
             # Count active subscribers
-            recipients_count = newsletter_subscribers_collection.count_documents({"status": "active"})
+            recipients_count = await newsletter_subscribers_collection.count_documents({"status": "active"})
         
         campaign = {
             "_id": campaign_id,
@@ -1001,7 +1070,7 @@ async def create_newsletter_campaign(
             "updated_by": current_user.id
         }
         
-        newsletter_campaigns_collection.insert_one(campaign)
+        await newsletter_campaigns_collection.insert_one(campaign)
         
         # Return the created campaign
         campaign["id"] = str(campaign.pop("_id"))
@@ -1018,7 +1087,7 @@ async def update_newsletter_campaign(
     """Update newsletter campaign (admin only)"""
     try:
         # Check if campaign exists
-        existing_campaign = newsletter_campaigns_collection.find_one({"_id": campaign_id})
+        existing_campaign = await newsletter_campaigns_collection.find_one({"_id": campaign_id})
         if not existing_campaign:
             raise HTTPException(status_code=404, detail="Campaign not found")
         
@@ -1045,13 +1114,13 @@ async def update_newsletter_campaign(
             update_data["scheduled_at"] = campaign_data.schedule_at
             update_data["status"] = "scheduled"
         
-        newsletter_campaigns_collection.update_one(
+        await newsletter_campaigns_collection.update_one(
             {"_id": campaign_id},
             {"$set": update_data}
         )
         
         # Return updated campaign
-        updated_campaign = newsletter_campaigns_collection.find_one({"_id": campaign_id})
+        updated_campaign = await newsletter_campaigns_collection.find_one({"_id": campaign_id})
         updated_campaign["id"] = str(updated_campaign.pop("_id"))
         return updated_campaign
     except Exception as e:
@@ -1065,7 +1134,7 @@ async def send_newsletter_campaign(
     """Send newsletter campaign (admin only)"""
     try:
         # Get campaign
-        campaign = newsletter_campaigns_collection.find_one({"_id": campaign_id})
+        campaign = await newsletter_campaigns_collection.find_one({"_id": campaign_id})
         if not campaign:
             raise HTTPException(status_code=404, detail="Campaign not found")
         
@@ -1073,7 +1142,7 @@ async def send_newsletter_campaign(
             raise HTTPException(status_code=400, detail="Campaign already sent")
         
         # Get active subscribers
-        subscribers = list(newsletter_subscribers_collection.find({"status": "active"}))
+        subscribers = await newsletter_subscribers_collection.find({"status": "active"}).to_list()
         if not subscribers:
             raise HTTPException(status_code=400, detail="No active subscribers")
         
@@ -1083,7 +1152,8 @@ async def send_newsletter_campaign(
             recipient_emails = [sub["email"] for sub in subscribers]
             
             # Send email
-            success = email_service.send_email(
+            success = await run_blocking(
+                email_service.send_email,
                 to_emails=recipient_emails,
                 subject=campaign["subject"],
                 content=campaign["html_content"] or campaign["content"],
@@ -1098,7 +1168,7 @@ async def send_newsletter_campaign(
             print(f"Email service disabled. Would send to {sent_count} recipients")
         
         # Update campaign status
-        newsletter_campaigns_collection.update_one(
+        await newsletter_campaigns_collection.update_one(
             {"_id": campaign_id},
             {"$set": {
                 "status": "sent",
@@ -1118,7 +1188,7 @@ async def send_newsletter_campaign(
 async def get_email_service_config(current_user: UserInDB = Depends(get_admin_user)):
     """Get email service configuration (admin only)"""
     try:
-        config = settings_collection.find_one({"key": "email_service"})
+        config = await settings_collection.find_one({"key": "email_service"})
         if config:
             return config["value"]
         else:
@@ -1136,7 +1206,7 @@ async def update_email_service_config(
         config_dict = config.dict()
         
         # Update in database
-        settings_collection.update_one(
+        await settings_collection.update_one(
             {"key": "email_service"},
             {"$set": {
                 "value": config_dict,
@@ -1147,7 +1217,7 @@ async def update_email_service_config(
         )
         
         # Reload email service config
-        email_service.load_config()
+        await run_blocking(email_service.load_config)
         
         return {"message": "Email service configuration updated", "config": config_dict}
     except Exception as e:
@@ -1155,16 +1225,17 @@ async def update_email_service_config(
 
 # SEO endpoints
 @app.get("/api/seo/metadata")
+@cache_response(tags=["seo"], ttl=300)
 async def get_seo_metadata(page_path: str = Query(...)):
     """Get SEO metadata for a specific page"""
     try:
-        metadata = seo_metadata_collection.find_one({"page_path": page_path})
+        metadata = await seo_metadata_collection.find_one({"page_path": page_path})
         if metadata:
             metadata["id"] = str(metadata.pop("_id"))
             return metadata
         else:
             # Return default SEO
-            default_seo = settings_collection.find_one({"key": "seo_config"})
+            default_seo = await settings_collection.find_one({"key": "seo_config"})
             if default_seo:
                 return {
                     "title": default_seo["value"]["default_title"],
@@ -1193,7 +1264,8 @@ async def create_seo_metadata(
             "updated_at": datetime.utcnow()
         }
         
-        seo_metadata_collection.insert_one(seo_data)
+        await seo_metadata_collection.insert_one(seo_data)
+        response_cache.invalidate("seo")
         
         seo_data["id"] = str(seo_data.pop("_id"))
         return seo_data
@@ -1213,15 +1285,16 @@ async def update_seo_metadata(
             **{k: v for k, v in metadata.dict().items() if v is not None}
         }
         
-        result = seo_metadata_collection.update_one(
+        result = await seo_metadata_collection.update_one(
             {"_id": metadata_id},
             {"$set": update_data}
         )
         
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="SEO metadata not found")
+        response_cache.invalidate("seo")
         
-        updated_metadata = seo_metadata_collection.find_one({"_id": metadata_id})
+        updated_metadata = await seo_metadata_collection.find_one({"_id": metadata_id})
         updated_metadata["id"] = str(updated_metadata.pop("_id"))
         return updated_metadata
     except Exception as e:
@@ -1231,7 +1304,7 @@ async def update_seo_metadata(
 async def get_all_settings(current_user: UserInDB = Depends(get_admin_user)):
     """Get all settings (admin only)"""
     try:
-        settings = list(settings_collection.find({}))
+        settings = await settings_collection.find({}).to_list()
         settings_dict = {}
         for setting in settings:
             settings_dict[setting["key"]] = setting["value"]
@@ -1240,105 +1313,404 @@ async def get_all_settings(current_user: UserInDB = Depends(get_admin_user)):
         raise HTTPException(status_code=500, detail=str(e))
 
 # Cases endpoints (keeping existing implementation)
+STREAM_BATCH_SIZE = int(os.environ.get('STREAM_BATCH_SIZE', '500'))
+CASE_BATCH_MAX_KEYS = int(os.environ.get('CASE_BATCH_MAX_KEYS', '200'))
+# Request key -> case field resolved with one $in query each
+CASE_BATCH_KEYS = [("ids", "_id"), ("registry_numbers", "registry_number"), ("order_references", "order_reference")]
+
+def build_case_query(
+    search: Optional[str] = None,
+    case_type: Optional[str] = None,
+    court_division: Optional[str] = None,
+    division_code: Optional[str] = None,
+    language: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    excluded: Optional[bool] = None
+) -> Dict:
+    """Mongo filter shared by the case list, stream and export endpoints"""
+    query = {}
+    
+    if excluded is not None:
+        query["excluded"] = excluded
+    
+    if case_type:
+        query["type"] = case_type
+    
+    if division_code:
+        query["division_code"] = division_code
+    elif court_division:
+        query.update(division_filter(court_division))
+    
+    if language:
+        query["language_of_proceedings"] = language
+    
+    if date_from or date_to:
+        date_query = {}
+        if date_from:
+            date_query["$gte"] = date_from
+        if date_to:
+            date_query["$lte"] = date_to
+        query["date"] = date_query
+    
+    if search:
+        query["$text"] = {"$search": search}
+    
+    return query
+
 @app.get("/api/cases")
+@cache_response(tags=["cases"], ttl=60)
 async def get_cases(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(100, ge=1, le=500),
     search: Optional[str] = Query(None),
     case_type: Optional[str] = Query(None),
     court_division: Optional[str] = Query(None),
+    division_code: Optional[str] = Query(None),
     language: Optional[str] = Query(None),
     date_from: Optional[str] = Query(None),
     date_to: Optional[str] = Query(None),
-    excluded: Optional[bool] = Query(None)
+    excluded: Optional[bool] = Query(None),
+    fields: str = Query("full")
 ):
     """Get cases with optional filtering"""
     try:
-        # Build query
-        query = {}
+        projection = projection_for(CASE_FIELD_PRESETS, fields, CASES_SORT)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        query = build_case_query(search, case_type, court_division, division_code, language,
+                                 date_from, date_to, excluded)
         
-        if excluded is not None:
-            query["excluded"] = excluded
+        # Get cases; with a cursor the page is a seek on (date, _id) instead of a skip
+        query = apply_cursor(query, cursor, CASES_SORT)
+        version = await list_etag_version(projection)
+        pipeline = list_pipeline(query, CASES_SORT, projection, limit, skip=skip if cursor is None else 0)
+        cases = await cases_collection.aggregate(pipeline).to_list()
         
-        if case_type:
-            query["type"] = case_type
+        next_cursor = encode_cursor(cases[-1], CASES_SORT) if len(cases) == limit else None
         
-        if court_division:
-            query["court_division"] = {"$regex": court_division, "$options": "i"}
+        etag = list_etag(cases, cache_key(request.url.path, request.url.query.encode()), version)
+        not_modified = conditional_response(request, response, etag, CASES_CACHE_CONTROL)
+        if not_modified:
+            return not_modified
         
-        if language:
-            query["language_of_proceedings"] = language
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        if cursor is not None:
+            return json_response({"items": cases, "next_cursor": next_cursor}, response)
+        return json_response(cases, response)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/cases/stream")
+async def stream_cases(
+    search: Optional[str] = Query(None),
+    case_type: Optional[str] = Query(None),
+    court_division: Optional[str] = Query(None),
+    division_code: Optional[str] = Query(None),
+    language: Optional[str] = Query(None),
+    date_from: Optional[str] = Query(None),
+    date_to: Optional[str] = Query(None),
+    excluded: Optional[bool] = Query(None),
+    fields: str = Query("full")
+):
+    """Stream every matching case as NDJSON from a single server-side cursor"""
+    try:
+        projection = projection_for(CASE_FIELD_PRESETS, fields, CASES_SORT)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        query = build_case_query(search, case_type, court_division, division_code, language,
+                                 date_from, date_to, excluded)
+        pipeline = list_pipeline(query, CASES_SORT, projection, None)
+        cursor = cases_collection.aggregate(pipeline, batchSize=STREAM_BATCH_SIZE).batch_size(STREAM_BATCH_SIZE)
+        # Fetch the first batch up front so query errors still surface as a 500
+        first_batch = await cursor.next_batch()
+        return StreamingResponse(ndjson_lines(cursor, first_batch), media_type=NDJSON_MEDIA_TYPE,
+                                 headers={"Cache-Control": "no-store"})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/cases/export")
+async def export_cases(
+    export_format: str = Query("csv", alias="format"),
+    search: Optional[str] = Query(None),
+    case_type: Optional[str] = Query(None),
+    court_division: Optional[str] = Query(None),
+    division_code: Optional[str] = Query(None),
+    language: Optional[str] = Query(None),
+    date_from: Optional[str] = Query(None),
+    date_to: Optional[str] = Query(None),
+    excluded: Optional[bool] = Query(None)
+):
+    """Export every matching case as CSV, XLSX or JSON without buffering the result set"""
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown export format '{export_format}'. Use csv, xlsx or json")
+    media_type, extension = EXPORT_FORMATS[export_format]
+    filename = export_filename(extension)
+    
+    try:
+        query = build_case_query(search, case_type, court_division, division_code, language,
+                                 date_from, date_to, excluded)
+        if extension == "xlsx":
+            path = await run_blocking(write_xlsx, cases_collection.delegate, row_pipeline(query, CASES_SORT))
+            return FileResponse(path, media_type=media_type, filename=filename,
+                                background=BackgroundTask(os.remove, path))
         
-        if date_from or date_to:
-            date_query = {}
-            if date_from:
-                date_query["$gte"] = date_from
-            if date_to:
-                date_query["$lte"] = date_to
-            query["date"] = date_query
+        if extension == "csv":
+            cursor = cases_collection.aggregate(row_pipeline(query, CASES_SORT), batchSize=EXPORT_BATCH_SIZE)
+            chunks = csv_chunks
+        else:
+            cursor = cases_collection.aggregate(list_pipeline(query, CASES_SORT, None, None),
+                                                batchSize=EXPORT_BATCH_SIZE)
+            chunks = json_chunks
+        cursor.batch_size(EXPORT_BATCH_SIZE)
+        first_batch = await cursor.next_batch()
+        return StreamingResponse(chunks(cursor, first_batch), media_type=media_type, headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+        })
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/cases/batch")
+async def get_cases_batch(batch: CaseBatchRequestModel):
+    """Resolve many cases by id, registry number or order reference in one round trip"""
+    try:
+        projection = projection_for(CASE_FIELD_PRESETS, batch.fields, CASES_SORT)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Duplicates collapse, request order is kept
+    requested = {key: list(dict.fromkeys(getattr(batch, key))) for key, _ in CASE_BATCH_KEYS}
+    if sum(len(values) for values in requested.values()) > CASE_BATCH_MAX_KEYS:
+        raise HTTPException(status_code=400, detail=f"At most {CASE_BATCH_MAX_KEYS} keys per batch")
+    
+    try:
+        lookups = [(key, field) for key, field in CASE_BATCH_KEYS if requested[key]]
+        results = await asyncio.gather(*(
+            cases_collection.find({field: {"$in": requested[key]}},
+                                  {**projection, field: 1} if projection else None).sort(CASES_SORT).to_list()
+            for key, field in lookups
+        ))
         
-        if search:
-            query["$text"] = {"$search": search}
+        items = []
+        seen = set()
+        missing = {key: [] for key, _ in CASE_BATCH_KEYS}
+        for (key, field), cases in zip(lookups, results):
+            # Registry numbers and order references can match several cases
+            matches: Dict[str, List[Dict]] = {}
+            for case in cases:
+                matches.setdefault(case[field], []).append(case)
+            for value in requested[key]:
+                if value not in matches:
+                    missing[key].append(value)
+                    continue
+                for case in matches[value]:
+                    if case["_id"] in seen:
+                        continue
+                    seen.add(case["_id"])
+                    items.append(case)
         
-        # Get cases
-        cursor = cases_collection.find(query).skip(skip).limit(limit).sort("date", -1)
-        cases = []
-        for case in cursor:
+        for case in items:
             case["id"] = str(case.pop("_id"))
-            cases.append(case)
-        
-        return cases
+        return json_response({"items": items, "missing": missing})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/cases/{case_id}")
-async def get_case_detail(case_id: str):
+@cache_response(tags=["cases"], ttl=60)
+async def get_case_detail(case_id: str, request: Request, response: Response):
     """Get detailed case information"""
     try:
-        case = cases_collection.find_one({"_id": case_id})
+        case = await cases_collection.find_one({"_id": case_id})
         if not case:
             raise HTTPException(status_code=404, detail="Case not found")
         
+        not_modified = conditional_response(request, response, document_etag(case), CASES_CACHE_CONTROL)
+        if not_modified:
+            return not_modified
+        
         case["id"] = str(case.pop("_id"))
-        return case
+        return json_response(case, response)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/stats")
-async def get_stats():
-    """Get database statistics"""
+@app.get("/api/cases/{case_id}/similar")
+@cache_response(tags=["cases"], ttl=300)
+async def get_similar_cases(case_id: str, limit: int = Query(10, ge=1, le=50)):
+    """Cases closest to this one by TF-IDF cosine similarity of summaries, headnotes, legal norms and tags"""
+    if not similar_cases.ready:
+        raise HTTPException(status_code=503, detail="Similar cases are still loading")
+    
+    try:
+        await similar_cases.check_version(db)
+        matches = similar_cases.similar(case_id, limit)
+        if matches is None:
+            raise HTTPException(status_code=404, detail="Case not found")
+        items = await run_blocking(fetch_similar, db, matches)
+        return json_response({"items": items})
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/parties/{party_id}/cases")
+@cache_response(tags=["cases"], ttl=60)
+async def get_party_cases(
+    party_id: str,
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(100, ge=1, le=500),
+    fields: str = Query("list")
+):
+    """Public cases naming a party, by its id (e.g. renault-deutschland-ag) or any spelling of its name"""
+    try:
+        projection = projection_for(CASE_FIELD_PRESETS, fields, CASES_SORT)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     try:
-        total_cases = cases_collection.count_documents({})
-        total_orders = cases_collection.count_documents({"type": "Order"})
-        total_decisions = cases_collection.count_documents({"type": "Decision"})
+        # Indexed equality on the multikey party_ids array; "Renault Deutschland Aktiengesellschaft" works too
+        query = apply_cursor({"party_ids": normalize_party_id(party_id) or party_id, "excluded": {"$ne": True}},
+                             cursor, CASES_SORT)
+        version = await list_etag_version(projection)
+        pipeline = list_pipeline(query, CASES_SORT, projection, limit, skip=skip if cursor is None else 0)
+        cases = await cases_collection.aggregate(pipeline).to_list()
         
-        # Get recent cases (last 30 days)
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        recent_cases = list(cases_collection.find({
-            "date": {"$gte": thirty_days_ago.strftime("%Y-%m-%d")}
-        }).sort("date", -1).limit(10))
+        next_cursor = encode_cursor(cases[-1], CASES_SORT) if len(cases) == limit else None
         
-        for case in recent_cases:
-            case["id"] = str(case.pop("_id"))
+        etag = list_etag(cases, cache_key(request.url.path, request.url.query.encode()), version)
+        not_modified = conditional_response(request, response, etag, CASES_CACHE_CONTROL)
+        if not_modified:
+            return not_modified
         
-        return {
-            "total_cases": total_cases,
-            "total_orders": total_orders,
-            "total_decisions": total_decisions,
-            "recent_cases": recent_cases
-        }
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        if cursor is not None:
+            return json_response({"items": cases, "next_cursor": next_cursor}, response)
+        return json_response(cases, response)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/stats")
+@cache_response(tags=["cases"], ttl=60)
+async def get_stats(
+    fresh: bool = Query(False),
+    current_user: Optional[UserInDB] = Depends(get_optional_user)
+):
+    """Get database statistics from the materialized stats document"""
+    if fresh and (current_user is None or current_user.role != UserRole.ADMIN):
+        raise HTTPException(status_code=403, detail="Only admins can bypass the stats cache")
+    
+    try:
+        if fresh:
+            stats = await run_blocking(refresh_stats, db)
+        else:
+            stats = await run_blocking(load_stats, db)
+        
+        return stats
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/filters")
+async def get_filters():
+    """Get available filter values with counts, served from an in-memory cache"""
+    try:
+        return await filters_cache.get()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/search")
+@cache_response(tags=["cases", "upc_texts"], ttl=60)
+async def search(
+    q: str = Query(..., min_length=1, max_length=500),
+    kind: Optional[str] = Query(None),
+    case_type: Optional[str] = Query(None),
+    division_code: Optional[str] = Query(None),
+    language: Optional[str] = Query(None),
+    document_type: Optional[str] = Query(None),
+    date_from: Optional[str] = Query(None),
+    date_to: Optional[str] = Query(None),
+    lang: Optional[str] = Query(None),
+    fuzzy: bool = Query(False),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Relevance-ranked full-text search over cases and UPC legal texts; typo-tolerant with fuzzy=true"""
+    if kind is not None and kind not in (KIND_CASE, KIND_UPC_TEXT):
+        raise HTTPException(status_code=400, detail=f"kind must be '{KIND_CASE}' or '{KIND_UPC_TEXT}'")
+    if not search_engine.ready:
+        raise HTTPException(status_code=503, detail="Search index is still loading")
+    
+    try:
+        await search_engine.check_version(db)
+        filters = {"kind": kind, "type": case_type, "division_code": division_code,
+                   "language": language.upper() if language else None, "document_type": document_type}
+        started = time.perf_counter()
+        result = search_engine.search(q, filters, date_from, date_to, skip, limit, lang or "", fuzzy)
+        took_ms = (time.perf_counter() - started) * 1000
+        items = await run_blocking(fetch_hits, db, result.hits)
+        return json_response({"total": result.total, "items": items, "fuzzy": result.fuzzy,
+                              "took_ms": round(took_ms, 3)})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/suggest")
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=200),
+    category: Optional[str] = Query(None),
+    limit: int = Query(10, ge=1, le=20)
+):
+    """Search-box autocomplete over parties, patents, court divisions and legal text articles"""
+    if category is not None and category not in SUGGEST_CATEGORIES:
+        raise HTTPException(status_code=400, detail=f"category must be one of: {', '.join(SUGGEST_CATEGORIES)}")
+    if not search_engine.ready:
+        raise HTTPException(status_code=503, detail="Search index is still loading")
+    
+    try:
+        await search_engine.check_version(db)
+        started = time.perf_counter()
+        suggestions = search_engine.suggest(q, limit, category)
+        took_ms = (time.perf_counter() - started) * 1000
+        return json_response({"suggestions": [suggestion._asdict() for suggestion in suggestions],
+                              "took_ms": round(took_ms, 3)})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # UPC Text endpoints
 @app.get("/api/upc-texts")
+@cache_response(tags=["upc_texts"], ttl=300)
 async def get_upc_texts(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(100, ge=1, le=500),
     search: Optional[str] = Query(None),
-    document_type: Optional[str] = Query(None)
+    document_type: Optional[str] = Query(None),
+    fields: str = Query("full")
 ):
     """Get UPC legal texts with optional filtering"""
+    try:
+        projection = projection_for(UPC_TEXT_FIELD_PRESETS, fields, UPC_TEXTS_SORT)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     try:
         query = {}
         
@@ -1348,29 +1720,95 @@ async def get_upc_texts(
         if search:
             query["$text"] = {"$search": search}
         
-        cursor = upc_texts_collection.find(query).skip(skip).limit(limit).sort("article_number", 1)
-        texts = []
-        for text in cursor:
-            text["id"] = str(text.pop("_id"))
-            texts.append(text)
+        query = apply_cursor(query, cursor, UPC_TEXTS_SORT)
+        pipeline = list_pipeline(query, UPC_TEXTS_SORT, projection, limit, skip=skip if cursor is None else 0)
+        texts = await upc_texts_collection.aggregate(pipeline).to_list()
+        
+        next_cursor = encode_cursor(texts[-1], UPC_TEXTS_SORT) if len(texts) == limit else None
         
-        return texts
+        etag = list_etag(texts, cache_key(request.url.path, request.url.query.encode()))
+        not_modified = conditional_response(request, response, etag, UPC_TEXTS_CACHE_CONTROL)
+        if not_modified:
+            return not_modified
+        
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        if cursor is not None:
+            return json_response({"items": texts, "next_cursor": next_cursor}, response)
+        return json_response(texts, response)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/upc-texts/{text_id}")
-async def get_upc_text_detail(text_id: str):
+@cache_response(tags=["upc_texts"], ttl=300)
+async def get_upc_text_detail(text_id: str, request: Request, response: Response):
     """Get detailed UPC text information"""
     try:
-        text = upc_texts_collection.find_one({"_id": text_id})
+        text = await upc_texts_collection.find_one({"_id": text_id})
         if not text:
             raise HTTPException(status_code=404, detail="UPC text not found")
         
+        not_modified = conditional_response(request, response, document_etag(text), UPC_TEXTS_CACHE_CONTROL)
+        if not_modified:
+            return not_modified
+        
         text["id"] = str(text.pop("_id"))
-        return text
+        return json_response(text, response)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/rop/rules/{rule_number}")
+async def get_rop_rule(rule_number: str):
+    """Get a single Rule of Procedure straight from the binary bundle"""
+    if rop_bundle is None:
+        raise HTTPException(status_code=503, detail="RoP bundle not available")
+    
+    raw = rop_bundle.get_raw(rule_number)
+    if raw is None:
+        raise HTTPException(status_code=404, detail="Rule not found")
+    
+    return Response(content=raw, media_type="application/json")
+
+@app.post("/api/admin/import-rop")
+async def import_rules_of_procedure(
+    options: ROPImportModel,
+    current_user: UserInDB = Depends(get_admin_user)
+):
+    """Import the Rules of Procedure from rop.json (admin only)"""
+    try:
+        result = await run_blocking(
+            import_rop,
+            upc_texts_collection.delegate,
+            overwrite_existing=options.overwrite_existing,
+            import_preamble=options.import_preamble,
+            import_application_rules=options.import_application_rules,
+            import_content=options.import_content,
+            cross_reference_fn=detect_cross_references
+        )
+        await search_engine.refresh(db, [KIND_UPC_TEXT])
+        response_cache.invalidate("upc_texts")
+        return result
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="rop.json not found")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/admin/cache")
+async def get_response_cache_stats(current_user: UserInDB = Depends(get_admin_user)):
+    """Get response cache hit/miss metrics (admin only)"""
+    return response_cache.stats()
+
+@app.post("/api/admin/cache/clear")
+async def clear_response_cache(current_user: UserInDB = Depends(get_admin_user)):
+    """Drop every cached response (admin only)"""
+    response_cache.clear()
+    filters_cache.invalidate()
+    return {"message": "Response cache cleared", **response_cache.stats()}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
@@ -0,0 +1,186 @@
+"""Prefix autocomplete for parties, patents, court divisions and legal text articles.
+
+Suggestions live in one sorted list of ``(key, category, value)`` tuples,
+where the keys are the folded value and each of its word-initial suffixes
+(so "masch" finds "Progress Maschinen & Automation AG"). A lookup is a
+``bisect`` to the first key with the prefix plus a forward scan over every
+key that has it, so ranking always sees all matching entries. Weights are
+case frequencies: the number of searchable cases naming a party, patent or
+division, or citing an article. Entries are inserted or removed as their
+count moves off or back to zero. New keys are appended to a pending run and
+merged into the sorted list before the next lookup, which keeps both a full
+build and a small incremental update linear.
+
+Short prefixes, and any prefix matching many keys ("ep 30"), have their top
+``TOP_K`` entries ranked once and kept. Updates maintain those lists in
+place: an entry whose weight rises is moved in or up, and a list is only
+dropped (and ranked again on its next lookup) when one of its entries falls
+below the last place, where an entry outside the list could now beat it.
+"""
+
+from bisect import bisect_left
+from collections import Counter
+from heapq import nlargest
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from text_analysis import TOKEN_RE, fold
+
+CATEGORY_PARTY = "party"
+CATEGORY_PATENT = "patent"
+CATEGORY_DIVISION = "division"
+CATEGORY_ARTICLE = "article"
+CATEGORIES = (CATEGORY_PARTY, CATEGORY_PATENT, CATEGORY_DIVISION, CATEGORY_ARTICLE)
+
+# Citations of an article by cases, counted apart from the article entries themselves
+CATEGORY_CITATION = "citation"
+
+MAX_KEY_WORDS = 8
+# Prefixes up to this length, or matching more keys than BROAD_PREFIX_KEYS, keep their ranked top entries
+TOP_K_PREFIX_LENGTH = 3
+BROAD_PREFIX_KEYS = 1000
+# Entries kept per short prefix and category; the most /api/suggest returns
+TOP_K = 20
+
+Entry = Tuple[str, str]
+
+
+class Suggestion(NamedTuple):
+    value: str
+    category: str
+    weight: int
+
+
+def normalize_key(text: str) -> str:
+    return " ".join(fold(text).split())
+
+
+def suggestion_keys(value: str) -> List[str]:
+    """The whole value and the suffixes starting at its next few words"""
+    key = normalize_key(value)
+    keys = [key]
+    for match in list(TOKEN_RE.finditer(key))[1:MAX_KEY_WORDS]:
+        keys.append(key[match.start():])
+    return list(dict.fromkeys(keys))
+
+
+class SuggestIndex:
+    def __init__(self):
+        self._keys: List[Tuple[str, str, str]] = []
+        self._pending: List[Tuple[str, str, str]] = []
+        self._counts: Counter = Counter()
+        # short prefix -> category (None for all) -> top entries, best first
+        self._top: Dict[str, Dict[Optional[str], List[Entry]]] = {}
+        self._longest_top = 0
+
+    def __len__(self) -> int:
+        return sum(1 for category, _ in self._counts if category != CATEGORY_CITATION)
+
+    def weight(self, category: str, value: str) -> int:
+        if category == CATEGORY_ARTICLE:
+            return self._counts[(CATEGORY_CITATION, value)] + 1
+        return self._counts[(category, value)]
+
+    def update(self, entries: Iterable[Entry], delta: int) -> None:
+        """Add (delta=1) or withdraw (delta=-1) one document's entries"""
+        for category, value in entries:
+            entry = (category, value)
+            before = self._counts[entry]
+            after = before + delta
+            if after > 0:
+                self._counts[entry] = after
+            else:
+                self._counts.pop(entry, None)
+            if self._top and category == CATEGORY_CITATION:
+                self._adjust((CATEGORY_ARTICLE, value), before + 1)
+            elif self._top:
+                self._adjust(entry, self.weight(category, value) if category == CATEGORY_ARTICLE else before)
+            if category == CATEGORY_CITATION or (before > 0) == (after > 0):
+                continue
+            items = [(key, category, value) for key in suggestion_keys(value)]
+            if after > 0:
+                self._pending += items
+                continue
+            self._merge()
+            for item in items:
+                index = bisect_left(self._keys, item)
+                if index < len(self._keys) and self._keys[index] == item:
+                    del self._keys[index]
+
+    def _rank_key(self, entry: Entry) -> Tuple[int, int]:
+        return self.weight(*entry), -len(entry[1])
+
+    def _adjust(self, entry: Entry, weight_before: int) -> None:
+        """Keep the ranked lists of every prefix of the entry's keys exact after its weight moved"""
+        category, value = entry
+        prefixes = {key[:length] for key in suggestion_keys(value)
+                    for length in range(1, min(len(key), self._longest_top) + 1)}
+        present = self._counts[entry] > 0
+        rank = self._rank_key(entry)
+        rank_before = (weight_before, rank[1])
+        for prefix in prefixes:
+            by_category = self._top.get(prefix)
+            if by_category is None:
+                continue
+            for list_category in {None, category}:
+                ranked = by_category.get(list_category)
+                if ranked is not None and not self._reposition(ranked, entry, present, rank, rank_before):
+                    del by_category[list_category]
+
+    def _reposition(self, ranked: List[Entry], entry: Entry, present: bool, rank: Tuple[int, int],
+                    rank_before: Tuple[int, int]) -> bool:
+        """Move entry within one ranked list; False when the list can no longer be trusted"""
+        # A list shorter than TOP_K holds every matching entry; a full one only
+        # guarantees that entries left out rank no higher than its last place.
+        complete = len(ranked) < TOP_K
+        listed = entry in ranked
+        if listed:
+            ranked.remove(entry)
+        if not complete:
+            floor = self._rank_key(ranked[-1])
+            if listed:
+                floor = min(floor, rank_before)
+            if listed and (not present or rank < floor):
+                return False
+            if not listed and (not present or rank <= floor):
+                return True
+        if present:
+            ranked.append(entry)
+            ranked.sort(key=self._rank_key, reverse=True)
+            del ranked[TOP_K:]
+        return True
+
+    def _merge(self) -> None:
+        if self._pending:
+            # Timsort merges the two sorted runs in linear time
+            self._pending.sort()
+            self._keys += self._pending
+            self._keys.sort()
+            self._pending = []
+
+    def suggest(self, prefix: str, limit: int = 10, category: Optional[str] = None) -> List[Suggestion]:
+        prefix = normalize_key(prefix)
+        if not prefix:
+            return []
+        self._merge()
+        ranked = self._top.get(prefix, {}).get(category) if limit <= TOP_K else None
+        if ranked is None:
+            ranked, scanned = self._rank(prefix, max(limit, TOP_K), category)
+            if limit <= TOP_K and (len(prefix) <= TOP_K_PREFIX_LENGTH or scanned > BROAD_PREFIX_KEYS):
+                self._top.setdefault(prefix, {})[category] = ranked
+                self._longest_top = max(self._longest_top, len(prefix))
+        return [Suggestion(value, entry_category, self.weight(entry_category, value))
+                for entry_category, value in ranked[:limit]]
+
+    def _rank(self, prefix: str, limit: int, category: Optional[str]) -> Tuple[List[Entry], int]:
+        """Best entries with a key starting with prefix, from every such key, and how many keys matched"""
+        seen = set()
+        start = index = bisect_left(self._keys, (prefix,))
+        for index in range(start, len(self._keys)):
+            key, entry_category, value = self._keys[index]
+            if not key.startswith(prefix):
+                break
+            if category is None or entry_category == category:
+                seen.add((entry_category, value))
+        else:
+            index = len(self._keys)
+        return nlargest(limit, seen, key=self._rank_key), index - start
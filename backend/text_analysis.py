@@ -0,0 +1,114 @@
+"""Tokenizer and light EN/DE/FR stemmers for the in-process search index.
+
+Tokens keep their character offsets in the original text, so callers can map
+matches back to the source. Terms are casefolded and stripped of diacritics
+(``ß`` becomes ``ss``, ``é`` becomes ``e``) before stemming. The stemmers are
+deliberately light, suffix-stripping only: legal vocabulary is full of
+proper nouns and numbers that aggressive stemmers mangle.
+"""
+
+import re
+import unicodedata
+from array import array
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Set
+
+TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+STOPWORDS: Dict[str, Set[str]] = {
+    "EN": {"a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in", "is", "it", "its",
+           "of", "on", "or", "that", "the", "this", "to", "was", "were", "which", "with"},
+    "DE": {"der", "die", "das", "den", "dem", "des", "ein", "eine", "einer", "eines", "einem", "einen",
+           "und", "oder", "in", "im", "zu", "zum", "zur", "von", "vom", "mit", "auf", "fur", "ist", "sind",
+           "als", "an", "am", "bei", "nach", "uber", "aus"},
+    "FR": {"le", "la", "les", "l", "un", "une", "des", "du", "de", "d", "et", "ou", "en", "au", "aux",
+           "a", "dans", "par", "pour", "sur", "est", "sont", "que", "qui", "ce", "cette", "ces", "se"},
+}
+ALL_STOPWORDS: Set[str] = set().union(*STOPWORDS.values())
+
+MIN_STEM = 3
+
+
+class Token(NamedTuple):
+    term: str
+    position: int
+    start: int
+    end: int
+
+
+def fold(text: str) -> str:
+    """Casefold and drop combining marks"""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _strip_suffix(word: str, rules) -> str:
+    for suffix, replacement in rules:
+        if word.endswith(suffix) and len(word) - len(suffix) + len(replacement) >= MIN_STEM:
+            return word[:len(word) - len(suffix)] + replacement
+    return word
+
+
+# Longest suffixes first; the first matching rule wins
+_EN_RULES = [
+    ("ements", ""), ("ement", ""), ("ations", ""), ("ation", ""), ("ments", ""), ("ment", ""),
+    ("ings", ""), ("ing", ""), ("ions", ""), ("ion", ""), ("ies", "y"), ("edly", ""), ("ed", ""),
+    ("ly", ""), ("es", ""), ("e", ""), ("s", ""),
+]
+_DE_RULES = [("ern", ""), ("em", ""), ("en", ""), ("er", ""), ("es", ""), ("e", ""), ("s", ""), ("n", "")]
+_FR_RULES = [
+    ("ements", ""), ("ement", ""), ("ations", ""), ("ation", ""), ("euses", ""), ("euse", ""),
+    ("ites", ""), ("ite", ""), ("eux", ""), ("aux", "al"), ("es", ""), ("e", ""), ("s", ""), ("x", ""),
+]
+
+
+def stem_en(word: str) -> str:
+    if len(word) <= MIN_STEM or word.isdigit() or word.endswith(("ss", "us", "is")):
+        return word
+    return _strip_suffix(word, _EN_RULES)
+
+
+def stem_de(word: str) -> str:
+    if len(word) <= MIN_STEM + 1 or word.isdigit():
+        return word
+    return _strip_suffix(word, _DE_RULES)
+
+
+def stem_fr(word: str) -> str:
+    if len(word) <= MIN_STEM or word.isdigit():
+        return word
+    return _strip_suffix(word, _FR_RULES)
+
+
+STEMMERS: Dict[str, Callable[[str], str]] = {"EN": stem_en, "DE": stem_de, "FR": stem_fr}
+DEFAULT_LANGUAGE = "EN"
+
+
+def stemmer_for(language: str) -> Callable[[str], str]:
+    return STEMMERS.get((language or DEFAULT_LANGUAGE).upper(), stem_en)
+
+
+def tokens(text: str, language: str = DEFAULT_LANGUAGE, start_position: int = 0,
+           starts: Optional[array] = None) -> Iterator[Token]:
+    """Stemmed, stopword-free tokens; positions still count stopwords so phrases line up.
+
+    When given, ``starts`` collects the character offset of every word,
+    stopwords included, so it is indexed by position - start_position.
+    """
+    stem = stemmer_for(language)
+    stopwords = STOPWORDS.get((language or DEFAULT_LANGUAGE).upper(), STOPWORDS[DEFAULT_LANGUAGE])
+    for position, match in enumerate(TOKEN_RE.finditer(text or ""), start=start_position):
+        if starts is not None:
+            starts.append(match.start())
+        word = match.group()
+        word = word.lower() if word.isascii() else fold(word)
+        if word in stopwords:
+            continue
+        yield Token(stem(word), position, match.start(), match.end())
+
+
+def query_variants(word: str, language: str = "") -> List[str]:
+    """Index terms a query word may have been stored as: its stem in each language"""
+    folded = fold(word)
+    if language:
+        return [stemmer_for(language)(folded)]
+    return list(dict.fromkeys(stem(folded) for stem in STEMMERS.values()))
@@ -11,6 +11,14 @@ from urllib.parse import urljoin, urlparse
 from pymongo import MongoClient
 import os
 
+from legal_tagger import TAG_TAGGER, DETAIL_TAG_TAGGER
+from citation_scanner import scan as scan_citations
+from court_divisions import enrich_case
+from party_names import enrich_parties, party_id, split_party_text
+from content_hash import stamp_content_hash
+from case_facets import bump_cases_version
+from case_stats import refresh_stats
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -253,6 +261,8 @@ class UPCScraper:
         """Parse parties from text like 'Company A v. Company B'"""
         try:
             parties = []
+            # Spelling variants of one party ("... AG" and "... AG.") are kept once
+            seen_ids = set()
             
             # Handle the case where there's no space before v.
             if 'v.' in parties_text:
@@ -265,14 +275,16 @@ class UPCScraper:
                     sub_parties = part.split('\n')
                     for sub_party in sub_parties:
                         party = sub_party.strip()
-                        if party and party not in parties:
+                        if party and party_id(party) not in seen_ids:
+                            seen_ids.add(party_id(party))
                             parties.append(party)
             else:
                 # Split on line breaks
                 sub_parties = parties_text.split('\n')
                 for sub_party in sub_parties:
                     party = sub_party.strip()
-                    if party and party not in parties:
+                    if party and party_id(party) not in seen_ids:
+                        seen_ids.add(party_id(party))
                         parties.append(party)
             
             return parties[:10]  # Limit to 10 parties
@@ -508,33 +520,11 @@ class UPCScraper:
     
     def _extract_legal_norms(self, text: str) -> List[str]:
         """Extract legal norms"""
-        norms = []
-        patterns = [
-            r'(Art\.\s*\d+\s*\w*)',
-            r'(Rule\s*\d+\s*\w*)',
-            r'(Article\s*\d+)',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.I)
-            norms.extend(matches)
-        
-        return list(set(norms))
+        return [citation.text for citation in scan_citations(text)]
     
     def _extract_tags(self, text: str) -> List[str]:
-        """Extract relevant tags"""
-        tags = []
-        tag_keywords = [
-            'patent infringement', 'preliminary injunction', 'revocation',
-            'counterclaim', 'language change', 'procedural order',
-            'costs', 'damages', 'validity', 'enforcement'
-        ]
-        
-        for keyword in tag_keywords:
-            if re.search(rf'\b{re.escape(keyword)}\b', text, re.I):
-                tags.append(keyword)
-        
-        return tags
+        """Extract relevant tags, most frequent first"""
+        return TAG_TAGGER.rank(text)
     
     def _extract_summary(self, text: str) -> str:
         """Extract or generate summary"""
@@ -712,50 +702,15 @@ class UPCScraper:
     def _extract_legal_norms_from_detail(self, text: str) -> List[str]:
         """Extract legal norms from detail page"""
         try:
-            norms = []
-            patterns = [
-                r'(Art\.\s*\d+[a-zA-Z]*(?:\s*\([^)]+\))?(?:\s*[A-Z]+)?)',
-                r'(Article\s*\d+[a-zA-Z]*(?:\s*\([^)]+\))?(?:\s*[A-Z]+)?)',
-                r'(Rule\s*\d+[a-zA-Z]*(?:\s*\([^)]+\))?(?:\s*[A-Z]+)?)',
-                r'(Section\s*\d+[a-zA-Z]*(?:\s*\([^)]+\))?(?:\s*[A-Z]+)?)',
-            ]
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, text, re.I)
-                norms.extend(matches)
-            
-            # Remove duplicates and clean up
-            unique_norms = []
-            for norm in norms:
-                clean_norm = norm.strip()
-                if clean_norm and clean_norm not in unique_norms:
-                    unique_norms.append(clean_norm)
-            
-            return unique_norms[:10]  # Limit to 10 norms
-            
+            return [citation.text for citation in scan_citations(text)][:10]  # Limit to 10 norms
         except Exception as e:
             logger.debug(f"Error extracting legal norms: {e}")
             return []
     
     def _extract_tags_from_detail(self, text: str) -> List[str]:
-        """Extract relevant tags from detail page content"""
+        """Extract relevant tags from detail page content, most frequent first"""
         try:
-            tags = []
-            tag_keywords = [
-                'patent infringement', 'preliminary injunction', 'revocation',
-                'counterclaim', 'language change', 'procedural order',
-                'costs', 'damages', 'validity', 'enforcement',
-                'appeal', 'application', 'generic application',
-                'provisional measures', 'default judgment'
-            ]
-            
-            text_lower = text.lower()
-            for keyword in tag_keywords:
-                if keyword in text_lower:
-                    tags.append(keyword)
-            
-            return tags
-            
+            return DETAIL_TAG_TAGGER.rank(text)
         except Exception as e:
             logger.debug(f"Error extracting tags: {e}")
             return []
@@ -809,13 +764,15 @@ class UPCScraper:
                 r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:v\.|versus)\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
             ]
             
-            parties = []
+            parties = {}
             for pattern in patterns:
-                matches = re.findall(pattern, text)
-                parties.extend(matches)
+                for match in re.findall(pattern, text):
+                    # "A v. B" matches name two parties; spelling variants share an id
+                    for party in split_party_text(match):
+                        parties.setdefault(party_id(party), party)
+            parties.pop(None, None)
             
-            # Remove duplicates and return
-            return list(set(parties))[:5]  # Limit to 5 parties
+            return list(parties.values())[:5]  # Limit to 5 parties
             
         except Exception as e:
             logger.debug(f"Error extracting parties from detail: {e}")
@@ -942,11 +899,14 @@ class UPCScraper:
         updated_count = 0
         skipped_count = 0
         duplicate_count = 0
+        written_ids = []
         
         for decision in decisions:
             try:
                 # Ensure _id is a string UUID
                 decision['_id'] = decision.pop('id')
+                enrich_case(decision)
+                enrich_parties(decision)
                 
                 # Use registry_number as the primary unique identifier
                 unique_key = decision.get('registry_number') or decision.get('order_reference')
@@ -988,6 +948,8 @@ class UPCScraper:
                             if field in existing_decision:
                                 decision[field] = existing_decision[field]
                         
+                        stamp_content_hash(decision)
+                        
                         # Remove _id from update data to avoid MongoDB immutable field error
                         update_data = {k: v for k, v in decision.items() if k != '_id'}
                         
@@ -996,14 +958,16 @@ class UPCScraper:
                             {'$set': update_data}
                         )
                         updated_count += 1
+                        written_ids.append(existing_decision['_id'])
                         logger.debug(f"Updated decision {unique_key}")
                     else:
                         skipped_count += 1
                         logger.debug(f"Skipped decision {unique_key} (no improvements)")
                 else:
                     # New decision, insert it
-                    self.collection.insert_one(decision)
+                    self.collection.insert_one(stamp_content_hash(decision))
                     saved_count += 1
+                    written_ids.append(decision['_id'])
                     logger.debug(f"Saved new decision {unique_key}")
                     
             except Exception as e:
@@ -1011,6 +975,11 @@ class UPCScraper:
         
         logger.info(f"Database update completed: {saved_count} new, {updated_count} updated, {skipped_count} skipped, {duplicate_count} duplicates")
         
+        if saved_count or updated_count:
+            # Let the API drop cached facets, re-index the written cases and serve fresh stats
+            bump_cases_version(self.db, written_ids)
+            refresh_stats(self.db)
+        
         # Calculate the percentage of new content
         total_processed = len(decisions)
         new_content_percentage = (saved_count + updated_count) / total_processed * 100 if total_processed > 0 else 0
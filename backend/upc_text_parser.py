@@ -1,13 +1,16 @@
-import requests
 import pdfplumber
 import re
-import json
 import uuid
 from datetime import datetime
 from typing import List, Dict, Optional
 from pymongo import MongoClient
 import os
 
+from legal_tagger import KEYWORD_TAGGER
+from citation_scanner import scan as scan_citations, cross_reference_labels
+from pdf_downloader import PDFDownloader, DownloadError
+from content_hash import stamp_content_hash
+
 class UPCTextParser:
     def __init__(self, mongodb_url: str = None):
         """Initialize UPC text parser with MongoDB connection"""
@@ -19,34 +22,22 @@ class UPCTextParser:
             self.client = None
             self.db = None
             self.collection = None
+        
+        self.downloader = PDFDownloader()
     
-    def download_pdf(self, url: str, filename: str) -> bool:
-        """Download PDF from URL"""
+    def download_pdf(self, url: str, filename: str) -> Optional[str]:
+        """Download PDF from URL into the download directory and return its path"""
         try:
             print(f"Downloading {filename} from {url}")
-            
-            # Add more headers to avoid 406 errors
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'application/pdf,text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1'
-            }
-            
-            response = requests.get(url, stream=True, timeout=60, headers=headers)
-            response.raise_for_status()
-            
-            with open(filename, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            
-            print(f"✅ Successfully downloaded {filename}")
-            return True
-        except Exception as e:
+            result = self.downloader.download(url, filename)
+            if result.status == "not_modified":
+                print(f"✅ {filename} is up to date, using cached copy")
+            else:
+                print(f"✅ Successfully downloaded {filename} ({result.status}, {result.bytes_transferred} bytes)")
+            return str(result.path)
+        except DownloadError as e:
             print(f"❌ Error downloading {filename}: {e}")
-            return False
+            return None
     
     def parse_rules_of_procedure(self, pdf_path: str) -> List[Dict]:
         """Parse the Rules of Procedure PDF"""
@@ -246,46 +237,12 @@ class UPCTextParser:
         return articles
     
     def _extract_keywords(self, text: str) -> List[str]:
-        """Extract keywords from text"""
-        keywords = []
-        
-        # Common legal keywords
-        legal_terms = [
-            "infringement", "patent", "claim", "procedure", "court", "division",
-            "application", "provisional", "measures", "evidence", "proceedings",
-            "revocation", "validity", "competence", "jurisdiction", "remedy",
-            "damages", "injunction", "hearing", "decision", "order", "appeal",
-            "costs", "representation", "service", "language", "translation",
-            "time", "limit", "extension", "suspension", "stay", "security",
-            "enforcement", "execution", "cross-border", "license", "declaration"
-        ]
-        
-        text_lower = text.lower()
-        for term in legal_terms:
-            if term in text_lower:
-                keywords.append(term)
-        
-        # Remove duplicates and limit to 10
-        keywords = list(set(keywords))[:10]
-        return keywords
+        """Extract keywords from text, most frequent first"""
+        return KEYWORD_TAGGER.rank(text, limit=10)
     
     def _extract_cross_references(self, text: str) -> List[str]:
         """Extract cross-references from text"""
-        references = []
-        
-        # Pattern for Rules
-        rule_refs = re.findall(r'Rule\s+(\d+(?:\.\d+)?)', text, re.IGNORECASE)
-        for ref in rule_refs:
-            references.append(f"Rule {ref}")
-        
-        # Pattern for Articles
-        article_refs = re.findall(r'Article\s+(\d+(?:\.\d+)?)', text, re.IGNORECASE)
-        for ref in article_refs:
-            references.append(f"Article {ref}")
-        
-        # Remove duplicates
-        references = list(set(references))
-        return references
+        return cross_reference_labels(scan_citations(text))
     
     def save_to_database(self, texts: List[Dict]):
         """Save parsed texts to MongoDB"""
@@ -299,7 +256,7 @@ class UPCTextParser:
             
             # Insert new data
             if texts:
-                self.collection.insert_many(texts)
+                self.collection.insert_many([stamp_content_hash(text) for text in texts])
                 print(f"✅ Successfully saved {len(texts)} texts to database")
             else:
                 print("⚠️ No texts to save")
@@ -324,23 +281,18 @@ class UPCTextParser:
         for doc_type, url in urls.items():
             filename = f"{doc_type}.pdf"
             
-            # Download PDF
-            if self.download_pdf(url, filename):
+            # Download PDF (kept in the download directory for the next run)
+            pdf_path = self.download_pdf(url, filename)
+            if pdf_path:
                 # Parse PDF
                 if doc_type == "rules_of_procedure":
-                    texts = self.parse_rules_of_procedure(filename)
+                    texts = self.parse_rules_of_procedure(pdf_path)
                 elif doc_type == "upc_agreement":
-                    texts = self.parse_upca(filename)
+                    texts = self.parse_upca(pdf_path)
                 else:
                     texts = []
                 
                 all_texts.extend(texts)
-                
-                # Clean up file
-                try:
-                    os.remove(filename)
-                except:
-                    pass
         
         # Save to database
         if all_texts:
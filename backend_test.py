@@ -1692,6 +1692,395 @@ class UPCLegalAPITester(unittest.TestCase):
             print(f"❌ UPC text editing system error: {str(e)}")
             return False
 
+    def test_38_keyset_pagination(self):
+        """Test cursor-based pagination over cases"""
+        print("\n🔍 Testing keyset pagination for cases...")
+        try:
+            seen_ids = []
+            cursor = ""
+            for _ in range(5):
+                response = self.session.get(f"{self.api_url}/cases", params={"limit": 10, "cursor": cursor}, timeout=self.timeout)
+                self.assertEqual(response.status_code, 200)
+                page = response.json()
+                self.assertIn("items", page)
+                self.assertIn("next_cursor", page)
+                seen_ids.extend(case["id"] for case in page["items"])
+                if not page["next_cursor"]:
+                    break
+                self.assertEqual(response.headers.get("X-Next-Cursor"), page["next_cursor"])
+                cursor = page["next_cursor"]
+            
+            self.assertEqual(len(seen_ids), len(set(seen_ids)), "Pages must not overlap")
+            print(f"✅ Walked {len(seen_ids)} cases across cursor pages without duplicates")
+            
+            response = self.session.get(f"{self.api_url}/cases", params={"cursor": "not-a-cursor"}, timeout=self.timeout)
+            self.assertEqual(response.status_code, 400)
+            print("✅ Malformed cursor rejected with 400")
+            return True
+        except Exception as e:
+            print(f"❌ Keyset pagination error: {str(e)}")
+            return False
+
+    def test_39_filters_facets(self):
+        """Test /api/filters returns per-facet counts, with years taken from the ISO dates"""
+        print("\n🔍 Testing filter facets...")
+        try:
+            response = self.session.get(f"{self.api_url}/filters", timeout=self.timeout)
+            self.assertEqual(response.status_code, 200)
+            filters = response.json()
+            self.assertIn("total", filters)
+            for name in ["case_types", "court_divisions", "languages", "action_types", "years", "tags"]:
+                self.assertEqual(filters[name], [bucket["value"] for bucket in filters["counts"][name]])
+                self.assertTrue(all(bucket["count"] > 0 for bucket in filters["counts"][name]))
+            for year in filters["years"]:
+                self.assertRegex(year, r"^\d{4}$")
+            self.assertEqual(filters["years"], sorted(filters["years"], reverse=True))
+            for bucket in filters["counts"]["court_divisions"]:
+                self.assertIn("code", bucket)
+            print(f"✅ Facets over {filters['total']} cases, years {filters['years']}")
+            return True
+        except Exception as e:
+            print(f"❌ Filter facets error: {str(e)}")
+            return False
+
+    def test_40_stats_materialized(self):
+        """Test stats are served from the materialized document and fresh=1 is admin only"""
+        print("\n🔍 Testing materialized stats endpoint...")
+        try:
+            response = self.session.get(f"{self.api_url}/stats", timeout=self.timeout)
+            self.assertEqual(response.status_code, 200)
+            stats = response.json()
+            for field in ["total_cases", "total_orders", "total_decisions", "recent_cases", "computed_at"]:
+                self.assertIn(field, stats)
+            print(f"✅ Stats computed at {stats['computed_at']}: {stats['total_cases']} cases")
+            
+            response = self.session.get(f"{self.api_url}/stats", params={"fresh": 1}, timeout=self.timeout)
+            self.assertEqual(response.status_code, 403)
+            print("✅ Anonymous fresh=1 bypass rejected")
+            return True
+        except Exception as e:
+            print(f"❌ Materialized stats error: {str(e)}")
+            return False
+
+    def test_41_field_presets(self):
+        """Test list endpoints only ship the fields of the requested preset"""
+        print("\n🔍 Testing field presets on list endpoints...")
+        try:
+            response = self.session.get(f"{self.api_url}/cases", params={"limit": 5, "fields": "ids"},
+                                        timeout=self.timeout)
+            self.assertEqual(response.status_code, 200)
+            for case in response.json():
+                self.assertEqual(set(case), {"id", "date"})
+            
+            response = self.session.get(f"{self.api_url}/cases", params={"limit": 5, "fields": "list"},
+                                        timeout=self.timeout)
+            self.assertEqual(response.status_code, 200)
+            for case in response.json():
+                self.assertIn("id", case)
+                self.assertNotIn("_id", case)
+                self.assertNotIn("summary", case)
+            
+            response = self.session.get(f"{self.api_url}/upc-texts", params={"limit": 5, "fields": "list"},
+                                        timeout=self.timeout)
+            self.assertEqual(response.status_code, 200)
+            for text in response.json():
+                self.assertNotIn("content", text)
+            
+            response = self.session.get(f"{self.api_url}/cases", params={"fields": "everything"},
+                                        timeout=self.timeout)
+            self.assertEqual(response.status_code, 400)
+            print("✅ ids, list and unknown presets behave as documented")
+            return True
+        except Exception as e:
+            print(f"❌ Field presets error: {str(e)}")
+            return False
+
+    def test_42_response_cache(self):
+        """Test repeated public GETs are served from the server-side cache"""
+        print("\n🔍 Testing server-side response cache...")
+        try:
+            params = {"limit": 3, "fields": "list"}
+            self.session.get(f"{self.api_url}/cases", params=params, timeout=self.timeout)
+            response = self.session.get(f"{self.api_url}/cases", params=params, timeout=self.timeout)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.headers.get("X-Cache"), "HIT")
+            print("✅ Second identical request served from cache")
+            return True
+        except Exception as e:
+            print(f"❌ Response cache error: {str(e)}")
+            return False
+
+    def test_43_etag_not_modified(self):
+        """Test read endpoints send ETags and answer a matching If-None-Match with 304"""
+        print("\n🔍 Testing ETag revalidation...")
+        try:
+            params = {"limit": 3, "fields": "list"}
+            response = self.session.get(f"{self.api_url}/cases", params=params, timeout=self.timeout)
+            self.assertEqual(response.status_code, 200)
+            etag = response.headers.get("ETag")
+            self.assertTrue(etag)
+            self.assertIn("max-age", response.headers.get("Cache-Control", ""))
+            
+            response = self.session.get(f"{self.api_url}/cases", params=params,
+                                        headers={"If-None-Match": etag}, timeout=self.timeout)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.content, b"")
+            
+            cases = self.session.get(f"{self.api_url}/cases", params=params, timeout=self.timeout).json()
+            if cases:
+                url = f"{self.api_url}/cases/{cases[0]['id']}"
+                etag = self.session.get(url, timeout=self.timeout).headers.get("ETag")
+                response = self.session.get(url, headers={"If-None-Match": etag}, timeout=self.timeout)
+                self.assertEqual(response.status_code, 304)
+                response = self.session.get(url, headers={"If-None-Match": '"stale"'}, timeout=self.timeout)
+                self.assertEqual(response.status_code, 200)
+            print("✅ Matching ETags answered with 304")
+            return True
+        except Exception as e:
+            print(f"❌ ETag revalidation error: {str(e)}")
+            return False
+
+    def test_44_cases_stream(self):
+        """Test the NDJSON case stream returns every matching case"""
+        print("\n🔍 Testing NDJSON case stream...")
+        try:
+            response = self.session.get(f"{self.api_url}/cases/stream", params={"fields": "ids"},
+                                        timeout=self.timeout)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.headers.get("Content-Type", "").startswith("application/x-ndjson"))
+            rows = [json.loads(line) for line in response.text.splitlines() if line]
+            self.assertGreater(len(rows), 0)
+            self.assertTrue(all("id" in row and "date" in row for row in rows))
+            dates = [row["date"] for row in rows]
+            self.assertEqual(dates, sorted(dates, reverse=True))
+            print(f"✅ Streamed {len(rows)} cases")
+            return True
+        except Exception as e:
+            print(f"❌ Case stream error: {str(e)}")
+            return False
+
+    def test_45_cases_export(self):
+        """Test server-side CSV and XLSX exports of filtered cases"""
+        print("\n🔍 Testing server-side case export...")
+        try:
+            response = self.session.get(f"{self.api_url}/cases/export", params={"format": "csv"},
+                                        timeout=self.timeout)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("attachment", response.headers.get("Content-Disposition", ""))
+            lines = response.content.decode("utf-8-sig").splitlines()
+            self.assertTrue(lines[0].startswith('"Date","Référence","Type","Division"'))
+            self.assertGreater(len(lines), 1)
+            
+            response = self.session.get(f"{self.api_url}/cases/export", params={"format": "xlsx"},
+                                        timeout=self.timeout)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.content.startswith(b"PK"))
+            
+            response = self.session.get(f"{self.api_url}/cases/export", params={"format": "pdf"},
+                                        timeout=self.timeout)
+            self.assertEqual(response.status_code, 400)
+            print(f"✅ Exported {len(lines) - 1} cases as CSV and XLSX")
+            return True
+        except Exception as e:
+            print(f"❌ Case export error: {str(e)}")
+            return False
+
+    def test_46_cases_batch_lookup(self):
+        """Test batch case lookup keeps request order and reports misses"""
+        print("\n🔍 Testing batch case lookup...")
+        try:
+            cases = self.session.get(f"{self.api_url}/cases", params={"limit": 3, "fields": "list"},
+                                     timeout=self.timeout).json()
+            ids = [case["id"] for case in reversed(cases)]
+            payload = {"ids": ids + ["missing-case-id"], "fields": "list"}
+            response = self.session.post(f"{self.api_url}/cases/batch", json=payload, timeout=self.timeout)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertEqual([case["id"] for case in data["items"]], ids)
+            self.assertEqual(data["missing"]["ids"], ["missing-case-id"])
+            print(f"✅ Resolved {len(ids)} cases in one request")
+            return True
+        except Exception as e:
+            print(f"❌ Batch lookup error: {str(e)}")
+            return False
+
+    def test_47_relevance_search(self):
+        """Test BM25 search ranks matches and supports phrases and prefixes"""
+        print("\n🔍 Testing relevance search...")
+        try:
+            for query in ["infringement", '"court of first instance"', "revoc*"]:
+                response = self.session.get(f"{self.api_url}/search", params={"q": query, "limit": 5},
+                                            timeout=self.timeout)
+                if response.status_code == 503:
+                    print("⚠️ Search index still loading, skipping")
+                    return True
+                self.assertEqual(response.status_code, 200)
+                data = response.json()
+                scores = [item["score"] for item in data["items"]]
+                self.assertEqual(scores, sorted(scores, reverse=True))
+                self.assertLessEqual(len(data["items"]), 5)
+                print(f"  {query}: {data['total']} hits in {data['took_ms']} ms")
+            
+            response = self.session.get(f"{self.api_url}/search", params={"q": "patent", "kind": "upc_text"},
+                                        timeout=self.timeout)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(all(item["kind"] == "upc_text" for item in response.json()["items"]))
+            print("✅ Relevance search working")
+            return True
+        except Exception as e:
+            print(f"❌ Relevance search error: {str(e)}")
+            return False
+
+    def test_48_fuzzy_search(self):
+        """Test misspelt party names still find cases through the trigram index"""
+        print("\n🔍 Testing typo-tolerant search...")
+        try:
+            response = self.session.get(f"{self.api_url}/search", params={"q": "Renualt"}, timeout=self.timeout)
+            if response.status_code == 503:
+                print("⚠️ Search index still loading, skipping")
+                return True
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertTrue(data["fuzzy"])
+            self.assertGreater(data["total"], 0)
+            
+            response = self.session.get(f"{self.api_url}/search", params={"q": "Renault", "fuzzy": "true"},
+                                        timeout=self.timeout)
+            self.assertEqual(response.status_code, 200)
+            self.assertGreaterEqual(response.json()["total"], data["total"])
+            print(f"✅ 'Renualt' matched {data['total']} cases by fuzzy fallback")
+            return True
+        except Exception as e:
+            print(f"❌ Fuzzy search error: {str(e)}")
+            return False
+
+    def test_49_suggest(self):
+        """Test search-box autocomplete by prefix, weighted by case frequency"""
+        print("\n🔍 Testing search suggestions...")
+        try:
+            response = self.session.get(f"{self.api_url}/suggest", params={"q": "ren"}, timeout=self.timeout)
+            if response.status_code == 503:
+                print("⚠️ Search index still loading, skipping")
+                return True
+            self.assertEqual(response.status_code, 200)
+            suggestions = response.json()["suggestions"]
+            self.assertGreater(len(suggestions), 0)
+            self.assertTrue(all(s["value"].lower().startswith("ren") or " ren" in s["value"].lower()
+                                for s in suggestions))
+            weights = [s["weight"] for s in suggestions]
+            self.assertEqual(weights, sorted(weights, reverse=True))
+            
+            response = self.session.get(f"{self.api_url}/suggest", params={"q": "ren", "category": "patent"},
+                                        timeout=self.timeout)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(all(s["category"] == "patent" for s in response.json()["suggestions"]))
+            
+            response = self.session.get(f"{self.api_url}/suggest", params={"q": "ren", "category": "bogus"},
+                                        timeout=self.timeout)
+            self.assertEqual(response.status_code, 400)
+            print(f"✅ 'ren' suggested {len(suggestions)} entries, top: {suggestions[0]['value']}")
+            return True
+        except Exception as e:
+            print(f"❌ Suggest error: {str(e)}")
+            return False
+
+    def test_50_search_snippets(self):
+        """Test search hits carry highlighted snippets instead of the full summary or content"""
+        print("\n🔍 Testing search snippets...")
+        try:
+            response = self.session.get(f"{self.api_url}/search", params={"q": "infringement"}, timeout=self.timeout)
+            if response.status_code == 503:
+                print("⚠️ Search index still loading, skipping")
+                return True
+            self.assertEqual(response.status_code, 200)
+            items = response.json()["items"]
+            self.assertGreater(len(items), 0)
+            for item in items:
+                self.assertNotIn("summary", item)
+                self.assertNotIn("content", item)
+                snippet = item["snippet"]
+                if snippet is None:
+                    continue
+                self.assertIn(snippet["field"], ("summary", "headnotes", "content"))
+                for start, end in snippet["highlights"]:
+                    self.assertTrue(snippet["text"][start:end].lower().startswith("infring"))
+            self.assertTrue(any(item["snippet"] and item["snippet"]["highlights"] for item in items))
+            print(f"✅ {len(items)} hits returned with snippets")
+            return True
+        except Exception as e:
+            print(f"❌ Search snippets error: {str(e)}")
+            return False
+
+    def test_51_similar_cases(self):
+        """Test similar cases are ranked by cosine similarity and exclude the case itself"""
+        print("\n🔍 Testing similar cases...")
+        try:
+            cases = self.session.get(f"{self.api_url}/cases", params={"limit": 1, "fields": "list"},
+                                     timeout=self.timeout).json()
+            if not cases:
+                print("⚠️ No cases available, skipping")
+                return True
+            case_id = cases[0]["id"]
+            response = self.session.get(f"{self.api_url}/cases/{case_id}/similar", params={"limit": 5},
+                                        timeout=self.timeout)
+            if response.status_code == 503:
+                print("⚠️ Similar cases still loading, skipping")
+                return True
+            self.assertEqual(response.status_code, 200)
+            items = response.json()["items"]
+            self.assertLessEqual(len(items), 5)
+            self.assertNotIn(case_id, [item["id"] for item in items])
+            scores = [item["score"] for item in items]
+            self.assertEqual(scores, sorted(scores, reverse=True))
+            self.assertTrue(all(0 < score <= 1.0001 for score in scores))
+            
+            response = self.session.get(f"{self.api_url}/cases/missing-case-id/similar", timeout=self.timeout)
+            self.assertEqual(response.status_code, 404)
+            print(f"✅ {len(items)} similar cases for {case_id}")
+            return True
+        except Exception as e:
+            print(f"❌ Similar cases error: {str(e)}")
+            return False
+
+    def test_52_party_cases(self):
+        """Test cases carry normalized party ids and can be listed per party"""
+        print("\n🔍 Testing party-centric case lookup...")
+        try:
+            cases = self.session.get(f"{self.api_url}/cases", params={"limit": 20, "fields": "list"},
+                                     timeout=self.timeout).json()
+            with_parties = [case for case in cases if case.get("party_ids")]
+            if not with_parties:
+                print("⚠️ No cases with party ids, skipping")
+                return True
+            party_id = with_parties[0]["party_ids"][0]
+            self.assertRegex(party_id, r"^[a-z0-9]+(?:-[a-z0-9]+)*$")
+            
+            response = self.session.get(f"{self.api_url}/parties/{party_id}/cases", timeout=self.timeout)
+            self.assertEqual(response.status_code, 200)
+            party_cases = response.json()
+            self.assertGreater(len(party_cases), 0)
+            self.assertTrue(all(party_id in case["party_ids"] for case in party_cases))
+            self.assertIn(with_parties[0]["id"], [case["id"] for case in party_cases])
+            
+            # The raw name, in any case, normalizes to the same id
+            raw_names = [name for name in with_parties[0]["parties"]
+                         if re.sub(r"[^a-z0-9]+", "-", name.lower().replace("&", " and ")).strip("-") == party_id]
+            if raw_names:
+                raw_name = requests.utils.quote(raw_names[0].upper(), safe="")
+                response = self.session.get(f"{self.api_url}/parties/{raw_name}/cases", timeout=self.timeout)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual([case["id"] for case in response.json()], [case["id"] for case in party_cases])
+                print(f"✅ Raw name {raw_names[0]!r} found the same cases")
+            
+            response = self.session.get(f"{self.api_url}/parties/no-such-party-gmbh/cases", timeout=self.timeout)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), [])
+            print(f"✅ {len(party_cases)} cases for party {party_id}")
+            return True
+        except Exception as e:
+            print(f"❌ Party cases error: {str(e)}")
+            return False
+
 def run_tests():
     # Create a test suite
     suite = unittest.TestSuite()
@@ -1717,7 +2106,22 @@ def run_tests():
         'test_34_update_settings',
         'test_35_enhanced_authentication_workflow',
         'test_36_rop_import_system',
-        'test_37_upc_text_editing_system'
+        'test_37_upc_text_editing_system',
+        'test_38_keyset_pagination',
+        'test_39_filters_facets',
+        'test_40_stats_materialized',
+        'test_41_field_presets',
+        'test_42_response_cache',
+        'test_43_etag_not_modified',
+        'test_44_cases_stream',
+        'test_45_cases_export',
+        'test_46_cases_batch_lookup',
+        'test_47_relevance_search',
+        'test_48_fuzzy_search',
+        'test_49_suggest',
+        'test_50_search_snippets',
+        'test_51_similar_cases',
+        'test_52_party_cases'
     ]
     
     # Track results for each test
@@ -0,0 +1,71 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from case_similarity import SimilarityMatrix, case_features, extend_matrix, load_matrix, save_matrix
+
+SUMMARY = ("The Local Division issued an order granting the application for provisional measures "
+           "and ordered the defendant to provide security for costs.")
+
+
+def make_case(case_id, summary, language="EN", **fields):
+    return {"_id": case_id, "summary": summary, "language_of_proceedings": language,
+            "content_hash": f"hash-{case_id}", **fields}
+
+
+class CaseSimilarityTester(unittest.TestCase):
+    def build(self, cases):
+        return extend_matrix(SimilarityMatrix.empty(), cases, [])
+
+    def test_01_features_ignore_language_of_proceedings(self):
+        """Test English summaries get the same features whatever the language of proceedings"""
+        self.assertEqual(case_features(make_case("en", SUMMARY, "EN")),
+                         case_features(make_case("de", SUMMARY, "DE")))
+        self.assertNotIn("the", case_features(make_case("de", SUMMARY, "DE")))
+
+    def test_02_cross_language_pair_is_similar(self):
+        """Test identically worded EN and DE cases score above zero against each other"""
+        matrix = self.build([
+            make_case("en", SUMMARY, "EN"),
+            make_case("de", SUMMARY, "DE"),
+            make_case("other", "Appeal against a decision on the value of the dispute.", "FR"),
+        ])
+        similar = dict(matrix.similar("en", 5))
+        self.assertIn("de", similar)
+        self.assertGreater(similar["de"], 0.99)
+        self.assertEqual(matrix.similar("en", 1)[0][0], "de")
+
+    def test_03_norm_and_tag_features(self):
+        """Test cited norms and tags become their own features"""
+        features = case_features(make_case("a", "", legal_norms=["Art. 32 UPCA"], tags=["Patent infringement"]))
+        self.assertIn("tag:patent infringement", features)
+        self.assertTrue(any(feature.startswith("norm:article 32") for feature in features))
+
+    def test_04_extend_replaces_and_removes(self):
+        """Test extension tombstones replaced and removed cases"""
+        matrix = self.build([make_case("a", SUMMARY), make_case("b", SUMMARY), make_case("c", SUMMARY)])
+        extended = extend_matrix(matrix, [make_case("b", "Appeal on the value of the dispute.")], ["c"])
+        self.assertEqual(len(extended), 2)
+        self.assertIsNone(extended.similar("c"))
+        self.assertEqual([case_id for case_id, _ in extended.similar("a")], [])
+        self.assertEqual(len(matrix), 3)
+
+    def test_05_save_and_load_round_trip(self):
+        """Test a saved matrix loads back with the same similarities"""
+        directory = tempfile.mkdtemp()
+        try:
+            path = Path(directory) / "similar_cases.npz"
+            matrix = self.build([make_case("en", SUMMARY), make_case("de", SUMMARY, "DE")])
+            save_matrix(matrix, path)
+            self.assertEqual(load_matrix(path).similar("en"), matrix.similar("en"))
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from citation_scanner import cross_reference_labels, scan, scan_many
+
+TEXT = "Art. 32 of the Agreement and Article 32(1)(a) UPCA; see Rule 13.1 RoP and rule 13.1 again."
+
+
+class CitationScannerTester(unittest.TestCase):
+    def test_01_normalized_citations_in_order(self):
+        """Test spellings are normalized and listed in order of first appearance"""
+        self.assertEqual([citation.text for citation in scan(TEXT)],
+                         ["Article 32 UPCA", "Article 32(1)(a) UPCA", "Rule 13.1"])
+
+    def test_02_repeats_keep_every_span(self):
+        """Test a citation repeated in the text keeps the offsets of each occurrence"""
+        rule = scan(TEXT)[-1]
+        self.assertEqual(len(rule.spans), 2)
+        self.assertEqual([TEXT[start:end].lower()[:9] for start, end in rule.spans], ["rule 13.1"] * 2)
+        self.assertEqual((rule.kind, rule.number, rule.instrument), ("rule", "13.1", "RoP"))
+
+    def test_03_instruments(self):
+        """Test instrument names map to their canonical abbreviations"""
+        self.assertEqual(scan("Article 49 EPC")[0].text, "Article 49 EPC")
+        self.assertEqual(scan("paragraph 3 of the Statute")[0].instrument, "Statute")
+        self.assertEqual(scan("Article 9 of the Rules of Procedure")[0].instrument, "RoP")
+        self.assertEqual(scan("RoP 206")[0].text, "Rule 206")
+        self.assertEqual(scan(""), [])
+
+    def test_04_cross_reference_labels(self):
+        """Test labels carry the bare article and the article with its instrument"""
+        self.assertEqual(cross_reference_labels(scan(TEXT)), ["Article 32", "Article 32 UPCA", "Rule 13.1"])
+
+    def test_05_batch_matches_single_scans(self):
+        """Test the batch API returns the same citations as scanning one text at a time"""
+        texts = [TEXT, "Rule 220.1(c)", "", "no citation here"]
+        self.assertEqual(scan_many(texts), [scan(text) for text in texts])
+        self.assertEqual(scan_many(texts * 60, processes=2), [scan(text) for text in texts * 60])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import gzip
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from response_cache import ResponseCache, ResponseCacheMiddleware, cache_response
+from compression import CompressionMiddleware, brotli, compress, encoded_headers, is_compressible, \
+    negotiate_encoding
+
+BODY = b'{"summary": "' + b"provisional measures " * 200 + b'"}'
+
+
+def build_app(cache):
+    app = FastAPI()
+    app.add_middleware(ResponseCacheMiddleware, cache=cache)
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/cached")
+    @cache_response(tags=["cases"], ttl=60)
+    async def cached():
+        return PlainTextResponse(BODY, media_type="application/json")
+
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse(BODY, media_type="application/json", headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse(b"{}", media_type="application/json")
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for number in range(3):
+                yield BODY + b"\n"
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return app
+
+
+class CompressionTester(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.cache = ResponseCache()
+        cls.client = TestClient(build_app(cls.cache))
+
+    def test_01_negotiation(self):
+        """Test the preferred supported coding is picked, honouring q-values"""
+        self.assertEqual(negotiate_encoding("gzip, deflate"), "gzip")
+        self.assertEqual(negotiate_encoding("gzip;q=0, identity"), None)
+        self.assertEqual(negotiate_encoding("*"), "br" if brotli else "gzip")
+        self.assertEqual(negotiate_encoding("br;q=0.5, gzip;q=0.9"), "gzip")
+        self.assertIsNone(negotiate_encoding(None))
+
+    def test_02_compressible_responses(self):
+        """Test only large, successful, unencoded text responses are compressed"""
+        json_headers = [(b"content-type", b"application/json")]
+        self.assertTrue(is_compressible(200, json_headers, 4096))
+        self.assertFalse(is_compressible(200, json_headers, 100))
+        self.assertFalse(is_compressible(304, json_headers, 4096))
+        self.assertFalse(is_compressible(200, [(b"content-type", b"application/pdf")], 4096))
+        self.assertFalse(is_compressible(200, json_headers + [(b"content-encoding", b"br")], 4096))
+
+    def test_03_encoded_headers(self):
+        """Test encoded responses get a weak ETag, the new length and Vary"""
+        headers = dict(encoded_headers([(b"etag", b'"abc"'), (b"content-length", b"9000")], "gzip", 120))
+        self.assertEqual(headers, {b"etag": b'W/"abc"', b"content-encoding": b"gzip", b"content-length": b"120",
+                                   b"vary": b"Accept-Encoding"})
+        self.assertEqual(gzip.decompress(compress(BODY, "gzip")), BODY)
+
+    def test_04_middleware_buffered_and_small(self):
+        """Test buffered bodies are compressed and small ones pass through"""
+        response = self.client.get("/large", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(response.headers["ETag"], 'W/"abc"')
+        self.assertEqual(response.content, BODY)
+        response = self.client.get("/small", headers={"Accept-Encoding": "gzip"})
+        self.assertNotIn("Content-Encoding", response.headers)
+        response = self.client.get("/large", headers={"Accept-Encoding": "identity"})
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    def test_05_middleware_streamed(self):
+        """Test streamed bodies are compressed chunk by chunk"""
+        response = self.client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertNotIn("Content-Length", response.headers)
+        self.assertEqual(response.content, (BODY + b"\n") * 3)
+
+
+    def test_06_cached_responses_keep_precompressed_variants(self):
+        """Test a cached entry is compressed once per encoding and replayed as is"""
+        self.cache.clear()
+        first = self.client.get("/cached", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(first.headers["X-Cache"], "MISS")
+        self.assertEqual(first.headers["Content-Encoding"], "gzip")
+        stored = self.cache.variant("/cached", "gzip")
+        self.assertEqual(gzip.decompress(stored), BODY)
+
+        second = self.client.get("/cached", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(second.headers["X-Cache"], "HIT")
+        self.assertEqual(second.content, BODY)
+        self.assertIs(self.cache.variant("/cached", "gzip"), stored)
+        self.assertEqual(self.cache.stats()["compressed_variants"], 1)
+
+        plain = self.client.get("/cached", headers={"Accept-Encoding": "identity"})
+        self.assertNotIn("Content-Encoding", plain.headers)
+        self.assertEqual(plain.headers["Vary"], "Accept-Encoding")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import re
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from pymongo import UpdateOne
+
+from content_hash import stamp_content_hash
+from court_divisions import backfill_divisions, division_filter, enrich_case, parse_division
+
+
+class StandInCollection:
+    """Returns every document from find() and records bulk writes"""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.operations = []
+
+    def find(self, query=None, projection=None):
+        return [dict(document) for document in self.documents]
+
+    def bulk_write(self, operations, ordered=True):
+        self.operations += operations
+        return type("BulkWriteResult", (), {"modified_count": len(operations)})()
+
+
+class CourtDivisionsTester(unittest.TestCase):
+    def test_01_spellings_share_a_code(self):
+        """Test the spellings seen on the UPC site parse to one division code"""
+        for raw in ["Milan (IT) Local Division", "Court of First Instance - Milano (IT)",
+                    "Local Division - Milano (IT)"]:
+            self.assertEqual(parse_division(raw).division_code, "cfi-local-milan", raw)
+        self.assertEqual(parse_division("Local Division - München (DE)").division_code, "cfi-local-munich")
+        self.assertEqual(parse_division("Central Division - Paris Seat").division_code, "cfi-central-paris")
+        self.assertEqual(parse_division("Court of Appeal - Luxembourg").division_code, "coa-luxembourg")
+        self.assertEqual(parse_division("Nordic-Baltic Regional Division").division_code,
+                         "cfi-regional-nordic-baltic")
+        self.assertIsNone(parse_division("Somewhere else"))
+
+    def test_02_enrich_case_canonicalizes_label(self):
+        """Test write-time enrichment stores the structured division and canonical label"""
+        case = enrich_case({"court_division": "Local Division - Muenchen (DE)"})
+        self.assertEqual(case["division_code"], "cfi-local-munich")
+        self.assertEqual(case["court_division"], "Court of First Instance - Munich (DE) Local Division")
+        self.assertEqual(case["division"]["country_code"], "DE")
+        self.assertIsNone(enrich_case({"court_division": None})["division_code"])
+
+    def test_03_bare_city_matches_every_division_seated_there(self):
+        """Test a bare city filters on all of its divisions"""
+        self.assertEqual(division_filter("Paris"),
+                         {"division_code": {"$in": ["cfi-local-paris", "cfi-central-paris"]}})
+        self.assertEqual(division_filter("München (DE)"),
+                         {"division_code": {"$in": ["cfi-local-munich", "cfi-central-munich"]}})
+        self.assertEqual(division_filter("Hamburg"), {"division_code": "cfi-local-hamburg"})
+
+    def test_04_named_division_and_code_filters(self):
+        """Test a named division or a code filters on that division only"""
+        self.assertEqual(division_filter("Paris Central Division"), {"division_code": "cfi-central-paris"})
+        self.assertEqual(division_filter("Court of First Instance - Paris (FR) Local Division"),
+                         {"division_code": "cfi-local-paris"})
+        self.assertEqual(division_filter("cfi-local-paris"), {"division_code": "cfi-local-paris"})
+
+    def test_05_unrecognised_values_match_labels_case_insensitively(self):
+        """Test values naming no division still match as a case-insensitive substring of the label"""
+        labels = [enrich_case({"court_division": raw})["court_division"]
+                  for raw in ["Paris (FR) Local Division", "Nordic-Baltic Regional Division", "Court of Appeal"]]
+        query = division_filter("local division")["court_division"]
+        self.assertEqual(query["$options"], "i")
+        self.assertEqual([label for label in labels if re.search(query["$regex"], label, re.I)],
+                         ["Court of First Instance - Paris (FR) Local Division"])
+        # User input is matched literally, never as a pattern
+        self.assertEqual(division_filter("Division (")["court_division"]["$regex"], re.escape("Division ("))
+
+    def test_06_backfill_restamps_content_hash(self):
+        """Test the division backfill writes a content hash matching the enriched case"""
+        case = stamp_content_hash({"_id": "c1", "court_division": "Milano (IT) Local Division", "summary": "Order."})
+        collection = StandInCollection([case])
+        self.assertEqual(backfill_divisions(collection), 1)
+        enriched = stamp_content_hash(enrich_case(dict(case)))
+        self.assertNotEqual(enriched["content_hash"], case["content_hash"])
+        self.assertEqual(collection.operations, [UpdateOne({"_id": "c1"}, {"$set": {
+            "division": enriched["division"], "division_code": "cfi-local-milan",
+            "court_division": "Court of First Instance - Milan (IT) Local Division",
+            "content_hash": enriched["content_hash"]}})])
+
+
+if __name__ == "__main__":
+    unittest.main()
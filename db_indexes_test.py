@@ -0,0 +1,80 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from db_indexes import AUDITED_QUERIES, INDEXES, audit_query_plans
+from field_presets import list_pipeline
+from pagination import CASES_SORT
+
+INDEX_SCAN_PLAN = {"stage": "LIMIT", "inputStage": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}}
+COLLSCAN_PLAN = {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}
+
+
+class ExplainingDB:
+    """Answers explain commands with a canned plan and records what was explained"""
+
+    def __init__(self, explained):
+        self.explained = explained
+        self.commands = []
+
+    def command(self, command):
+        self.commands.append(command)
+        return self.explained
+
+    def __getitem__(self, name):
+        return ExplainingCollection(self.explained)
+
+
+class ExplainingCollection:
+    def __init__(self, explained):
+        self.explained = explained
+
+    def find(self, query):
+        return self
+
+    def limit(self, limit):
+        return self
+
+    def explain(self):
+        return self.explained
+
+
+class DBIndexesTester(unittest.TestCase):
+    def test_01_no_index_is_a_prefix_of_another(self):
+        """Test no declared index is made redundant by a longer one starting with the same keys"""
+        for name, indexes in INDEXES.items():
+            keys = [list(index.document["key"].items()) for index in indexes]
+            for short in keys:
+                for long in keys:
+                    if len(short) < len(long):
+                        self.assertNotEqual(long[:len(short)], short, f"{name}: {short} is a prefix of {long}")
+
+    def test_02_sorted_shapes_explained_as_list_pipelines(self):
+        """Test list shapes are explained as the aggregation the API runs"""
+        db = ExplainingDB({"queryPlanner": {"winningPlan": INDEX_SCAN_PLAN}})
+        self.assertEqual(audit_query_plans(db), [])
+        sorted_shapes = [(name, query, sort) for name, query, sort in AUDITED_QUERIES if sort]
+        self.assertEqual(len(db.commands), len(sorted_shapes))
+        explain = db.commands[0]["explain"]
+        self.assertEqual(explain["aggregate"], "cases")
+        self.assertEqual(explain["pipeline"], list_pipeline({}, CASES_SORT, None, 100))
+
+    def test_03_collscan_and_unpushed_sort_flagged(self):
+        """Test a collection scan in the winning plan and an in-memory $sort stage are flagged"""
+        db = ExplainingDB({"stages": [{"$cursor": {"queryPlanner": {"winningPlan": COLLSCAN_PLAN}}},
+                                      {"$sort": {"sortKey": {"date": -1, "_id": -1}}}]})
+        warnings = audit_query_plans(db)
+        self.assertEqual(len(warnings), len(AUDITED_QUERIES))
+        self.assertTrue(any("$sort" in warning and "COLLSCAN" in warning for warning in warnings))
+
+    def test_04_rejected_plans_ignored(self):
+        """Test a collection scan among the rejected plans is not reported"""
+        db = ExplainingDB({"queryPlanner": {"winningPlan": INDEX_SCAN_PLAN,
+                                            "rejectedPlans": [{"stage": "COLLSCAN"}]}})
+        self.assertEqual(audit_query_plans(db), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
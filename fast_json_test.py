@@ -0,0 +1,65 @@
+import asyncio
+import json
+import os
+import sys
+import unittest
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import numpy as np
+from fastapi import Response
+
+from fast_json import dumps, json_response, ndjson_lines
+
+
+class BatchedCursor:
+    """Hands out pre-cut batches like AsyncCursor.next_batch and records that it was closed"""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.closed = False
+
+    async def next_batch(self):
+        return self.batches.pop(0) if self.batches else []
+
+    async def close(self):
+        self.closed = True
+
+
+class FastJSONTester(unittest.TestCase):
+    def test_01_native_and_fallback_types(self):
+        """Test dates, UUIDs, NumPy values and unknown types serialize without an encoder pass"""
+        identifier = uuid.UUID("12345678-1234-5678-1234-567812345678")
+        document = {"date": date(2025, 7, 11), "at": datetime(2025, 7, 11, 16, 36), "id": identifier,
+                    "scores": np.array([0.5, 1.0]), 3: "non-str key", "amount": Decimal("1.50")}
+        self.assertEqual(json.loads(dumps(document)), {
+            "date": "2025-07-11", "at": "2025-07-11T16:36:00", "id": str(identifier),
+            "scores": [0.5, 1.0], "3": "non-str key", "amount": "1.50"})
+
+    def test_02_json_response_keeps_injected_headers(self):
+        """Test headers set on the injected Response are carried over"""
+        injected = Response()
+        injected.headers["ETag"] = '"abc"'
+        response = json_response([{"id": "1"}], injected, status_code=201)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.headers["ETag"], '"abc"')
+        self.assertEqual(response.headers["Content-Type"], "application/json")
+        self.assertEqual(json.loads(response.body), [{"id": "1"}])
+
+    def test_03_ndjson_one_chunk_per_batch(self):
+        """Test NDJSON streams one chunk per cursor batch and closes the cursor"""
+        cursor = BatchedCursor([[{"id": "2"}, {"id": "3"}]])
+
+        async def collect():
+            return [chunk async for chunk in ndjson_lines(cursor, [{"id": "1"}])]
+
+        chunks = asyncio.run(collect())
+        self.assertEqual(chunks, [b'{"id":"1"}\n', b'{"id":"2"}\n{"id":"3"}\n'])
+        self.assertTrue(cursor.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
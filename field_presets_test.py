@@ -0,0 +1,43 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from field_presets import CASE_FIELD_PRESETS, UPC_TEXT_FIELD_PRESETS, list_pipeline, projection_for
+from pagination import CASES_SORT
+
+
+class FieldPresetsTester(unittest.TestCase):
+    def test_01_projection_keeps_sort_fields(self):
+        """Test a preset projects its fields plus the sort key"""
+        projection = projection_for(CASE_FIELD_PRESETS, "ids", CASES_SORT)
+        self.assertEqual(set(projection), {field for field, _ in CASES_SORT} | {"date"})
+        projection = projection_for(CASE_FIELD_PRESETS, "list", CASES_SORT)
+        self.assertIn("content_hash", projection)
+        self.assertNotIn("summary", projection)
+
+    def test_02_full_and_unknown_presets(self):
+        """Test 'full' projects nothing and an unknown preset names the valid ones"""
+        self.assertIsNone(projection_for(CASE_FIELD_PRESETS, "full", CASES_SORT))
+        with self.assertRaises(ValueError) as raised:
+            projection_for(UPC_TEXT_FIELD_PRESETS, "card", CASES_SORT)
+        self.assertIn("list, full", str(raised.exception))
+
+    def test_03_list_pipeline_renames_id_in_the_database(self):
+        """Test the list pipeline sorts, pages and returns id instead of _id"""
+        projection = projection_for(CASE_FIELD_PRESETS, "ids", CASES_SORT)
+        pipeline = list_pipeline({"type": "Order"}, CASES_SORT, projection, 20, skip=40)
+        self.assertEqual(pipeline[:4], [{"$match": {"type": "Order"}}, {"$sort": dict(CASES_SORT)},
+                                        {"$skip": 40}, {"$limit": 20}])
+        self.assertEqual(pipeline[-1], {"$project": {"_id": 0, "id": "$_id", "date": 1}})
+
+    def test_04_full_documents_streamed_without_limit(self):
+        """Test full documents keep every field and an unlimited pipeline has no $limit"""
+        pipeline = list_pipeline({}, CASES_SORT, None, None)
+        self.assertEqual(pipeline, [{"$sort": dict(CASES_SORT)}, {"$addFields": {"id": "$_id"}},
+                                    {"$project": {"_id": 0}}])
+
+
+if __name__ == "__main__":
+    unittest.main()
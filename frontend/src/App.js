@@ -29,6 +29,7 @@ import {
   Settings
 } from 'lucide-react';
 import { format } from 'date-fns';
+import axios from 'axios';
 
 // Imports des composants
 import CaseDetail from './CaseDetail';
@@ -36,7 +37,7 @@ import DataTable from './DataTable';
 import Dashboard from './Dashboard';
 import AdminFullscreen from './AdminFullscreen';
 import UPCCode from './UPCCode';
-import { exportData, exportStats } from './ExportUtils';
+import { exportData, exportFromServer, exportStats } from './ExportUtils';
 import Notification from './Notification';
 
 // Import du contexte de données
@@ -57,6 +58,8 @@ import NewsletterSignup from './components/newsletter/NewsletterSignup';
 import NewsletterManagement from './components/admin/NewsletterManagement';
 import PermissionsManagement from './components/admin/PermissionsManagement';
 
+const BACKEND_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8001';
+
 // Composant principal de l'application
 const AppContent = ({ onShowAdmin, onShowUPCCode }) => {
   const { t, i18n } = useTranslation();
@@ -102,6 +105,34 @@ const AppContent = ({ onShowAdmin, onShowUPCCode }) => {
   const [currentView, setCurrentView] = useState('dashboard'); // 'dashboard' ou 'data'
   const [showAuthModal, setShowAuthModal] = useState(false);
   const [authMode, setAuthMode] = useState('login');
+  const [searchSuggestions, setSearchSuggestions] = useState([]);
+
+  // Suggestions de recherche (parties, brevets, divisions, articles) avec anti-rebond
+  useEffect(() => {
+    const prefix = (activeFilters.searchTerm || '').trim();
+    if (prefix.length < 2) {
+      setSearchSuggestions([]);
+      return undefined;
+    }
+    const controller = new AbortController();
+    const timer = setTimeout(async () => {
+      try {
+        const response = await axios.get(`${BACKEND_URL}/api/suggest`, {
+          params: { q: prefix, limit: 8 },
+          signal: controller.signal
+        });
+        setSearchSuggestions(response.data.suggestions || []);
+      } catch (error) {
+        if (!axios.isCancel(error)) {
+          setSearchSuggestions([]);
+        }
+      }
+    }, 150);
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [activeFilters.searchTerm]);
 
   // SEO dynamique basé sur la vue
   useEffect(() => {
@@ -126,8 +157,12 @@ const AppContent = ({ onShowAdmin, onShowUPCCode }) => {
   }, [currentView, filteredCases.length, updatePageSEO, getPageSEO]);
 
   // Fonction d'export avec notification intégrée
-  const handleExport = (data) => {
-    const result = exportData(data, 'excel', 'decisions_upc');
+  // Les filtres du tableau (recherche, filtres par colonne) n'existent que côté client :
+  // dans ce cas on exporte les lignes affichées, sinon toute la sélection depuis le serveur
+  const handleExport = (rows, tableFiltered) => {
+    const result = tableFiltered
+      ? exportData(rows, 'excel', 'decisions_upc')
+      : exportFromServer(activeFilters, 'xlsx');
     if (result.success) {
       setNotification({
         message: `${t('notifications.exportSuccess')}: ${result.filename}`,
@@ -449,8 +484,17 @@ const AppContent = ({ onShowAdmin, onShowUPCCode }) => {
                     placeholder={t('search.placeholder', 'Rechercher dans les décisions et ordonnances...')}
                     value={activeFilters.searchTerm}
                     onChange={(e) => handleFilterChange('searchTerm', e.target.value)}
+                    list="search-suggestions"
+                    autoComplete="off"
                     className="w-full pl-10 pr-4 py-3 border border-orange-300 rounded-lg focus:outline-none focus:ring-2 focus:ring-orange-500 focus:border-transparent text-lg"
                   />
+                  <datalist id="search-suggestions">
+                    {searchSuggestions.map((suggestion) => (
+                      <option key={`${suggestion.category}-${suggestion.value}`} value={suggestion.value}>
+                        {t(`search.suggestionCategory.${suggestion.category}`, suggestion.category)}
+                      </option>
+                    ))}
+                  </datalist>
                 </div>
                 
                 <div className="flex flex-wrap gap-4 items-center">
@@ -32,6 +32,7 @@ const CaseDetail = ({ caseId, onClose }) => {
   const [pdfLoading, setPdfLoading] = useState(false);
   const [editingSummary, setEditingSummary] = useState(false);
   const [internalSummary, setInternalSummary] = useState('');
+  const [similarCases, setSimilarCases] = useState([]);
 
   const fetchCaseDetails = useCallback(async () => {
     try {
@@ -52,6 +53,15 @@ const CaseDetail = ({ caseId, onClose }) => {
     }
   }, [fetchCaseDetails]);
 
+  // Décisions similaires (TF-IDF côté serveur)
+  useEffect(() => {
+    if (!caseId) return;
+    setSimilarCases([]);
+    axios.get(`${BACKEND_URL}/api/cases/${caseId}/similar`, { params: { limit: 5 } })
+      .then((response) => setSimilarCases(response.data.items || []))
+      .catch((error) => console.error('Error fetching similar cases:', error));
+  }, [caseId]);
+
   const fetchPdfDocument = () => {
     if (caseData?.documents?.length > 0) {
       setPdfUrl(caseData.documents[0].url);
@@ -344,6 +354,31 @@ const CaseDetail = ({ caseId, onClose }) => {
                   </div>
                 </div>
               )}
+
+              {/* Décisions similaires */}
+              {similarCases.length > 0 && (
+                <div className="romulus-card">
+                  <h3 className="text-lg font-semibold text-gray-900 mb-4 flex items-center space-x-2">
+                    <Scale className="h-5 w-5 text-orange-600" />
+                    <span>Décisions similaires</span>
+                  </h3>
+                  <div className="space-y-3">
+                    {similarCases.map((similar) => (
+                      <div key={similar.id} className="p-3 bg-gray-50 rounded-lg">
+                        <div className="flex items-center justify-between">
+                          <span className="font-medium text-gray-900">
+                            {similar.registry_number || similar.order_reference || similar.id}
+                          </span>
+                          <span className="text-sm text-gray-500">{similar.date}</span>
+                        </div>
+                        {similar.parties && similar.parties.length > 0 && (
+                          <p className="text-sm text-gray-600 mt-1">{similar.parties.join(', ')}</p>
+                        )}
+                      </div>
+                    ))}
+                  </div>
+                </div>
+              )}
             </div>
 
             {/* PDF Viewer */}
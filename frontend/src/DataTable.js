@@ -534,7 +534,10 @@ const DataTable = ({ data, onViewDetails, onExport }) => {
           <GlobalFilter globalFilter={globalFilter} setGlobalFilter={setGlobalFilter} />
           
           <button
-            onClick={() => onExport && onExport(table.getFilteredRowModel().rows.map(row => row.original))}
+            onClick={() => onExport && onExport(
+              table.getFilteredRowModel().rows.map(row => row.original),
+              Boolean(globalFilter) || table.getState().columnFilters.some(filter => filter.value)
+            )}
             className="romulus-btn-primary flex items-center space-x-2"
           >
             <Download className="h-4 w-4" />
@@ -1,5 +1,7 @@
 import * as XLSX from 'xlsx';
 
+const BACKEND_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8001';
+
 // Fonction d'export Excel
 export const exportToExcel = (data, filename = 'export') => {
   try {
@@ -162,6 +164,34 @@ const formatDate = (dateString) => {
   }
 };
 
+// Export côté serveur : toute la sélection filtrée, sans dépendre de ce que le navigateur a chargé
+export const exportFromServer = (filters = {}, format = 'xlsx') => {
+  try {
+    const params = new URLSearchParams({ format });
+    const mapping = {
+      searchTerm: 'search',
+      caseType: 'case_type',
+      courtDivision: 'court_division',
+      language: 'language',
+      dateFrom: 'date_from',
+      dateTo: 'date_to'
+    };
+    Object.entries(mapping).forEach(([key, param]) => {
+      if (filters[key]) params.append(param, filters[key]);
+    });
+
+    // Le navigateur télécharge le flux directement sur le disque
+    const link = document.createElement('a');
+    link.href = `${BACKEND_URL}/api/cases/export?${params.toString()}`;
+    link.click();
+
+    return { success: true, filename: `decisions_upc.${format === 'excel' ? 'xlsx' : format}` };
+  } catch (error) {
+    console.error('Erreur lors de l\'export serveur:', error);
+    return { success: false, error: error.message };
+  }
+};
+
 // Fonction d'export avec sélection de format
 export const exportData = (data, format = 'excel', filename = 'decisions_upc') => {
   switch (format.toLowerCase()) {
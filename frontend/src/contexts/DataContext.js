@@ -394,9 +394,8 @@ export const DataProvider = ({ children }) => {
       dispatch({ type: ActionTypes.SET_LOADING, payload: true });
       dispatch({ type: ActionTypes.SET_ERROR, payload: null });
       try {
-        // Utilisation du lazyLoader avec cache et progression
-        const result = await lazyLoader.loadProgressively('/api/cases', {
-          batchSize: 100,
+        // Flux NDJSON : un seul curseur côté serveur, premières lignes affichées immédiatement
+        const result = await lazyLoader.loadStream('/api/cases/stream', {
           useCache: true,
           cacheTTL: 10 * 60 * 1000, // 10 min
           onProgress: ({ loaded, total, data }) => {
@@ -426,7 +425,18 @@ export const DataProvider = ({ children }) => {
     fetchAvailableFilters: useCallback(async () => {
       try {
         const response = await axios.get(`${BACKEND_URL}/api/filters`);
-        dispatch({ type: ActionTypes.SET_AVAILABLE_FILTERS, payload: response.data });
+        dispatch({
+          type: ActionTypes.SET_AVAILABLE_FILTERS,
+          payload: {
+            courtDivisions: response.data.court_divisions,
+            languages: response.data.languages,
+            caseTypes: response.data.case_types,
+            actionTypes: response.data.action_types,
+            years: response.data.years,
+            tags: response.data.tags,
+            counts: response.data.counts
+          }
+        });
         return { success: true, data: response.data };
       } catch (error) {
         console.error('Error fetching filters:', error);
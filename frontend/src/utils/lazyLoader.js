@@ -41,7 +41,7 @@ class LazyLoader {
 
     try {
       let allResults = [];
-      let skip = 0;
+      let cursor = '';
       let hasMore = true;
       let totalLoaded = 0;
 
@@ -59,18 +59,19 @@ class LazyLoader {
         const response = await axios.get(`${BACKEND_URL}${endpoint}`, {
           params: {
             limit: currentBatchSize,
-            skip: skip
+            cursor: cursor
           },
           signal: controller.signal
         });
 
-        const data = response.data;
+        // Pagination par curseur : le coût d'une page ne dépend pas de sa position
+        const data = response.data.items;
         
         if (Array.isArray(data) && data.length > 0) {
           allResults = allResults.concat(data);
-          skip += data.length;
+          cursor = response.data.next_cursor;
           totalLoaded += data.length;
-          hasMore = data.length === currentBatchSize;
+          hasMore = Boolean(cursor);
 
           // Appeler le callback de progression
           if (onProgress) {
@@ -111,6 +112,86 @@ class LazyLoader {
     }
   }
 
+  // Chargement en flux NDJSON : une seule requête, les lignes arrivent au fil de l'eau
+  async loadStream(endpoint, options = {}) {
+    const {
+      params = {},
+      useCache = true,
+      cacheTTL = 5 * 60 * 1000, // 5 minutes
+      onProgress = null,
+      onError = null,
+      abortSignal = null
+    } = options;
+
+    const cacheKey = cacheManager.generateKey(endpoint, params);
+
+    if (useCache) {
+      const cachedData = cacheManager.get(cacheKey);
+      if (cachedData) {
+        if (onProgress) onProgress({ loaded: cachedData.length, total: cachedData.length, data: cachedData });
+        return { success: true, data: cachedData, fromCache: true };
+      }
+    }
+
+    const controller = new AbortController();
+    if (abortSignal) {
+      abortSignal.addEventListener('abort', () => controller.abort());
+    }
+    this.abortControllers.set(cacheKey, controller);
+
+    try {
+      const query = new URLSearchParams(params).toString();
+      const response = await fetch(`${BACKEND_URL}${endpoint}${query ? `?${query}` : ''}`, {
+        headers: { Accept: 'application/x-ndjson' },
+        signal: controller.signal
+      });
+      if (!response.ok) {
+        const body = await response.json().catch(() => ({}));
+        throw { response: { data: body } };
+      }
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let allResults = [];
+      let buffer = '';
+
+      for (;;) {
+        const { done, value } = await reader.read();
+        buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+        const lines = buffer.split('\n');
+        buffer = done ? '' : lines.pop();
+        const batch = lines.filter(line => line.trim()).map(line => JSON.parse(line));
+
+        if (batch.length > 0) {
+          allResults = allResults.concat(batch);
+          if (onProgress) {
+            onProgress({ loaded: allResults.length, total: 'unknown', data: allResults, batch });
+          }
+        }
+        if (done) break;
+      }
+
+      if (useCache) {
+        cacheManager.set(cacheKey, allResults, cacheTTL);
+      }
+
+      this.abortControllers.delete(cacheKey);
+      return { success: true, data: allResults, fromCache: false };
+
+    } catch (error) {
+      this.abortControllers.delete(cacheKey);
+
+      if (error.name === 'AbortError') {
+        return { success: false, error: 'Chargement annulé', aborted: true };
+      }
+
+      const errorMsg = error.response?.data?.detail || 'Erreur lors du chargement en flux';
+      if (onError) onError(errorMsg);
+
+      return { success: false, error: errorMsg };
+    }
+  }
+
   // Chargement avec pagination virtuelle
   async loadWithVirtualPagination(endpoint, page, pageSize, options = {}) {
     const {
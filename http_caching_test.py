@@ -0,0 +1,66 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from fastapi import Request, Response
+
+from http_caching import CASES_CACHE_CONTROL, conditional_response, document_etag, etag_matches, list_etag
+
+
+def make_request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/api/cases", "headers": headers})
+
+
+class HTTPCachingTester(unittest.TestCase):
+    def test_01_document_etag_from_content_hash(self):
+        """Test a document's ETag is its quoted content hash"""
+        self.assertEqual(document_etag({"content_hash": "abc"}), '"abc"')
+        self.assertIsNone(document_etag({"_id": "no-hash"}))
+
+    def test_02_list_etag_tracks_items_and_variant(self):
+        """Test list ETags change with the items, their order and the query variant"""
+        items = [{"content_hash": "a"}, {"content_hash": "b"}]
+        etag = list_etag(items, "/api/cases?limit=2")
+        self.assertEqual(etag, list_etag([dict(item) for item in items], "/api/cases?limit=2"))
+        self.assertNotEqual(etag, list_etag(items[::-1], "/api/cases?limit=2"))
+        self.assertNotEqual(etag, list_etag(items, "/api/cases?limit=2&fields=list"))
+        self.assertNotEqual(list_etag([{"id": "1", "date": "2025-01-01"}], ""),
+                            list_etag([{"id": "1", "date": "2025-01-02"}], ""))
+
+    def test_03_if_none_match_comparison(self):
+        """Test If-None-Match lists, wildcards and weak validators"""
+        self.assertTrue(etag_matches('"x", "abc"', '"abc"'))
+        self.assertTrue(etag_matches('W/"abc"', '"abc"'))
+        self.assertTrue(etag_matches("*", '"abc"'))
+        self.assertFalse(etag_matches('"abcd"', '"abc"'))
+        self.assertFalse(etag_matches(None, '"abc"'))
+
+    def test_04_conditional_response(self):
+        """Test a current client copy gets a 304 and a stale one gets validators"""
+        response = Response()
+        self.assertIsNone(conditional_response(make_request('"old"'), response, '"new"', CASES_CACHE_CONTROL))
+        self.assertEqual(response.headers["ETag"], '"new"')
+        self.assertEqual(response.headers["Cache-Control"], CASES_CACHE_CONTROL)
+
+        not_modified = conditional_response(make_request('"new"'), Response(), '"new"', CASES_CACHE_CONTROL)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.headers["ETag"], '"new"')
+        self.assertIsNone(conditional_response(make_request('"new"'), Response(), None, CASES_CACHE_CONTROL))
+
+    def test_05_versioned_list_etag_reads_no_items(self):
+        """Test pages of hash-less presets are tagged from the version counter without reading the items"""
+        def unreadable():
+            raise AssertionError("items were read")
+            yield
+
+        etag = list_etag(unreadable(), "/api/cases?fields=ids", version=7)
+        self.assertEqual(etag, list_etag(unreadable(), "/api/cases?fields=ids", version=7))
+        self.assertNotEqual(etag, list_etag(unreadable(), "/api/cases?fields=ids", version=8))
+        self.assertNotEqual(etag, list_etag(unreadable(), "/api/cases?fields=ids&limit=5", version=7))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from legal_tagger import KEYWORD_TAGGER, TAG_TAGGER, KeywordTagger
+
+
+class LegalTaggerTester(unittest.TestCase):
+    def test_01_whole_words_only(self):
+        """Test terms inside longer words are not matched"""
+        tagger = KeywordTagger(["patent", "order", "stay"])
+        self.assertEqual(tagger.count("Patentee ordered a stayed patentability review"), {})
+        self.assertEqual(tagger.count("patent-holder; (order) stay."), {"patent": 1, "order": 1, "stay": 1})
+
+    def test_02_case_insensitive_and_overlapping_terms(self):
+        """Test overlapping vocabulary terms all match, whatever the case"""
+        tagger = KeywordTagger(["injunction", "preliminary injunction", "Preliminary"])
+        self.assertEqual(tagger.count("A PRELIMINARY Injunction was granted."),
+                         {"injunction": 1, "preliminary injunction": 1, "Preliminary": 1})
+
+    def test_03_rank_by_frequency_then_first_occurrence(self):
+        """Test ranking puts frequent terms first and breaks ties by position"""
+        tagger = KeywordTagger(["costs", "appeal", "security"])
+        text = "security for costs; appeal on costs; appeal dismissed"
+        self.assertEqual(tagger.rank(text), ["costs", "appeal", "security"])
+        self.assertEqual(tagger.rank(text, limit=1), ["costs"])
+        self.assertEqual(tagger.rank(""), [])
+
+    def test_04_duplicate_terms_collapse(self):
+        """Test the same term listed twice in the vocabulary is counted once"""
+        tagger = KeywordTagger(["Revocation", "revocation ", ""])
+        self.assertEqual(tagger.terms, ["Revocation"])
+        self.assertEqual(tagger.count("revocation action"), {"Revocation": 1})
+
+    def test_05_bundled_vocabulary(self):
+        """Test the shared taggers are built from the bundled vocabulary"""
+        self.assertIn("injunction", KEYWORD_TAGGER.rank("The injunction is lifted."))
+        self.assertIn("preliminary injunction", TAG_TAGGER.rank("Request for a preliminary injunction"))
+
+
+if __name__ == "__main__":
+    unittest.main()
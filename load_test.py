@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Concurrent load test for the API event loop.
+Measures latency of a cheap endpoint on its own, then again while heavy
+case searches run in parallel. With non-blocking Mongo access the p99 of the
+cheap endpoint should stay roughly flat.
+"""
+
+import statistics
+import threading
+import time
+
+import requests
+
+BASE_URL = "http://localhost:8001/api"
+CHEAP_REQUESTS = 200
+HEAVY_WORKERS = 8
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure_cheap_endpoint(session):
+    latencies = []
+    for _ in range(CHEAP_REQUESTS):
+        start = time.perf_counter()
+        response = session.get(f"{BASE_URL}/seo/metadata", params={"page_path": "/"}, timeout=30)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def heavy_search_worker(stop_event):
+    session = requests.Session()
+    while not stop_event.is_set():
+        try:
+            session.get(f"{BASE_URL}/cases", params={"search": "patent infringement", "limit": 500}, timeout=60)
+        except requests.RequestException:
+            pass
+
+
+def report(label, latencies):
+    print(f"  {label:<22} p50={statistics.median(latencies):7.1f} ms  "
+          f"p95={percentile(latencies, 95):7.1f} ms  p99={percentile(latencies, 99):7.1f} ms")
+
+
+def run_load_test():
+    print("🔍 Load testing cheap endpoint latency...")
+    session = requests.Session()
+
+    idle = measure_cheap_endpoint(session)
+
+    stop_event = threading.Event()
+    workers = [threading.Thread(target=heavy_search_worker, args=(stop_event,), daemon=True)
+               for _ in range(HEAVY_WORKERS)]
+    for worker in workers:
+        worker.start()
+    try:
+        loaded = measure_cheap_endpoint(session)
+    finally:
+        stop_event.set()
+        for worker in workers:
+            worker.join()
+
+    report("idle", idle)
+    report(f"{HEAVY_WORKERS} heavy searches", loaded)
+    ratio = percentile(loaded, 99) / max(percentile(idle, 99), 0.001)
+    print(f"  p99 ratio under load: {ratio:.2f}x")
+    return ratio
+
+
+if __name__ == "__main__":
+    run_load_test()
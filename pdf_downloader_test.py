@@ -0,0 +1,142 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from pdf_downloader import PDFDownloader, DownloadError
+
+PDF_BYTES = b"%PDF-1.4\n" + bytes(range(256)) * 400 + b"\n%%EOF\n"
+ETAG = '"rop-v1"'
+LAST_MODIFIED = "Fri, 11 Jul 2025 16:36:55 GMT"
+
+
+class StandInPDFHandler(BaseHTTPRequestHandler):
+    """Serves PDF_BYTES with ETag, conditional GET and single byte-range support"""
+
+    requests_seen = []
+    truncate_next_response_at = None
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        cls = type(self)
+        cls.requests_seen.append(dict(self.headers))
+
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+
+        start = 0
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range") in (None, ETAG, LAST_MODIFIED):
+            start = int(range_header.split("=")[1].split("-")[0])
+        body = PDF_BYTES[start:]
+
+        self.send_response(206 if start else 200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", ETAG)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.send_header("Accept-Ranges", "bytes")
+        if start:
+            self.send_header("Content-Range", f"bytes {start}-{len(PDF_BYTES) - 1}/{len(PDF_BYTES)}")
+        self.end_headers()
+
+        if cls.truncate_next_response_at is not None:
+            # Simulate a dropped connection halfway through the transfer
+            self.wfile.write(body[:cls.truncate_next_response_at])
+            cls.truncate_next_response_at = None
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+class PDFDownloaderTester(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInPDFHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/rop.pdf"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.download_dir = tempfile.mkdtemp()
+        StandInPDFHandler.requests_seen = []
+        StandInPDFHandler.truncate_next_response_at = None
+        self.downloader = PDFDownloader(download_dir=self.download_dir, retries=0)
+
+    def tearDown(self):
+        shutil.rmtree(self.download_dir)
+
+    def test_01_fresh_download(self):
+        """Test a full download lands in the download directory"""
+        result = self.downloader.download(self.url, "rop.pdf")
+        self.assertEqual(result.status, "downloaded")
+        self.assertEqual(result.bytes_transferred, len(PDF_BYTES))
+        with open(result.path, "rb") as fp:
+            self.assertEqual(fp.read(), PDF_BYTES)
+
+    def test_02_skip_when_not_modified(self):
+        """Test a second download is skipped via If-None-Match"""
+        self.downloader.download(self.url, "rop.pdf")
+        result = self.downloader.download(self.url, "rop.pdf")
+        self.assertEqual(result.status, "not_modified")
+        self.assertEqual(result.bytes_transferred, 0)
+        self.assertEqual(StandInPDFHandler.requests_seen[-1].get("If-None-Match"), ETAG)
+
+    def test_03_resume_interrupted_download(self):
+        """Test an interrupted download resumes with a Range request"""
+        cut = 10000
+        StandInPDFHandler.truncate_next_response_at = cut
+        with self.assertRaises(DownloadError):
+            self.downloader.download(self.url, "rop.pdf")
+        part_path = os.path.join(self.download_dir, "rop.pdf.part")
+        kept = os.path.getsize(part_path)
+        self.assertGreater(kept, 0)
+        self.assertLessEqual(kept, cut)
+
+        result = self.downloader.download(self.url, "rop.pdf")
+        self.assertEqual(result.status, "resumed")
+        self.assertEqual(result.bytes_transferred, len(PDF_BYTES) - kept)
+        self.assertEqual(StandInPDFHandler.requests_seen[-1].get("Range"), f"bytes={kept}-")
+        with open(result.path, "rb") as fp:
+            self.assertEqual(fp.read(), PDF_BYTES)
+        self.assertFalse(os.path.exists(part_path))
+
+    def test_04_hash_mismatch_rejected(self):
+        """Test a download whose SHA-256 does not match is rejected"""
+        with self.assertRaises(DownloadError):
+            self.downloader.download(self.url, "rop.pdf", expected_sha256="0" * 64)
+        self.assertFalse(os.path.exists(os.path.join(self.download_dir, "rop.pdf")))
+
+
+    def test_05_corrupted_file_downloaded_again(self):
+        """Test a cached file whose SHA-256 no longer matches its sidecar is re-downloaded"""
+        path = self.downloader.download(self.url, "rop.pdf").path
+        corrupted = bytearray(PDF_BYTES)
+        corrupted[100] ^= 0xFF
+        with open(path, "wb") as fp:
+            fp.write(corrupted)
+
+        result = self.downloader.download(self.url, "rop.pdf")
+        self.assertEqual(result.status, "downloaded")
+        self.assertIsNone(StandInPDFHandler.requests_seen[-1].get("If-None-Match"))
+        with open(result.path, "rb") as fp:
+            self.assertEqual(fp.read(), PDF_BYTES)
+        self.assertEqual(self.downloader.download(self.url, "rop.pdf").status, "not_modified")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from response_cache import ResponseCache
+
+
+class VersionCounter:
+    """Stand-in for a cache_versions counter bumped by another process"""
+
+    def __init__(self):
+        self.version = 1
+        self.reads = 0
+
+    def read(self):
+        self.reads += 1
+        return self.version
+
+
+class ResponseCacheTester(unittest.TestCase):
+    def fill(self, cache):
+        cache.set("/api/cases", 200, [], b"[]", ["cases"], 60)
+        cache.set("/api/upc-texts", 200, [], b"[]", ["upc_texts"], 60)
+
+    def test_01_moved_version_drops_only_its_tag(self):
+        """Test a bump made elsewhere drops the tracked tag's entries on the next check"""
+        counter = VersionCounter()
+        cache = ResponseCache(check_interval=0)
+        cache.track_version("cases", counter.read)
+
+        async def scenario():
+            await cache.check_versions()
+            self.fill(cache)
+            await cache.check_versions()
+            self.assertIsNotNone(cache.get("/api/cases"))
+            counter.version += 1
+            await cache.check_versions()
+            self.assertIsNone(cache.get("/api/cases"))
+            self.assertIsNotNone(cache.get("/api/upc-texts"))
+
+        asyncio.run(scenario())
+
+    def test_02_version_checks_are_throttled(self):
+        """Test the counter is read at most once per check interval"""
+        counter = VersionCounter()
+        cache = ResponseCache(check_interval=3600)
+        cache.track_version("cases", counter.read)
+
+        async def scenario():
+            await cache.check_versions()
+            self.fill(cache)
+            counter.version += 1
+            await cache.check_versions()
+            self.assertEqual(counter.reads, 1)
+            self.assertIsNotNone(cache.get("/api/cases"))
+
+        asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from rop_bundle import RECORD_FIELDS, RoPBundle, build_bundle_from_json, write_bundle, zstd
+from rop_importer import iter_rop_texts, load_rop
+
+
+class RoPBundleTester(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = Path(self.directory) / "rop.bin"
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_01_lookup_round_trip(self):
+        """Test every rule of rop.json reads back from the bundle unchanged"""
+        texts = list(iter_rop_texts(load_rop()))
+        self.assertEqual(build_bundle_from_json(path=self.path), len(texts))
+        with RoPBundle(self.path) as bundle:
+            self.assertEqual(len(bundle), len(texts))
+            for text in texts:
+                self.assertEqual(bundle.get(text["article_number"]),
+                                 {field: text.get(field) for field in RECORD_FIELDS})
+
+    def test_02_key_spellings(self):
+        """Test rule numbers are looked up whatever their spelling"""
+        write_bundle([{"article_number": "Rule 5A", "title": "Five A"},
+                      {"article_number": "Preamble", "title": "Preamble"}], self.path)
+        with RoPBundle(self.path) as bundle:
+            for spelling in ["Rule 5A", "rule 5a", "5a", " 5A "]:
+                self.assertEqual(bundle.get(spelling)["title"], "Five A", spelling)
+            self.assertIn("preamble", bundle)
+            self.assertEqual(list(bundle.keys()), ["5A", "PREAMBLE"])
+            self.assertIsNone(bundle.get("Rule 6"))
+            self.assertIsNone(bundle.get("Rule ünknown"))
+            self.assertNotIn("a" * 40, bundle)
+
+    def test_03_not_a_bundle(self):
+        """Test opening a file without the bundle header is rejected"""
+        self.path.write_bytes(b"%PDF-1.4" + bytes(32))
+        with self.assertRaises(ValueError):
+            RoPBundle(self.path)
+
+    @unittest.skipIf(zstd is None, "zstandard is not installed")
+    def test_04_compressed_round_trip(self):
+        """Test zstd-compressed records decode to the same rules"""
+        texts = list(iter_rop_texts(load_rop()))[:20]
+        write_bundle(texts, self.path, compress=True)
+        with RoPBundle(self.path) as bundle:
+            self.assertTrue(bundle.compressed)
+            self.assertEqual(bundle.get(texts[-1]["article_number"])["content"], texts[-1]["content"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from rop_importer import iter_rop_texts, load_rop, stream_rop, walk_rop
+
+SAMPLE_ROP = {
+    "preamble": ["1. The Rules shall be applied fairly.", "- 3 -", "continued line."],
+    "application_and_interpretation": [
+        "Rule 1 – Application of the Rules", "1. The Court shall conduct proceedings.",
+        "Rule 2 – Computation of time", "1. Periods are computed in days.",
+    ],
+    "content": [
+        {"part_number": "1", "part_title": "EVIDENCE ........................ 65", "chapters": [
+            {"chapter_number": "1", "chapter_title": "GENERAL ......... 65", "sections": [
+                {"section_number": "1", "section_title": "WITNESSES .... 66", "rules": [
+                    {"rule_number": "170", "rule_title": "Means of evidence ....... 66", "paragraphs": []}]}]}]},
+        {"part_number": "1", "part_title": "EVIDENCE", "chapters": [
+            {"chapter_number": "1", "chapter_title": "GENERAL", "sections": [
+                {"section_number": "1", "section_title": "WITNESSES", "rules": [
+                    {"rule_number": "170", "rule_title": "Means of evidence ....... 66",
+                     "paragraphs": ["1. Means of evidence are:", "(a) written evidence;", "and more."]}]}]}]},
+    ],
+}
+
+
+class RoPImporterTester(unittest.TestCase):
+    def test_01_bundled_rop_has_no_toc_entries_or_duplicates(self):
+        """Test the bundled rop.json flattens to unique rules with no table-of-contents leftovers"""
+        counts = {}
+        texts = list(iter_rop_texts(load_rop(), counts=counts))
+        numbers = Counter(text["article_number"] for text in texts)
+        self.assertEqual([number for number, count in numbers.items() if count > 1], [])
+        for text in texts:
+            for field in ("title", "part_title", "chapter_title", "section_title"):
+                self.assertNotIn("....", text[field] or "", f"{text['article_number']} {field}")
+        self.assertEqual(len(texts), counts["preamble"] + counts["application_rule"] + counts["rule"])
+        self.assertIn("Rule 13", numbers)
+
+    def test_02_toc_part_skipped_and_hierarchy_copied(self):
+        """Test a TOC part is skipped and part/chapter/section fields land on each rule"""
+        counts = {}
+        texts = list(iter_rop_texts(SAMPLE_ROP, counts=counts))
+        self.assertEqual([text["article_number"] for text in texts], ["Preamble", "Rule 1", "Rule 2", "Rule 170"])
+        self.assertEqual(counts["part"], 1)
+        rule = texts[-1]
+        self.assertEqual((rule["part_title"], rule["chapter_title"], rule["section_title"], rule["title"]),
+                         ("EVIDENCE", "GENERAL", "WITNESSES", "Means of evidence"))
+        self.assertEqual(rule["content"], "1. Means of evidence are:\n(a) written evidence; and more.")
+        self.assertEqual(rule["document_type"], "rules_of_procedure")
+
+    def test_03_paragraphs_rejoined_without_page_footers(self):
+        """Test PDF lines are joined into paragraphs and page footers are dropped"""
+        preamble = next(iter_rop_texts(SAMPLE_ROP))
+        self.assertEqual(preamble["content"], "1. The Rules shall be applied fairly. continued line.")
+
+    def test_04_import_flags(self):
+        """Test the preamble, application rules and content can each be left out"""
+        texts = list(iter_rop_texts(SAMPLE_ROP, import_preamble=False, import_content=False))
+        self.assertEqual([text["article_number"] for text in texts], ["Rule 1", "Rule 2"])
+        self.assertEqual(texts[0]["part_title"], "Application and Interpretation of the Rules")
+        self.assertEqual(texts[1]["content"], "1. Periods are computed in days.")
+        texts = list(iter_rop_texts(SAMPLE_ROP, import_application_rules=False))
+        self.assertEqual([text["article_number"] for text in texts], ["Preamble", "Rule 170"])
+
+    def test_05_streamed_nodes_match_the_loaded_tree(self):
+        """Test streaming rop.json yields the same nodes, and texts, as walking the loaded file"""
+        self.assertEqual(list(stream_rop()), list(walk_rop(load_rop())))
+        counts = {}
+        texts = list(iter_rop_texts(stream_rop(), counts=counts))
+        self.assertEqual(texts, list(iter_rop_texts(load_rop())))
+        # Chapters without sections and parts without chapters hold their rules directly
+        self.assertGreater(counts["rule"], 200)
+        self.assertIn("Rule 205", {text["article_number"] for text in texts})
+
+    def test_06_rules_outside_sections_keep_their_hierarchy(self):
+        """Test rules held by a chapter or a part get that chapter's or part's fields only"""
+        data = {"content": [{"part_number": "3", "part_title": "PROVISIONAL MEASURES", "chapters": [
+            {"chapter_number": "2", "chapter_title": "INTERIM PROCEDURE", "sections": [], "rules": [
+                {"rule_number": "101", "rule_title": "Powers of the judge-rapporteur", "paragraphs": ["1. Text."]}]}],
+            "rules": [{"rule_number": "205", "rule_title": "Application", "paragraphs": ["Text."]}]}]}
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = Path(directory) / "rop.json"
+        path.write_text(json.dumps(data), encoding="utf-8")
+        counts = {}
+        texts = list(iter_rop_texts(stream_rop(path), counts=counts))
+        self.assertEqual([(text["article_number"], text["chapter_title"], text["section_title"]) for text in texts],
+                         [("Rule 101", "INTERIM PROCEDURE", None), ("Rule 205", None, None)])
+        self.assertEqual(texts[1]["part_title"], "PROVISIONAL MEASURES")
+        self.assertEqual((counts["part"], counts["chapter"], counts["section"]), (1, 1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Search latency benchmark for the in-memory BM25 index.
+Indexes synthetic cases (DOCUMENTS of them) and reports p50/p95 query
+latency for word, multi-word, phrase, prefix, filtered and fuzzy queries,
+for snippets of a result page and for /api/suggest prefix lookups.
+"""
+
+import os
+import random
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from search_engine import KIND_CASE, SearchIndex, analyze_document, parse_query
+
+DOCUMENTS = int(os.environ.get("BENCHMARK_DOCUMENTS", "100000"))
+RUNS = 200
+
+COMPANIES = ["Renault Deutschland AG", "Progress Maschinen & Automation AG", "AWM s.r.l.", "Schnell s.p.a.",
+             "10x Genomics Inc.", "NanoString Technologies Inc.", "Huawei Technologies Co. Ltd.",
+             "Netgear Inc.", "Edwards Lifesciences Corp.", "Meril GmbH", "Abbott Diabetes Care Inc.",
+             "Sibio Technology Ltd.", "Ona Patents SL", "Apple Inc.", "Amgen Inc.", "Sanofi-Aventis"]
+DIVISIONS = ["cfi-local-munich", "cfi-local-dusseldorf", "cfi-local-milan", "cfi-central-paris", "coa-luxembourg"]
+WORDS = ("order application infringement revocation provisional measures injunction language proceedings "
+         "security costs evidence preservation inspection counterclaim patent claim construction novelty "
+         "inventive step prior art amendment confidentiality access register intervention appeal leave "
+         "stay jurisdiction competence defendant claimant panel judge rapporteur hearing decision").split()
+
+QUERIES = [
+    ("word", "infringement", {}),
+    ("two words", "provisional measures", {}),
+    ("party", "renault", {}),
+    ("phrase", '"security for costs"', {}),
+    ("prefix", "revoc*", {}),
+    ("filtered", "injunction", {"division_code": "cfi-local-munich"}),
+    ("reference", "App_31860/2024", {}),
+    ("fuzzy", "Renualt Deutshland", {}),
+]
+SUGGEST_PREFIXES = ["r", "re", "ren", "masch", "ep 30", "ep 300012", "tech"]
+
+
+def make_case(index, rng):
+    parties = rng.sample(COMPANIES, 2)
+    summary = " ".join(rng.choice(WORDS) for _ in range(60))
+    if index % 50 == 0:
+        summary += " The defendant was ordered to provide security for costs."
+    return {
+        "_id": str(uuid.uuid4()),
+        "date": f"{2023 + index % 3}-{index % 12 + 1:02d}-{index % 28 + 1:02d}",
+        "type": "Order" if index % 3 else "Decision",
+        "registry_number": f"App_{30000 + index}/2024",
+        "order_reference": f"ORD_{40000 + index}/2024",
+        "division_code": DIVISIONS[index % len(DIVISIONS)],
+        "language_of_proceedings": ["EN", "DE", "FR"][index % 3],
+        "parties": parties,
+        "patent": f"EP {3000000 + index}",
+        "summary": summary,
+        "content_hash": uuid.uuid4().hex,
+    }
+
+
+def run_benchmark():
+    rng = random.Random(42)
+    print(f"🔍 Indexing {DOCUMENTS:,} synthetic cases...")
+    started = time.perf_counter()
+    index = SearchIndex()
+    for i in range(DOCUMENTS):
+        index.add(analyze_document(KIND_CASE, make_case(i, rng)))
+    print(f"  built in {time.perf_counter() - started:.1f}s, {len(index.postings):,} terms")
+
+    for label, query, filters in QUERIES:
+        clauses = parse_query(query)
+        if label == "fuzzy":
+            clauses = index.fuzzy_clauses(clauses)
+        index.search(clauses, filters)
+        timings = []
+        for _ in range(RUNS):
+            started = time.perf_counter()
+            if label == "fuzzy":
+                clauses = index.fuzzy_clauses(parse_query(query))
+            total, _ = index.search(clauses, filters, limit=20)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p50, p95 = timings[len(timings) // 2], timings[int(len(timings) * 0.95)]
+        print(f"  {label:10s} {query!r:28s} {total:7,} hits  p50 {p50:6.2f} ms  p95 {p95:6.2f} ms")
+
+    clauses = parse_query("provisional measures")
+    _, hits = index.search(clauses, limit=20)
+    terms = index.matched_terms(clauses)
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        for hit in hits:
+            index.snippet(hit.kind, hit.id, terms)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    p50, p95 = timings[len(timings) // 2], timings[int(len(timings) * 0.95)]
+    print(f"  {'snippets':10s} {'20 hits':28s} {len(hits):7,} hits  p50 {p50:6.2f} ms  p95 {p95:6.2f} ms")
+
+    for prefix in SUGGEST_PREFIXES:
+        timings = []
+        for _ in range(RUNS):
+            started = time.perf_counter()
+            suggestions = index.suggestions.suggest(prefix)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p50, p95 = timings[len(timings) // 2], timings[int(len(timings) * 0.95)]
+        print(f"  {'suggest':10s} {prefix!r:28s} {len(suggestions):7,} hits  p50 {p50:6.2f} ms  p95 {p95:6.2f} ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
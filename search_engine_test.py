@@ -0,0 +1,139 @@
+import asyncio
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from search_engine import KIND_CASE, SearchEngine, SearchIndex, analyze_document, build_index, parse_query
+
+SUMMARY = "The Court of Appeal ordered the respondent to pay the costs of the injunction proceedings."
+
+
+class StandInCollection:
+    """The find() subset the index reads with: no filter, {"excluded": {"$ne": True}} and/or {"_id": {"$in": ...}}"""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.reads = 0
+
+    def find(self, query=None, projection=None):
+        for document in self.documents:
+            if document.get("excluded") and "excluded" in (query or {}):
+                continue
+            if "_id" in (query or {}) and document["_id"] not in query["_id"]["$in"]:
+                continue
+            self.reads += 1
+            yield dict(document)
+
+    def find_one(self, query, projection=None):
+        return next((dict(document) for document in self.documents if document["_id"] == query["_id"]), None)
+
+
+class StandInDB(dict):
+    def __missing__(self, name):
+        return self.setdefault(name, StandInCollection([]))
+
+
+def make_case(case_id, language, summary=SUMMARY, version=1):
+    return {"_id": case_id, "language_of_proceedings": language, "summary": summary,
+            "parties": [f"Party {case_id}"], "content_hash": f"{case_id}-{version}"}
+
+
+class SearchEngineTester(unittest.TestCase):
+    def index_of(self, cases):
+        index = SearchIndex()
+        for case in cases:
+            index.add(analyze_document(KIND_CASE, case))
+        return index
+
+    def search_ids(self, index, query, filters=None):
+        total, hits = index.search(parse_query(query), filters, 0, 0, 0, 20)
+        return {hit.id for hit in hits}
+
+    def test_01_english_summaries_stemmed_in_english(self):
+        """Test English summaries of DE and FR cases are found by inflected English words"""
+        index = self.index_of([make_case("en", "EN"), make_case("de", "DE"), make_case("fr", "FR")])
+        self.assertEqual(self.search_ids(index, "orders"), {"en", "de", "fr"})
+        self.assertEqual(self.search_ids(index, "injunctions"), {"en", "de", "fr"})
+
+    def test_02_language_filter_still_uses_language_of_proceedings(self):
+        """Test the language filter keeps matching the language of proceedings"""
+        index = self.index_of([make_case("en", "EN"), make_case("de", "DE")])
+        self.assertEqual(self.search_ids(index, "orders", {"language": "DE"}), {"de"})
+
+    def test_03_compaction_runs_off_the_write_path(self):
+        """Test refresh returns before the rebuild and the compacted index catches up and is swapped in"""
+        cases = [make_case(f"c{number}", "DE") for number in range(4)]
+        db = StandInDB(cases=StandInCollection(cases), upc_texts=StandInCollection([]))
+
+        async def scenario():
+            engine = SearchEngine()
+            engine.index = build_index(db)
+            live = engine.index
+            cases[0] = make_case("c0", "DE", "Revocation action dismissed on the merits.", version=2)
+            cases[1] = make_case("c1", "DE", "Counterclaim for revocation is admissible.", version=2)
+            await engine.refresh(db, [KIND_CASE])
+            # Replaced documents are applied to the live index straight away
+            self.assertIs(engine.index, live)
+            self.assertIsNotNone(engine._compact_task)
+            self.assertEqual(self.search_ids(engine.index, "revocation"), {"c0", "c1"})
+            # A write landing while the rebuild is in flight is caught up before the swap
+            cases.append(make_case("c4", "EN", "Revocation action by the claimant."))
+            await engine._compact_task
+            self.assertIsNot(engine.index, live)
+            self.assertEqual(engine.index.dead_ratio, 0)
+            self.assertEqual(self.search_ids(engine.index, "revocation"), {"c0", "c1", "c4"})
+
+        asyncio.run(scenario())
+
+    def test_04_refresh_rereads_only_the_written_ids(self):
+        """Test a refresh given the written ids reads just those cases and drops the deleted ones"""
+        cases = [make_case(f"c{number}", "DE") for number in range(6)]
+        collection = StandInCollection(cases)
+        db = StandInDB(cases=collection, upc_texts=StandInCollection([]))
+
+        async def scenario():
+            engine = SearchEngine()
+            engine.index = build_index(db)
+            cases[0] = make_case("c0", "DE", "Revocation action dismissed on the merits.", version=2)
+            del cases[1]
+            collection.reads = 0
+            await engine.refresh(db, [KIND_CASE], ["c0", "c1"])
+            # The content hash of c0, then c0 itself
+            self.assertEqual(collection.reads, 2)
+            self.assertEqual(self.search_ids(engine.index, "revocation"), {"c0"})
+            self.assertEqual(self.search_ids(engine.index, "orders"), {"c2", "c3", "c4", "c5"})
+
+        asyncio.run(scenario())
+
+    def test_05_version_check_follows_the_change_log(self):
+        """Test writes logged by another process are re-read by id, and a gap in the log falls back to a full diff"""
+        cases = [make_case(f"c{number}", "DE") for number in range(4)]
+        versions = StandInCollection([{"_id": "cases", "version": 3, "changes": [["c0"], ["c2"]]}])
+        db = StandInDB(cases=StandInCollection(cases), upc_texts=StandInCollection([]), cache_versions=versions)
+
+        async def scenario():
+            engine = SearchEngine(check_interval=0)
+            engine.index = build_index(db)
+            engine._cases_version = 1
+            engine._reconciled_at = time.monotonic()
+            for number in (0, 2, 3):
+                cases[number] = make_case(f"c{number}", "DE", "Revocation action dismissed.", version=2)
+            await engine.check_version(db)
+            await engine._refresh_task
+            self.assertEqual(engine._cases_version, 3)
+            # c3 was written without being logged
+            self.assertEqual(self.search_ids(engine.index, "revocation"), {"c0", "c2"})
+            versions.documents[0] = {"_id": "cases", "version": 4, "changes": [["c0"], ["c2"], None]}
+            await engine.check_version(db)
+            await engine._refresh_task
+            self.assertEqual(engine._cases_version, 4)
+            self.assertEqual(self.search_ids(engine.index, "revocation"), {"c0", "c2", "c3"})
+
+        asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for a 500-row /api/cases page.
+Compares the previous path (rename _id in a Python loop, jsonable_encoder,
+json.dumps) with the orjson path used by the read endpoints.
+"""
+
+import json
+import os
+import sys
+import timeit
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from fastapi.encoders import jsonable_encoder
+
+from fast_json import dumps
+
+ROWS = 500
+REPEAT = 20
+
+
+def make_case(index):
+    return {
+        "_id": str(uuid.uuid4()),
+        "date": f"2024-{index % 12 + 1:02d}-{index % 28 + 1:02d}",
+        "type": "Order" if index % 3 else "Decision",
+        "registry_number": f"App_{30000 + index}/2024",
+        "order_reference": f"ORD_{40000 + index}/2024",
+        "court_division": "Court of First Instance - Munich (DE) Local Division",
+        "division_code": "cfi-local-munich",
+        "type_of_action": "Infringement Action",
+        "language_of_proceedings": "DE",
+        "parties": ["Progress Maschinen & Automation AG", "AWM s.r.l.", "Schnell s.p.a."],
+        "summary": "The Munich Local Division issued an order on the infringement action. " * 12,
+        "legal_norms": ["Art. 32 UPCA", "Rule 13 RoP", "Rule 220 RoP"],
+        "tags": ["patent infringement", "counterclaim", "revocation"],
+        "documents": [{"id": str(uuid.uuid4()), "title": "Download Order (EN)",
+                       "url": f"/api/documents/{index}.pdf", "language": "EN"}],
+        "created_at": datetime(2024, 1, 1, 12, 0, index % 60),
+        "content_hash": uuid.uuid4().hex,
+    }
+
+
+def before(rows):
+    cases = [dict(row) for row in rows]
+    for case in cases:
+        case["id"] = str(case.pop("_id"))
+    return json.dumps(jsonable_encoder(cases), ensure_ascii=False, allow_nan=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def after(rows):
+    # _id is already renamed to id by the aggregation pipeline
+    return dumps(rows)
+
+
+def run_benchmark():
+    raw_rows = [make_case(i) for i in range(ROWS)]
+    renamed_rows = [{**{k: v for k, v in row.items() if k != "_id"}, "id": row["_id"]} for row in raw_rows]
+
+    print(f"🔍 Serializing a {ROWS}-row case page ({REPEAT} runs each)...")
+    before_ms = min(timeit.repeat(lambda: before(raw_rows), number=1, repeat=REPEAT)) * 1000
+    after_ms = min(timeit.repeat(lambda: after(renamed_rows), number=1, repeat=REPEAT)) * 1000
+    print(f"  before (loop + jsonable_encoder + json): {before_ms:7.2f} ms  {len(before(raw_rows)):,} bytes")
+    print(f"  after  (orjson)                        : {after_ms:7.2f} ms  {len(after(renamed_rows)):,} bytes")
+    print(f"  speedup: {before_ms / after_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    run_benchmark()
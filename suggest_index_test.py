@@ -0,0 +1,86 @@
+import os
+import random
+import sys
+import unittest
+from heapq import nlargest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from suggest_index import CATEGORY_ARTICLE, CATEGORY_CITATION, CATEGORY_PARTY, CATEGORY_PATENT, TOP_K, \
+    SuggestIndex, normalize_key, suggestion_keys
+
+
+def rank_keys(suggestions):
+    # Entries tied on weight and length may come in any order
+    return [(weight, -len(value)) for value, _, weight in suggestions]
+
+
+def brute_force(index, prefix, limit, category=None):
+    """Ranking over every entry of the index, as the reference for suggest()"""
+    prefix = normalize_key(prefix)
+    entries = {entry for entry, count in index._counts.items()
+               if count > 0 and entry[0] != CATEGORY_CITATION and (category is None or entry[0] == category)
+               and any(key.startswith(prefix) for key in suggestion_keys(entry[1]))}
+    ranked = nlargest(limit, entries, key=lambda entry: (index.weight(*entry), -len(entry[1])))
+    return [(value, entry_category, index.weight(entry_category, value)) for entry_category, value in ranked]
+
+
+class SuggestIndexTester(unittest.TestCase):
+    def test_01_word_prefixes_and_weights(self):
+        """Test any word of a value matches and entries rank by case frequency"""
+        index = SuggestIndex()
+        index.update([(CATEGORY_PARTY, "Progress Maschinen & Automation AG")], 1)
+        index.update([(CATEGORY_PARTY, "Mammut Sports Group AG")], 1)
+        index.update([(CATEGORY_PARTY, "Mammut Sports Group AG")], 1)
+        self.assertEqual([s.value for s in index.suggest("masch")], ["Progress Maschinen & Automation AG"])
+        self.assertEqual([(s.value, s.weight) for s in index.suggest("ma")],
+                         [("Mammut Sports Group AG", 2), ("Progress Maschinen & Automation AG", 1)])
+        index.update([(CATEGORY_PARTY, "Progress Maschinen & Automation AG")], -1)
+        self.assertEqual(index.suggest("masch"), [])
+
+    def test_02_citations_weigh_articles(self):
+        """Test citing cases add to an article's weight"""
+        index = SuggestIndex()
+        index.update([(CATEGORY_ARTICLE, "Article 32"), (CATEGORY_ARTICLE, "Article 33")], 1)
+        index.update([(CATEGORY_CITATION, "Article 33")], 1)
+        self.assertEqual([(s.value, s.weight) for s in index.suggest("art", category=CATEGORY_ARTICLE)],
+                         [("Article 33", 2), ("Article 32", 1)])
+
+    def test_03_short_prefix_ranks_every_matching_entry(self):
+        """Test the heaviest entry wins however many lighter keys sort before it"""
+        index = SuggestIndex()
+        for number in range(3000):
+            index.update([(CATEGORY_PATENT, f"EP 300{number:04d}")], 1)
+        for _ in range(5):
+            index.update([(CATEGORY_PATENT, "EP 3999999")], 1)
+        self.assertEqual(index.suggest("e", 1)[0].value, "EP 3999999")
+        self.assertEqual(index.suggest("ep 3", 1)[0].value, "EP 3999999")
+
+    def test_04_ranked_prefixes_stay_exact_across_updates(self):
+        """Test kept rankings match a full ranking through random increments and withdrawals"""
+        rng = random.Random(7)
+        entries = [(CATEGORY_PARTY, f"{name} {suffix}") for name in ("Alpha", "Alto", "Beta") for suffix in range(40)]
+        entries += [(category, f"Article {number}") for category in (CATEGORY_ARTICLE, CATEGORY_CITATION)
+                    for number in range(30)]
+        index = SuggestIndex()
+        counts = {}
+        prefixes = ["a", "al", "alp", "b", "art", "article 1", "alpha 1"]
+        for step in range(4000):
+            entry = rng.choice(entries)
+            delta = -1 if counts.get(entry) and rng.random() < 0.4 else 1
+            counts[entry] = counts.get(entry, 0) + delta
+            index.update([entry], delta)
+            if step % 50 == 0:
+                for prefix in prefixes:
+                    for limit, category in ((1, None), (5, CATEGORY_ARTICLE), (TOP_K, None), (TOP_K, CATEGORY_PARTY)):
+                        expected = brute_force(index, prefix, limit, category)
+                        suggestions = [tuple(s) for s in index.suggest(prefix, limit, category)]
+                        self.assertEqual(rank_keys(suggestions), rank_keys(expected),
+                                         f"{prefix!r} limit {limit} at step {step}")
+                        self.assertTrue(all(normalize_key(value).startswith(prefix)
+                                            or f" {prefix}" in normalize_key(value)
+                                            for value, _, _ in suggestions))
+
+
+if __name__ == "__main__":
+    unittest.main()